@@ -0,0 +1,153 @@
+import atexit
+import contextlib
+import os
+import pathlib
+import time
+from collections.abc import Callable, Iterator, MutableMapping, MutableSet
+
+import timeclock_el_punch_clock.caches as caches
+import timeclock_el_punch_clock.indices as indices
+import timeclock_el_punch_clock.profiles as profiles
+import timeclock_el_punch_clock.snapshots as snapshots
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.policies import FsyncPolicy
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+DEFAULT_BATCH_INTERVAL = 1.0
+
+
+_last_synced: MutableMapping[pathlib.Path, float] = {}
+_unsynced: MutableSet[pathlib.Path] = set()
+
+
+@contracts.has("io")
+def sync(path: pathlib.Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    _unsynced.discard(path)
+    _last_synced[path] = time.monotonic()
+
+
+@contracts.has("io")
+def sync_unsynced() -> None:
+    for path in tuple(_unsynced):
+        sync(path)
+
+
+atexit.register(sync_unsynced)
+
+
+def journal_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(f"{path.name}.repair")
+
+
+def _recover(path: pathlib.Path, fd: int) -> None:
+    # A repair of the log (see checks.fix) that was interrupted is undone
+    # before anything else touches the log; its journal holds the offset
+    # and the original tail.
+    journal = journal_path(path)
+    try:
+        data = journal.read_bytes()
+    except FileNotFoundError:
+        return
+    header, _, tail = data.partition(b"\n")
+    os.ftruncate(fd, int(header))
+    view = memoryview(tail)
+    while view:
+        view = view[os.write(fd, view) :]
+    os.fsync(fd)
+    journal.unlink()
+
+
+@contextlib.contextmanager
+def locked(path: pathlib.Path) -> Iterator[int]:
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            # The log may have been replaced (e.g. by compaction) while
+            # waiting for the lock; the lock must be held on the current file.
+            try:
+                current = os.stat(path).st_ino == os.fstat(fd).st_ino
+            except FileNotFoundError:
+                current = False
+            if current:
+                _recover(path, fd)
+                yield fd
+                return
+        finally:
+            # Closing the descriptor releases the lock.
+            os.close(fd)
+
+
+def _sync(path: pathlib.Path, fd: int, fsync_policy: FsyncPolicy) -> None:
+    match fsync_policy:
+        case FsyncPolicy.ALWAYS:
+            os.fsync(fd)
+        case FsyncPolicy.BATCHED:
+            now = time.monotonic()
+            if now - _last_synced.get(path, float("-inf")) >= DEFAULT_BATCH_INTERVAL:
+                os.fsync(fd)
+                _last_synced[path] = now
+                _unsynced.discard(path)
+            else:
+                _unsynced.add(path)
+
+
+@contracts.has("io")
+def append(
+    path: pathlib.Path,
+    render: Callable[[], bytes],
+    fsync_policy: FsyncPolicy = FsyncPolicy.ALWAYS,
+    delimiter: str = ":",
+) -> int | None:
+    # Returns the offset just past the appended bytes, or None if render
+    # returned none; later appends by others do not move it.
+    end, _ = append_with_index(
+        path, render, None, fsync_policy=fsync_policy, delimiter=delimiter
+    )
+    return end
+
+
+@contracts.has("io")
+def append_with_index(
+    path: pathlib.Path,
+    render: Callable[[], bytes],
+    index: indices.Index | None,
+    fsync_policy: FsyncPolicy = FsyncPolicy.ALWAYS,
+    delimiter: str = ":",
+) -> tuple[int | None, indices.Index | None]:
+    # As append, but reuses the index returned by an earlier append unless
+    # the log has changed since, and returns the index to keep.
+    with profiles.span("append"), locked(path) as fd:
+        with profiles.span("load sidecars"):
+            stat = os.fstat(fd)
+            if index is None or (index.size, index.mtime_ns) != (
+                stat.st_size,
+                stat.st_mtime_ns,
+            ):
+                index = indices.load_tail(path)
+            columns = caches.load_fresh(path)
+        with profiles.span("render"):
+            data = memoryview(render())
+        if not data:
+            return None, index
+        with profiles.span("write"):
+            end = os.lseek(fd, 0, os.SEEK_END) + len(data)
+            while data:
+                data = data[os.write(fd, data) :]
+        with profiles.span("fsync"):
+            _sync(path, fd, fsync_policy)
+        with profiles.span("update sidecars"):
+            indices.update(path, index)
+            caches.update(path, columns, delimiter=delimiter)
+            snapshots.update(path, delimiter=delimiter)
+    return end, index
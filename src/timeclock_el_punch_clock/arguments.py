@@ -5,16 +5,20 @@ from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Self, MutableSequence, Callable
 
-import deal
-
 import timeclock_el_punch_clock.paths.writeable_file_paths as writeable_file_paths
+import timeclock_el_punch_clock.profiles as profiles
+from timeclock_el_punch_clock import contracts
 from timeclock_el_punch_clock.accounts import Account, into_accounts
+from timeclock_el_punch_clock.policies import FsyncPolicy
 from timeclock_el_punch_clock.paths.errors import (
     PathDoesNotExist,
     PathNotAFileError,
     PathNotWriteableError,
 )
-from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.paths.writeable_file_paths import (
+    PathCache,
+    WriteableFilePath,
+)
 
 
 def _parse_from_namespace[T, V](
@@ -50,6 +54,7 @@ class Arguments:
     datetimestamp: datetime.datetime
     accounts: Sequence[Account]
     delimiter: str
+    fsync_policy: FsyncPolicy = FsyncPolicy.ALWAYS
 
     @staticmethod
     def default_file() -> pathlib.Path:
@@ -67,50 +72,70 @@ class Arguments:
     def default_delimiter() -> str:
         return ":"
 
+    @staticmethod
+    def default_fsync_policy() -> FsyncPolicy:
+        return FsyncPolicy.ALWAYS
+
     @classmethod
-    @deal.has("io")
-    @deal.raises(ExceptionGroup)
+    @contracts.has("io")
+    @contracts.raises(ExceptionGroup)
     def from_namespace(cls, namespace: argparse.Namespace) -> Self:
-        errors: MutableSequence[_ArgumentsError] = []
-
-        file: WriteableFilePath | None = None
-        datetimestamp: datetime.datetime
-        accounts: Sequence[Account]
-        delimiter: str | None = None
-
-        try:
-            file = _parse_from_namespace(
+        with profiles.span("Arguments.from_namespace"):
+            errors: MutableSequence[_ArgumentsError] = []
+
+            file: WriteableFilePath | None = None
+            datetimestamp: datetime.datetime
+            accounts: Sequence[Account]
+            delimiter: str | None = None
+            fsync_policy: FsyncPolicy
+
+            # A runners.Runner passes its cache of validated paths along.
+            path_cache: PathCache | None = _get_from_namespace(
+                namespace, attr="path_cache", default_factory=lambda: None
+            )
+            try:
+                file = _parse_from_namespace(
+                    namespace,
+                    attr="file",
+                    default_factory=cls.default_file,
+                    parse=writeable_file_paths.from_path
+                    if path_cache is None
+                    else path_cache.from_path,
+                )
+            except _ArgumentsFileErrors as err:
+                errors.append(err)
+            datetimestamp = _get_from_namespace(
                 namespace,
-                attr="file",
-                default_factory=cls.default_file,
-                parse=writeable_file_paths.from_path,
+                attr="datetime",
+                default_factory=cls.default_datetimestamp,
             )
-        except _ArgumentsFileErrors as err:
-            errors.append(err)
-        datetimestamp = _get_from_namespace(
-            namespace,
-            attr="datetime",
-            default_factory=cls.default_datetimestamp,
-        )
-        accounts = _parse_from_namespace(
-            namespace,
-            attr="accounts",
-            default_factory=cls.default_accounts,
-            parse=into_accounts,
-        )
-
-        if errors:
-            raise ExceptionGroup(
-                f"Could not parse namespace {namespace} into Arguments", tuple(errors)
+            accounts = _parse_from_namespace(
+                namespace,
+                attr="accounts",
+                default_factory=cls.default_accounts,
+                parse=into_accounts,
+            )
+            fsync_policy = _parse_from_namespace(
+                namespace,
+                attr="fsync",
+                default_factory=cls.default_fsync_policy,
+                parse=FsyncPolicy,
             )
-        assert not errors, "Invariant: errors is empty"
-        assert file is not None, "Invariant: file is not None, if errors is empty"
-
-        delimiter = cls.default_delimiter()
 
-        return cls(
-            file=file,
-            datetimestamp=datetimestamp,
-            accounts=accounts,
-            delimiter=delimiter,
-        )
+            if errors:
+                raise ExceptionGroup(
+                    f"Could not parse namespace {namespace} into Arguments",
+                    tuple(errors),
+                )
+            assert not errors, "Invariant: errors is empty"
+            assert file is not None, "Invariant: file is not None, if errors is empty"
+
+            delimiter = cls.default_delimiter()
+
+            return cls(
+                file=file,
+                datetimestamp=datetimestamp,
+                accounts=accounts,
+                delimiter=delimiter,
+                fsync_policy=fsync_policy,
+            )
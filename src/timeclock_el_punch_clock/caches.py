@@ -0,0 +1,280 @@
+import os
+import pathlib
+import struct
+import zlib
+from collections.abc import MutableMapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import mmaps
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.paths import replacements
+
+CLOCK_IN, CLOCK_OUT = 1, 2
+NO_ACCOUNT = -1
+
+_MAGIC = b"TTLPCCOL"
+_VERSION = 1
+_HEADER = struct.Struct("<8sQqqqqIqqq")
+_RECORD = struct.Struct("<qii")
+_SEPARATOR = "\x1f"
+
+
+@dataclass
+class Header:
+    size: int
+    mtime_ns: int
+    inode: int
+    # The records cover the first `end` bytes of the log, whose CRC32 is
+    # `prefix_crc`.
+    end: int
+    prefix_crc: int
+    count: int
+    accounts: int
+    accounts_size: int
+
+    def pack(self) -> bytes:
+        return _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            self.size,
+            self.mtime_ns,
+            self.inode,
+            self.end,
+            self.prefix_crc,
+            self.count,
+            self.accounts,
+            self.accounts_size,
+        )
+
+    def is_fresh(self, stat: os.stat_result) -> bool:
+        return (self.size, self.mtime_ns, self.inode) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ino,
+        )
+
+
+@dataclass(frozen=True)
+class Cache:
+    header: Header
+    # Structured array with the fields epoch, kind and account.
+    records: Any
+    accounts: Sequence[tuple[Account, ...]]
+
+
+def cache_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(f"{path.name}.cols")
+
+
+def accounts_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(f"{path.name}.cols.accounts")
+
+
+@contracts.has("io")
+def load_header(path: pathlib.Path) -> Header | None:
+    try:
+        with cache_path(path).open(mode="rb") as file:
+            fields = _HEADER.unpack(file.read(_HEADER.size))
+    except (FileNotFoundError, struct.error):
+        return None
+    magic, version, *rest = fields
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    return Header(*rest)
+
+
+@contracts.has("io")
+def load_fresh(path: pathlib.Path) -> Header | None:
+    header = load_header(path)
+    if header is None or not header.is_fresh(path.stat()):
+        return None
+    return header
+
+
+def _read_accounts(path: pathlib.Path, header: Header) -> list[tuple[Account, ...]]:
+    with accounts_path(path).open(mode="rb") as file:
+        data = file.read(header.accounts_size)
+    if len(data) != header.accounts_size:
+        raise ValueError("account table is shorter than recorded")
+    try:
+        text = data.decode()
+    except UnicodeDecodeError as err:
+        raise ValueError("account table is not UTF-8") from err
+    table = [
+        tuple(Account(account) for account in line.split(_SEPARATOR)[1:])
+        for line in text.split("\n")[: header.accounts]
+    ]
+    if len(table) != header.accounts:
+        raise ValueError("account table has fewer accounts than recorded")
+    return table
+
+
+def _records(
+    data: bytes,
+    ids: MutableMapping[tuple[Account, ...], int],
+    delimiter: str,
+) -> bytes:
+    records = bytearray()
+    for entry in mmaps.parse_buffer(data, delimiter=delimiter):
+        if isinstance(entry, ClockInEntry):
+            account = ids.setdefault(entry.accounts, len(ids))
+            records += _RECORD.pack(entry.timestamp, CLOCK_IN, account)
+        elif isinstance(entry, ClockOutEntry):
+            records += _RECORD.pack(entry.timestamp, CLOCK_OUT, NO_ACCOUNT)
+    return bytes(records)
+
+
+def _encode_accounts(accounts: Sequence[tuple[Account, ...]]) -> bytes:
+    # Every segment is preceded by the separator, so () and ("",) differ.
+    return "".join(
+        "".join(f"{_SEPARATOR}{segment}" for segment in path) + "\n"
+        for path in accounts
+    ).encode()
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError)
+def rebuild(path: pathlib.Path, delimiter: str = ":") -> Header:
+    with path.open(mode="rb") as file:
+        stat = os.fstat(file.fileno())
+        data = file.read(stat.st_size)
+    ids: MutableMapping[tuple[Account, ...], int] = {}
+    records = _records(data, ids, delimiter)
+    accounts = _encode_accounts(tuple(ids))
+    header = Header(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        inode=stat.st_ino,
+        end=len(data),
+        prefix_crc=zlib.crc32(data),
+        count=len(records) // _RECORD.size,
+        accounts=len(ids),
+        accounts_size=len(accounts),
+    )
+    # The account table goes first; the header only counts what it holds.
+    for target, contents in (
+        (accounts_path(path), accounts),
+        (cache_path(path), header.pack() + records),
+    ):
+        replacements.replace(target, contents)
+    return header
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError, ValueError, FileNotFoundError)
+def extend(path: pathlib.Path, header: Header, delimiter: str = ":") -> Header:
+    table = _read_accounts(path, header)
+    ids = {accounts: account_id for account_id, accounts in enumerate(table)}
+    with path.open(mode="rb") as file:
+        stat = os.fstat(file.fileno())
+        data = os.pread(file.fileno(), stat.st_size - header.end, header.end)
+    records = _records(data, ids, delimiter)
+    accounts = _encode_accounts(tuple(ids)[header.accounts :])
+    with accounts_path(path).open(mode="r+b") as file:
+        file.seek(header.accounts_size)
+        file.write(accounts)
+        file.truncate()
+    extended = Header(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        inode=stat.st_ino,
+        end=header.end + len(data),
+        prefix_crc=zlib.crc32(data, header.prefix_crc),
+        count=header.count + len(records) // _RECORD.size,
+        accounts=len(ids),
+        accounts_size=header.accounts_size + len(accounts),
+    )
+    with cache_path(path).open(mode="r+b") as file:
+        file.seek(_HEADER.size + _RECORD.size * header.count)
+        file.write(records)
+        file.truncate()
+        file.seek(0)
+        file.write(extended.pack())
+    return extended
+
+
+def _prefix_crc(path: pathlib.Path, end: int) -> int:
+    crc = 0
+    with path.open(mode="rb") as file:
+        while end > 0:
+            block = file.read(min(end, 2**20))
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            end -= len(block)
+    return crc
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError)
+def refresh(path: pathlib.Path, delimiter: str = ":") -> Header:
+    header = load_header(path)
+    if header is None:
+        return rebuild(path, delimiter=delimiter)
+    stat = path.stat()
+    if header.is_fresh(stat):
+        return header
+    if (
+        header.inode == stat.st_ino
+        and header.end <= stat.st_size
+        and _prefix_crc(path, header.end) == header.prefix_crc
+    ):
+        try:
+            return extend(path, header, delimiter=delimiter)
+        except (FileNotFoundError, ValueError):
+            pass
+    return rebuild(path, delimiter=delimiter)
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError)
+def update(path: pathlib.Path, header: Header | None, delimiter: str = ":") -> None:
+    if header is None:
+        if cache_path(path).exists():
+            refresh(path, delimiter=delimiter)
+        return
+    try:
+        extend(path, header, delimiter=delimiter)
+    except (FileNotFoundError, ValueError):
+        rebuild(path, delimiter=delimiter)
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError)
+def load(path: pathlib.Path, delimiter: str = ":") -> Cache:
+    # numpy is only needed to map the records, not to maintain them.
+    import numpy as np
+
+    header = load_fresh(path)
+    try:
+        accounts = None if header is None else _read_accounts(path, header)
+    except (FileNotFoundError, ValueError):
+        accounts = None
+    if header is None or accounts is None:
+        # Appends extend the sidecars in place under the lock of the log, so
+        # they are only written under it. appends imports this module.
+        from timeclock_el_punch_clock import appends
+
+        with appends.locked(path):
+            header = refresh(path, delimiter=delimiter)
+            try:
+                accounts = _read_accounts(path, header)
+            except (FileNotFoundError, ValueError):
+                header = rebuild(path, delimiter=delimiter)
+                accounts = _read_accounts(path, header)
+    dtype = np.dtype([("epoch", "<i8"), ("kind", "<i4"), ("account", "<i4")])
+    if header.count:
+        records = np.memmap(
+            cache_path(path),
+            dtype=dtype,
+            mode="r",
+            offset=_HEADER.size,
+            shape=(header.count,),
+        )
+    else:
+        records = np.empty(0, dtype=dtype)
+    return Cache(header=header, records=records, accounts=accounts)
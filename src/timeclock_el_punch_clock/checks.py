@@ -0,0 +1,509 @@
+import array
+import calendar
+import concurrent.futures
+import contextlib
+import enum
+import itertools
+import os
+import pathlib
+from collections.abc import MutableSequence, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from timeclock_el_punch_clock import appends, contracts, parallel, timestamps, zones
+from timeclock_el_punch_clock.parallel import Chunk
+from timeclock_el_punch_clock.parsing import mmaps
+from timeclock_el_punch_clock.parsing.entries import (
+    ClockInEntry,
+    ClockOutEntry,
+    HeadingEntry,
+)
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+
+class Kind(enum.StrEnum):
+    MALFORMED = "malformed"
+    UNORDERED = "unordered"
+    # A clock in while clocked in, a clock out while clocked out.
+    UNCLOSED = "unclosed"
+    UNOPENED = "unopened"
+    HEADING = "heading"
+    # A clock in before the dates of its heading. One after them is only not
+    # filed yet, as `in` writes no headings.
+    MISFILED = "misfiled"
+    NEWLINE = "newline"
+
+
+# Kinds that --fix repairs without guessing; headings are only reported.
+# Lines are dropped first, so that alternation is judged without them.
+_DROPPED = frozenset((Kind.MALFORMED, Kind.UNORDERED))
+REPAIRABLE = _DROPPED | {Kind.UNCLOSED, Kind.UNOPENED, Kind.NEWLINE}
+
+
+@dataclass(frozen=True)
+class Problem:
+    # Counted from 1.
+    line: int
+    kind: Kind
+    message: str
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    title: str
+    # The dates of a date heading, as [start, end) epochs.
+    start: int | None
+    end: int | None
+
+
+@dataclass(frozen=True)
+class State:
+    # What the lines before a scan leave behind.
+    last: int | None = None
+    clocked_in: bool = False
+    headings: tuple[Heading, ...] = ()
+    dated: Heading | None = None
+    # The timezone tag in effect, and the last epoch in the order of time:
+    # in UTC where a tag is in effect.
+    zone: str | None = None
+    ordered: int | None = None
+
+
+@dataclass(frozen=True)
+class Scan:
+    # The number of lines; the others are counted from 0 over the file.
+    lines: int
+    clock_lines: np.ndarray
+    epochs: np.ndarray
+    clock_ins: np.ndarray
+    headings: Sequence[tuple[int, int, str]]
+    malformed: Sequence[tuple[int, str]]
+
+
+def scan_buffer(buffer: bytes, delimiter: str = ":", first_line: int = 0) -> Scan:
+    clock_lines, epochs = array.array("q"), array.array("q")
+    clock_ins = array.array("b")
+    headings: MutableSequence[tuple[int, int, str]] = []
+    malformed: MutableSequence[tuple[int, str]] = []
+    add_line, add_epoch, add_in = clock_lines.append, epochs.append, clock_ins.append
+    line = resumed = first_line
+    position = 0
+    while position < len(buffer):
+        try:
+            for entry in mmaps.parse_buffer(
+                buffer, delimiter=delimiter, offset=position
+            ):
+                kind = type(entry)
+                if kind is ClockInEntry:
+                    add_line(line)
+                    add_epoch(entry[0])
+                    add_in(1)
+                elif kind is ClockOutEntry:
+                    add_line(line)
+                    add_epoch(entry[0])
+                    add_in(0)
+                elif kind is HeadingEntry:
+                    headings.append((line, entry.level, entry.title))
+                line += 1
+            break
+        except MalformedLineError as err:
+            malformed.append((line, str(err.__cause__)))
+            # Skip the lines parsed since resuming, and the malformed one.
+            for _ in range(line - resumed + 1):
+                position = buffer.find(b"\n", position) + 1 or len(buffer)
+            line += 1
+            resumed = line
+    return Scan(
+        lines=line - first_line,
+        clock_lines=np.frombuffer(clock_lines, dtype=np.int64),
+        epochs=np.frombuffer(epochs, dtype=np.int64),
+        clock_ins=np.frombuffer(clock_ins, dtype=np.int8).astype(bool),
+        headings=headings,
+        malformed=malformed,
+    )
+
+
+def scan_chunk(chunk: Chunk, delimiter: str = ":") -> Scan:
+    with chunk.path.open(mode="rb") as file:
+        buffer = os.pread(file.fileno(), chunk.end - chunk.start, chunk.start)
+    return scan_buffer(buffer, delimiter=delimiter)
+
+
+def _concatenate(scans: Sequence[Scan]) -> Scan:
+    firsts = list(itertools.accumulate((scan.lines for scan in scans[:-1]), initial=0))
+    return Scan(
+        lines=sum(scan.lines for scan in scans),
+        clock_lines=np.concatenate(
+            [np.zeros(0, dtype=np.int64)]
+            + [scan.clock_lines + first for scan, first in zip(scans, firsts)]
+        ),
+        epochs=np.concatenate(
+            [np.zeros(0, dtype=np.int64)] + [scan.epochs for scan in scans]
+        ),
+        clock_ins=np.concatenate(
+            [np.zeros(0, dtype=bool)] + [scan.clock_ins for scan in scans]
+        ),
+        headings=[
+            (line + first, level, title)
+            for scan, first in zip(scans, firsts)
+            for line, level, title in scan.headings
+        ],
+        malformed=[
+            (line + first, message)
+            for scan, first in zip(scans, firsts)
+            for line, message in scan.malformed
+        ],
+    )
+
+
+def _dates(title: str) -> tuple[int, int] | None:
+    # Headings titled YYYY, YYYY-MM or YYYY-MM-DD, as timeclock.el writes them.
+    padding = {4: "-01-01", 7: "-01", 10: ""}.get(len(title))
+    if padding is None or not title.replace("-", "").isdigit():
+        return None
+    date = title + padding
+    start = timestamps.parse_date(date)
+    match len(title):
+        case 4:
+            days = 366 if calendar.isleap(int(title)) else 365
+        case 7:
+            days = calendar.monthrange(int(date[:4]), int(date[5:7]))[1]
+        case _:
+            days = 1
+    return start * 86400, (start + days) * 86400
+
+
+def _check_headings(
+    scan: Scan, state: State
+) -> tuple[list[Problem], State, np.ndarray, list[Heading | None]]:
+    problems: list[Problem] = []
+    stack = list(state.headings)
+    dated = state.dated
+    # The date heading in effect from each heading on, after the one before.
+    lines = [-1]
+    governing: list[Heading | None] = [
+        next(
+            (heading for heading in reversed(stack) if heading.start is not None), None
+        )
+    ]
+    # The index of the last clock entry before each heading.
+    previous_clocks = (
+        np.searchsorted(
+            scan.clock_lines, [line for line, _, _ in scan.headings]
+        ).astype(np.int64)
+        - 1
+    ).tolist()
+    for (line, level, title), previous in zip(scan.headings, previous_clocks):
+        # Timezone tags are not part of the outline.
+        if title.startswith(zones.TAG):
+            try:
+                zones.tag(HeadingEntry(level, title))
+            except MalformedLineError as err:
+                problems.append(Problem(line + 1, Kind.HEADING, str(err)))
+            continue
+        while stack and stack[-1].level >= level:
+            stack.pop()
+        try:
+            dates = _dates(title)
+        except ValueError:
+            problems.append(
+                Problem(line + 1, Kind.HEADING, f"invalid date in heading {title!r}")
+            )
+            dates = None
+        heading = Heading(level, title, *(dates or (None, None)))
+        if heading.start is not None and heading.end is not None:
+            enclosing = next(
+                (other for other in reversed(stack) if other.start is not None), None
+            )
+            last = int(scan.epochs[previous]) if previous >= 0 else state.last
+            if enclosing is not None and not (
+                enclosing.start <= heading.start and heading.end <= enclosing.end
+            ):
+                problems.append(
+                    Problem(
+                        line + 1,
+                        Kind.HEADING,
+                        f"heading {title!r} is outside heading {enclosing.title!r}",
+                    )
+                )
+            elif dated is not None and heading.start < dated.start:
+                problems.append(
+                    Problem(
+                        line + 1,
+                        Kind.HEADING,
+                        f"heading {title!r} comes after heading {dated.title!r}",
+                    )
+                )
+            elif last is not None and heading.end <= last:
+                problems.append(
+                    Problem(
+                        line + 1,
+                        Kind.HEADING,
+                        f"heading {title!r} comes after entries of"
+                        f" {timestamps.format_epoch(last)}",
+                    )
+                )
+            dated = heading
+        stack.append(heading)
+        lines.append(line)
+        governing.append(
+            next((other for other in reversed(stack) if other.start is not None), None)
+        )
+    return (
+        problems,
+        State(headings=tuple(stack), dated=dated),
+        np.asarray(lines, dtype=np.int64),
+        governing,
+    )
+
+
+def _ordered(scan: Scan, state: State) -> tuple[np.ndarray, str | None]:
+    # The clock entries as epochs in the order of time: in UTC where a
+    # timezone tag is in effect, so that wall times repeated when the clocks
+    # fall back are in order.
+    tags: list[tuple[int, str]] = []
+    for line, level, title in scan.headings:
+        if title.startswith(zones.TAG):
+            with contextlib.suppress(MalformedLineError):
+                name = zones.tag(HeadingEntry(level, title))
+                if name is not None:
+                    tags.append((line, name))
+    zone = tags[-1][1] if tags else state.zone
+    if zone is None:
+        return scan.epochs, zone
+    names = np.searchsorted([line for line, _ in tags], scan.clock_lines, "right")
+    return zones.to_utc(
+        scan.epochs,
+        names.astype(np.int64),
+        [state.zone or zones.UTC, *(name for _, name in tags)],
+        last=state.ordered,
+    ), zone
+
+
+def validate(scan: Scan, state: State = State()) -> tuple[list[Problem], State]:
+    problems = [
+        Problem(line + 1, Kind.MALFORMED, message) for line, message in scan.malformed
+    ]
+    heading_problems, heading_state, heading_lines, governing = _check_headings(
+        scan, state
+    )
+    problems.extend(heading_problems)
+    lines, epochs, clock_ins = scan.clock_lines, scan.epochs, scan.clock_ins
+    ordered, zone = _ordered(scan, state)
+    if len(epochs):
+        previous_epochs = np.concatenate(
+            ([epochs[0] if state.last is None else state.last], epochs[:-1])
+        )
+        previous_ordered = np.concatenate(
+            ([ordered[0] if state.ordered is None else state.ordered], ordered[:-1])
+        )
+        previous_ins = np.concatenate(([state.clocked_in], clock_ins[:-1]))
+        for index in np.flatnonzero(ordered < previous_ordered).tolist():
+            problems.append(
+                Problem(
+                    int(lines[index]) + 1,
+                    Kind.UNORDERED,
+                    f"entry at {timestamps.format_epoch(int(epochs[index]))} comes"
+                    f" after {timestamps.format_epoch(int(previous_epochs[index]))}",
+                )
+            )
+        for index in np.flatnonzero(clock_ins & previous_ins).tolist():
+            problems.append(
+                Problem(
+                    int(lines[index]) + 1, Kind.UNCLOSED, "clock in while clocked in"
+                )
+            )
+        for index in np.flatnonzero(~clock_ins & ~previous_ins).tolist():
+            problems.append(
+                Problem(
+                    int(lines[index]) + 1, Kind.UNOPENED, "clock out while clocked out"
+                )
+            )
+        # Only the first misfiled clock in after each heading is reported.
+        segments = np.searchsorted(heading_lines, lines, side="right") - 1
+        starts = np.asarray(
+            [np.iinfo(np.int64).min if g is None else g.start for g in governing],
+            dtype=np.int64,
+        )
+        misfiled = clock_ins & (epochs < starts[segments])
+        indices = np.flatnonzero(misfiled)
+        _, firsts = np.unique(segments[indices], return_index=True)
+        for index in indices[firsts].tolist():
+            heading = governing[segments[index]]
+            assert heading is not None, "Invariant: misfiled under a date heading"
+            problems.append(
+                Problem(
+                    int(lines[index]) + 1,
+                    Kind.MISFILED,
+                    f"clock in at {timestamps.format_epoch(int(epochs[index]))}"
+                    f" is before heading {heading.title!r}",
+                )
+            )
+        state = State(int(epochs[-1]), bool(clock_ins[-1]), ordered=int(ordered[-1]))
+    problems.sort(key=lambda problem: problem.line)
+    return problems, State(
+        state.last,
+        state.clocked_in,
+        heading_state.headings,
+        heading_state.dated,
+        zone,
+        state.ordered,
+    )
+
+
+def _scan_file(
+    path: pathlib.Path, delimiter: str, workers: int, chunk_size: int
+) -> tuple[Sequence[Chunk], Sequence[Scan]]:
+    chunks = parallel.split(path, chunk_size=chunk_size)
+    delimiters = [delimiter] * len(chunks)
+    if workers == 1:
+        return chunks, list(map(scan_chunk, chunks, delimiters))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return chunks, list(executor.map(scan_chunk, chunks, delimiters))
+
+
+def _unterminated(path: pathlib.Path, lines: int) -> list[Problem]:
+    with path.open(mode="rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size and os.pread(file.fileno(), 1, size - 1) != b"\n":
+            return [Problem(lines, Kind.NEWLINE, "no newline at end of file")]
+    return []
+
+
+@contracts.has("io")
+def check(
+    path: pathlib.Path,
+    delimiter: str = ":",
+    workers: int = 1,
+    chunk_size: int = parallel.DEFAULT_CHUNK_SIZE,
+) -> Sequence[Problem]:
+    # Chunks are parsed in parallel; the checks across lines then run over
+    # the columns of all chunks. An interrupted repair is undone first.
+    if appends.journal_path(path).exists():
+        with appends.locked(path):
+            pass
+    _, scans = _scan_file(path, delimiter, workers, chunk_size)
+    scan = _concatenate(scans)
+    problems, _ = validate(scan)
+    return problems + _unterminated(path, scan.lines)
+
+
+def _line_offset(
+    path: pathlib.Path, chunks: Sequence[Chunk], scans: Sequence[Scan], line: int
+) -> int:
+    for chunk, scan in zip(chunks, scans):
+        if line < scan.lines:
+            with path.open(mode="rb") as file:
+                buffer = os.pread(file.fileno(), chunk.end - chunk.start, chunk.start)
+            position = 0
+            for _ in range(line):
+                position = buffer.find(b"\n", position) + 1
+            return chunk.start + position
+        line -= scan.lines
+    return chunks[-1].end if chunks else 0
+
+
+def _split_lines(data: bytes) -> list[bytes]:
+    lines = [line + b"\n" for line in data.split(b"\n")]
+    lines[-1] = lines[-1][:-1]
+    return lines if lines[-1] else lines[:-1]
+
+
+def _repair(tail: bytes, first_line: int, problems: Sequence[Problem]) -> bytes:
+    # Malformed, unordered and unopened lines are dropped, a clock out is
+    # inserted before each unclosed clock in, and the last line terminated.
+    kinds: dict[int, set[Kind]] = {}
+    for problem in problems:
+        kinds.setdefault(problem.line - 1 - first_line, set()).add(problem.kind)
+    repaired: list[bytes] = []
+    for index, line in enumerate(_split_lines(tail)):
+        line_kinds = kinds.get(index, set())
+        if line_kinds & {Kind.MALFORMED, Kind.UNORDERED, Kind.UNOPENED}:
+            continue
+        if Kind.UNCLOSED in line_kinds:
+            epoch = next(mmaps.parse_buffer(line)).timestamp
+            repaired.append(f"o {timestamps.format_epoch(epoch)}\n".encode())
+        if Kind.NEWLINE in line_kinds:
+            line += b"\n"
+        repaired.append(line)
+    return b"".join(repaired)
+
+
+def _write_tail(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _slice(scan: Scan, end: int) -> Scan:
+    # The lines before `end`.
+    clocks = int(np.searchsorted(scan.clock_lines, end))
+    return Scan(
+        lines=end,
+        clock_lines=scan.clock_lines[:clocks],
+        epochs=scan.epochs[:clocks],
+        clock_ins=scan.clock_ins[:clocks],
+        headings=[heading for heading in scan.headings if heading[0] < end],
+        malformed=[line for line in scan.malformed if line[0] < end],
+    )
+
+
+@contracts.has("io")
+def fix(
+    path: pathlib.Path,
+    delimiter: str = ":",
+    workers: int = 1,
+    chunk_size: int = parallel.DEFAULT_CHUNK_SIZE,
+) -> Sequence[Problem]:
+    # Locking first undoes an interrupted repair.
+    with appends.locked(path) as fd:
+        chunks, scans = _scan_file(path, delimiter, workers, chunk_size)
+        scan = _concatenate(scans)
+        problems, _ = validate(scan)
+        problems += _unterminated(path, scan.lines)
+        repairable = [problem for problem in problems if problem.kind in REPAIRABLE]
+        if not repairable:
+            return problems
+        # The log is valid up to the first repairable line; only the tail
+        # from there is rewritten.
+        first_line = repairable[0].line - 1
+        offset = _line_offset(path, chunks, scans, first_line)
+        kept = [problem for problem in problems if problem.line - 1 < first_line]
+        _, state = validate(_slice(scan, first_line))
+        with path.open(mode="rb") as file:
+            original = os.pread(
+                file.fileno(), os.fstat(file.fileno()).st_size - offset, offset
+            )
+        tail = original
+        while True:
+            remaining, _ = validate(
+                scan_buffer(tail, delimiter=delimiter, first_line=first_line), state
+            )
+            if tail and not tail.endswith(b"\n"):
+                remaining.append(
+                    Problem(
+                        first_line + tail.count(b"\n") + 1,
+                        Kind.NEWLINE,
+                        "no newline at end of file",
+                    )
+                )
+            repairable = [
+                problem for problem in remaining if problem.kind in _DROPPED
+            ] or [problem for problem in remaining if problem.kind in REPAIRABLE]
+            if not repairable:
+                break
+            tail = _repair(tail, first_line, repairable)
+        journal = appends.journal_path(path)
+        temporary = journal.with_name(f"{journal.name}.tmp")
+        with temporary.open(mode="wb") as file:
+            file.write(b"%d\n" % offset + original)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, journal)
+        os.ftruncate(fd, offset)
+        _write_tail(fd, tail)
+        os.fsync(fd)
+        journal.unlink()
+    return kept + remaining
@@ -1,26 +1,552 @@
 import argparse
+import contextlib
+import datetime
+import math
 import pathlib
-from typing import Sequence
+import sys
+import time
+from collections.abc import Callable, Iterator, Mapping, Sequence
+
+import timeclock_el_punch_clock.contracts as contracts
+import timeclock_el_punch_clock.profiles as profiles
+import timeclock_el_punch_clock.timestamps as timestamps
+from timeclock_el_punch_clock.contracts import ContractsMode
+from timeclock_el_punch_clock.policies import FsyncPolicy
+from timeclock_el_punch_clock.profiles import ProfileMode
+
+# Command implementations, and with them deal, are imported by the execute_*
+# functions, so that parsing arguments and --help stay cheap.
 
 
 def main(args: Sequence[str] | None = None) -> None:
+    start = time.perf_counter()
     parser = create_argument_parser()
-    parser.parse_args(args=args)
+    namespace = parser.parse_args(args=args)
+    if hasattr(namespace, "func"):
+        from_environment(parser, namespace)
+        result = invoke(namespace, sys.argv[1:] if args is None else args, start)
+        failed = getattr(namespace, "failed", None)
+        if failed is not None and failed(result):
+            sys.exit(1)
+
+
+def from_environment(
+    parser: argparse.ArgumentParser, namespace: argparse.Namespace
+) -> None:
+    # Options not given take their defaults from the environment, whose bad
+    # values are reported as bad options are.
+    try:
+        if getattr(namespace, "profile", None) is None:
+            namespace.profile = profiles.mode_from_environment()
+        if getattr(namespace, "contracts", None) is None:
+            namespace.contracts = contracts.mode_from_environment()
+        if getattr(namespace, "contracts_interval", None) is None:
+            namespace.contracts_interval = contracts.interval_from_environment()
+    except ValueError as err:
+        parser.error(str(err))
+
+
+def invoke(
+    namespace: argparse.Namespace, args: Sequence[str], start: float | None = None
+) -> object:
+    # Runs the command of a namespace parsed and completed by from_environment
+    # and returns its result, as main and runners.Runner do.
+    profile = namespace.profile
+    profiles.configure(profile)
+    if start is not None:
+        profiles.record("argparse", start)
+    with profiles.span("contracts.configure"):
+        contracts.configure(namespace.contracts, interval=namespace.contracts_interval)
+    # Cached stats only exist if a previous call imported the module.
+    stats = sys.modules.get("timeclock_el_punch_clock.paths.stats")
+    if stats is not None:
+        stats.clear()
+    with (
+        profiles.profiled(
+            profile,
+            args,
+            output=getattr(namespace, "profile_output", None)
+            or profiles.output_from_environment(),
+        ),
+        contracts.sampled(),
+        profiles.span(namespace.func.__name__),
+    ):
+        return namespace.func(namespace)
+
+
+def _at_least(minimum: int) -> Callable[[str], int]:
+    def parse(text: str) -> int:
+        if not (text.isascii() and text.isdigit() and int(text) >= minimum):
+            raise argparse.ArgumentTypeError(
+                f"expected an integer of at least {minimum}, got {text!r}"
+            )
+        return int(text)
+
+    return parse
+
+
+def _positive_float(text: str) -> float:
+    try:
+        value = float(text)
+    except ValueError:
+        value = math.nan
+    # Also rejects nan, which compares false to everything.
+    if not 0 < value < math.inf:
+        raise argparse.ArgumentTypeError(f"expected a positive number, got {text!r}")
+    return value
+
+
+def _daemon_request(
+    namespace: argparse.Namespace, message: dict[str, object]
+) -> dict[str, object] | None:
+    # A running `ttlpc serve` handles the command, without importing deal or
+    # validating the file here.
+    from timeclock_el_punch_clock import daemons
+
+    if hasattr(namespace, "fsync"):
+        message["fsync"] = str(namespace.fsync)
+    file = getattr(namespace, "file", pathlib.Path("log.timeclock"))
+    response = daemons.request(file, message)
+    return None if response is None else dict(response)
+
+
+def _now(namespace: argparse.Namespace) -> datetime.datetime:
+    return getattr(namespace, "datetime", None) or datetime.datetime.now()
+
+
+@contextlib.contextmanager
+def _mirrors(namespace: argparse.Namespace) -> Iterator[list]:
+    # sqlite3 is only imported when a mirror is given.
+    if not hasattr(namespace, "mirror"):
+        yield []
+        return
+    from timeclock_el_punch_clock.writers.sqlites import SqliteWriter
+
+    mirrors = [SqliteWriter(path) for path in namespace.mirror]
+    try:
+        yield mirrors
+    finally:
+        for mirror in mirrors:
+            mirror.close()
 
 
 def execute_in(namespace: argparse.Namespace) -> None:
-    pass
+    message: dict[str, object] = {
+        "command": "in",
+        "datetime": timestamps.format_datetime(_now(namespace)),
+        "accounts": list(getattr(namespace, "accounts", ())),
+    }
+    # The daemon does not know about mirrors.
+    if (
+        not hasattr(namespace, "mirror")
+        and _daemon_request(namespace, message) is not None
+    ):
+        return
+
+    from timeclock_el_punch_clock.arguments import Arguments
+    from timeclock_el_punch_clock.commands.clock_in import ClockIn
+
+    with _mirrors(namespace) as mirrors:
+        ClockIn.from_arguments(Arguments.from_namespace(namespace), mirrors=mirrors)()
+
+
+def execute_import(namespace: argparse.Namespace) -> None:
+    from timeclock_el_punch_clock.arguments import Arguments
+    from timeclock_el_punch_clock.commands.import_entries import ImportEntries
+    from timeclock_el_punch_clock.parsing import lines
+    from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+
+    arguments = Arguments.from_namespace(namespace)
+    source: pathlib.Path = namespace.source
+    with (
+        contextlib.nullcontext(sys.stdin)
+        if source == pathlib.Path("-")
+        else source.open(mode="r")
+    ) as entries_file:
+        entries = [
+            entry
+            for entry in lines.parse_lines(entries_file, delimiter=arguments.delimiter)
+            if isinstance(entry, (ClockInEntry, ClockOutEntry))
+        ]
+    with _mirrors(namespace) as mirrors:
+        ImportEntries.from_arguments(arguments, entries, mirrors=mirrors)()
+
+
+def execute_report(namespace: argparse.Namespace) -> Mapping[str, int]:
+    from timeclock_el_punch_clock.arguments import Arguments
+    from timeclock_el_punch_clock.commands.report import Report
+    from timeclock_el_punch_clock.reports import Period
+
+    period = Period(namespace.period) if hasattr(namespace, "period") else None
+    totals = Report.from_arguments(
+        Arguments.from_namespace(namespace),
+        period,
+        others=getattr(namespace, "include", ()),
+        workers=getattr(namespace, "workers", 1),
+        cache=getattr(namespace, "cache", False),
+        zone=getattr(namespace, "timezone", None),
+    )()
+    width = max(
+        (len(timestamps.format_duration(total)) for total in totals.values()), default=0
+    )
+    for label, total in totals.items():
+        print(f"{timestamps.format_duration(total):>{width}}  {label}")
+    return totals
+
+
+def execute_status(namespace: argparse.Namespace) -> object:
+    from timeclock_el_punch_clock import daemons
+    from timeclock_el_punch_clock.parsing.entries import ClockInEntry
+
+    response = _daemon_request(namespace, {"command": "status"})
+    if response is not None:
+        last = daemons.decode_entry(response["last"])
+        datetimestamp, delimiter = _now(namespace), ":"
+    else:
+        from timeclock_el_punch_clock.arguments import Arguments
+        from timeclock_el_punch_clock.commands.status import Status
+
+        arguments = Arguments.from_namespace(namespace)
+        last = Status.from_arguments(arguments)().last
+        datetimestamp, delimiter = arguments.datetimestamp, arguments.delimiter
+    if last is None:
+        print("no entries")
+    elif isinstance(last, ClockInEntry):
+        elapsed = timestamps.to_epoch(datetimestamp) - last.timestamp
+        accounts = delimiter.join(last.accounts)
+        print(
+            f"clocked in since {timestamps.format_epoch(last.timestamp)}"
+            f" ({timestamps.format_duration(max(elapsed, 0))})"
+            + (f" on {accounts}" if accounts else "")
+        )
+    else:
+        print(f"clocked out since {timestamps.format_epoch(last.timestamp)}")
+    return last
+
 
+def execute_compact(namespace: argparse.Namespace) -> Sequence[object]:
+    from timeclock_el_punch_clock.arguments import Arguments
+    from timeclock_el_punch_clock.commands.compact import Compact
+    from timeclock_el_punch_clock.segments import Compression, segments_path
 
-def create_argument_parser() -> argparse.ArgumentParser:
-    ttlpc_parser = argparse.ArgumentParser()
+    arguments = Arguments.from_namespace(namespace)
+    compacted = Compact.from_arguments(
+        arguments, Compression(getattr(namespace, "compression", Compression.NONE))
+    )()
+    for segment in compacted:
+        print(f"{segment.year}  {segments_path(arguments.file) / segment.name}")
+    return compacted
 
-    ttlpc_parser.add_argument("--file", "-f", type=pathlib.Path)
+
+def execute_check(namespace: argparse.Namespace) -> Sequence[object]:
+    from timeclock_el_punch_clock.arguments import Arguments
+    from timeclock_el_punch_clock.commands.check import Check
+
+    arguments = Arguments.from_namespace(namespace)
+    problems = Check.from_arguments(
+        arguments,
+        workers=getattr(namespace, "workers", 1),
+        fix=getattr(namespace, "fix", False),
+    )()
+    for problem in problems:
+        print(f"{arguments.file}:{problem.line}: {problem.kind}: {problem.message}")
+    return problems
+
+
+def execute_serve(namespace: argparse.Namespace) -> None:
+    from timeclock_el_punch_clock.arguments import Arguments
+    from timeclock_el_punch_clock.commands.serve import Serve
+
+    Serve.from_arguments(Arguments.from_namespace(namespace))()
+
+
+def execute_watch(namespace: argparse.Namespace) -> None:
+    from timeclock_el_punch_clock.arguments import Arguments
+    from timeclock_el_punch_clock.commands.watch import Watch
+
+    command = Watch.from_arguments(
+        Arguments.from_namespace(namespace),
+        poll_interval=getattr(namespace, "poll", None),
+    )
+    try:
+        for now, totals in command():
+            print(timestamps.format_datetime(now))
+            for label, total in totals.items():
+                print(f"{timestamps.format_duration(total):>9}  {label}")
+            print(flush=True)
+    except KeyboardInterrupt:
+        pass
+
+
+def execute_query(namespace: argparse.Namespace) -> Sequence[object]:
+    from timeclock_el_punch_clock.arguments import Arguments
+    from timeclock_el_punch_clock.commands.query import Query
+    from timeclock_el_punch_clock.queries import Filter
+
+    arguments = Arguments.from_namespace(namespace)
+    query_filter = Filter(
+        since=getattr(namespace, "since", None),
+        until=getattr(namespace, "until", None),
+        account=getattr(namespace, "account", None),
+        longer_than=getattr(namespace, "longer_than", None),
+        shorter_than=getattr(namespace, "shorter_than", None),
+        limit=getattr(namespace, "limit", None),
+    )
+    sessions = []
+    for session in Query.from_arguments(arguments, query_filter)():
+        sessions.append(session)
+        print(
+            f"{timestamps.format_epoch(session.start)}"
+            f"  {timestamps.format_epoch(session.end)}"
+            f"  {timestamps.format_duration(session.duration):>9}"
+            f"  {arguments.delimiter.join(session.accounts)}"
+        )
+    return sessions
+
+
+def create_argument_parser(
+    parser_class: type[argparse.ArgumentParser] = argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    ttlpc_parser = parser_class()
+
+    ttlpc_parser.add_argument(
+        "--file", "-f", type=pathlib.Path, default=argparse.SUPPRESS
+    )
+    ttlpc_parser.add_argument(
+        "--fsync",
+        type=FsyncPolicy,
+        choices=tuple(FsyncPolicy),
+        default=argparse.SUPPRESS,
+    )
+    ttlpc_parser.add_argument(
+        "--contracts",
+        type=ContractsMode,
+        choices=tuple(ContractsMode),
+        default=argparse.SUPPRESS,
+        help=(
+            "check contracts on every command, never, or on every n-th command"
+            f" (default: ${contracts.MODE_VARIABLE} or {ContractsMode.ON})"
+        ),
+    )
+    ttlpc_parser.add_argument(
+        "--contracts-interval",
+        type=_at_least(1),
+        metavar="N",
+        default=argparse.SUPPRESS,
+        help=(
+            "check every n-th command when contracts are sampled"
+            f" (default: ${contracts.INTERVAL_VARIABLE}"
+            f" or {contracts.DEFAULT_SAMPLE_INTERVAL})"
+        ),
+    )
+
+    ttlpc_parser.add_argument(
+        "--profile",
+        action="store_const",
+        const=ProfileMode.SPANS,
+        default=argparse.SUPPRESS,
+        help=(
+            "print the time spent in each phase of the command"
+            f" (default: ${profiles.MODE_VARIABLE} or {ProfileMode.OFF})"
+        ),
+    )
+    ttlpc_parser.add_argument(
+        "--profile-dump",
+        dest="profile",
+        type=ProfileMode,
+        choices=(ProfileMode.CPROFILE, ProfileMode.TRACEMALLOC),
+        default=argparse.SUPPRESS,
+        help="run the command under cProfile or tracemalloc",
+    )
+    ttlpc_parser.add_argument(
+        "--profile-output",
+        type=pathlib.Path,
+        metavar="FILE",
+        default=argparse.SUPPRESS,
+        help=(
+            "append spans as JSON lines, or dump cProfile or tracemalloc data,"
+            f" to FILE instead of stderr (default: ${profiles.OUTPUT_VARIABLE})"
+        ),
+    )
 
     ttlpc_commands_parser = ttlpc_parser.add_subparsers(title="commands")
 
     ttlpc_in_parser = ttlpc_commands_parser.add_parser("in")
+    ttlpc_in_parser.add_argument(
+        "--datetime", type=timestamps.parse_datetime, default=argparse.SUPPRESS
+    )
+    ttlpc_in_parser.add_argument(
+        "--mirror",
+        type=pathlib.Path,
+        action="append",
+        metavar="SQLITE",
+        default=argparse.SUPPRESS,
+        help="also write the entry to this SQLite database",
+    )
+    ttlpc_in_parser.add_argument("accounts", nargs="*", default=argparse.SUPPRESS)
 
     ttlpc_in_parser.set_defaults(func=execute_in)
 
+    ttlpc_import_parser = ttlpc_commands_parser.add_parser("import")
+    ttlpc_import_parser.add_argument(
+        "source", nargs="?", type=pathlib.Path, default=pathlib.Path("-")
+    )
+    ttlpc_import_parser.add_argument(
+        "--mirror",
+        type=pathlib.Path,
+        action="append",
+        metavar="SQLITE",
+        default=argparse.SUPPRESS,
+        help="also write the entries to this SQLite database",
+    )
+
+    ttlpc_import_parser.set_defaults(func=execute_import)
+
+    ttlpc_report_parser = ttlpc_commands_parser.add_parser("report")
+    ttlpc_report_parser.add_argument(
+        "--period", choices=("day", "week", "month"), default=argparse.SUPPRESS
+    )
+    ttlpc_report_parser.add_argument(
+        "--datetime", type=timestamps.parse_datetime, default=argparse.SUPPRESS
+    )
+    ttlpc_report_parser.add_argument(
+        "--include",
+        type=pathlib.Path,
+        action="append",
+        metavar="FILE",
+        default=argparse.SUPPRESS,
+        help="also report on this log",
+    )
+    ttlpc_report_parser.add_argument(
+        "--workers",
+        type=_at_least(1),
+        metavar="N",
+        default=argparse.SUPPRESS,
+        help="parse chunks of the logs in N processes",
+    )
+    ttlpc_report_parser.add_argument(
+        "--cache",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="read the logs through a binary cache kept beside each log",
+    )
+    ttlpc_report_parser.add_argument(
+        "--timezone",
+        type=timestamps.parse_timezone,
+        metavar="ZONE",
+        default=argparse.SUPPRESS,
+        help=(
+            "convert entries to UTC, taking those before any 'TZ=ZONE' heading"
+            " to be in ZONE, such as Europe/Vienna"
+        ),
+    )
+    ttlpc_report_parser.add_argument("accounts", nargs="*", default=argparse.SUPPRESS)
+
+    ttlpc_report_parser.set_defaults(func=execute_report)
+
+    ttlpc_query_parser = ttlpc_commands_parser.add_parser(
+        "query", help="list sessions matching all given filters"
+    )
+    ttlpc_query_parser.add_argument(
+        "--since",
+        type=timestamps.parse_moment,
+        metavar="DATE",
+        default=argparse.SUPPRESS,
+        help="sessions starting at or after DATE or DATETIME",
+    )
+    ttlpc_query_parser.add_argument(
+        "--until",
+        type=timestamps.parse_moment,
+        metavar="DATE",
+        default=argparse.SUPPRESS,
+        help="sessions starting before DATE or DATETIME",
+    )
+    ttlpc_query_parser.add_argument(
+        "--account",
+        metavar="PATTERN",
+        default=argparse.SUPPRESS,
+        help="an account and its subaccounts, or a glob such as 'client:*'",
+    )
+    ttlpc_query_parser.add_argument(
+        "--longer-than",
+        type=timestamps.parse_duration,
+        metavar="DURATION",
+        default=argparse.SUPPRESS,
+        help="such as 4h, 1h30m or 1:30:00",
+    )
+    ttlpc_query_parser.add_argument(
+        "--shorter-than",
+        type=timestamps.parse_duration,
+        metavar="DURATION",
+        default=argparse.SUPPRESS,
+    )
+    ttlpc_query_parser.add_argument(
+        "--limit",
+        type=_at_least(0),
+        metavar="N",
+        default=argparse.SUPPRESS,
+        help="stop reading after N sessions",
+    )
+    ttlpc_query_parser.add_argument(
+        "--datetime", type=timestamps.parse_datetime, default=argparse.SUPPRESS
+    )
+
+    ttlpc_query_parser.set_defaults(func=execute_query)
+
+    ttlpc_status_parser = ttlpc_commands_parser.add_parser("status")
+    ttlpc_status_parser.add_argument(
+        "--datetime", type=timestamps.parse_datetime, default=argparse.SUPPRESS
+    )
+
+    ttlpc_status_parser.set_defaults(func=execute_status)
+
+    ttlpc_compact_parser = ttlpc_commands_parser.add_parser("compact")
+    ttlpc_compact_parser.add_argument(
+        "--compression",
+        choices=("none", "gzip", "lzma"),
+        default=argparse.SUPPRESS,
+        help="compress the segments of completed years",
+    )
+
+    ttlpc_compact_parser.set_defaults(func=execute_compact)
+
+    ttlpc_check_parser = ttlpc_commands_parser.add_parser(
+        "check", help="validate ordering, alternation, timestamps and headings"
+    )
+    ttlpc_check_parser.add_argument(
+        "--fix",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="drop malformed, unordered and unopened entries, close unclosed ones",
+    )
+    ttlpc_check_parser.add_argument(
+        "--workers",
+        type=_at_least(1),
+        metavar="N",
+        default=argparse.SUPPRESS,
+        help="parse chunks of the log in N processes",
+    )
+
+    # main exits with 1 if problems remain.
+    ttlpc_check_parser.set_defaults(func=execute_check, failed=bool)
+
+    ttlpc_serve_parser = ttlpc_commands_parser.add_parser(
+        "serve", help="handle in and status for the log over a local socket"
+    )
+
+    ttlpc_serve_parser.set_defaults(func=execute_serve)
+
+    ttlpc_watch_parser = ttlpc_commands_parser.add_parser(
+        "watch", help="print today's totals whenever the log changes"
+    )
+    ttlpc_watch_parser.add_argument(
+        "--poll",
+        type=_positive_float,
+        metavar="SECONDS",
+        default=argparse.SUPPRESS,
+        help="stat the log every SECONDS instead of using inotify",
+    )
+
+    ttlpc_watch_parser.set_defaults(func=execute_watch)
+
     return ttlpc_parser
@@ -0,0 +1,36 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Self
+
+import timeclock_el_punch_clock.checks as checks
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.checks import Problem
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+
+
+@dataclass
+class Check:
+    file: WriteableFilePath
+    delimiter: str
+    workers: int = 1
+    fix: bool = False
+
+    @classmethod
+    def from_arguments(
+        cls, arguments: Arguments, workers: int = 1, fix: bool = False
+    ) -> Self:
+        return cls(
+            file=arguments.file,
+            delimiter=arguments.delimiter,
+            workers=workers,
+            fix=fix,
+        )
+
+    # With fix, the problems left after the repair.
+    @contracts.has("io")
+    @contracts.pre(lambda self: self.workers >= 1)
+    def __call__(self) -> Sequence[Problem]:
+        if self.fix:
+            return checks.fix(self.file, self.delimiter, workers=self.workers)
+        return checks.check(self.file, self.delimiter, workers=self.workers)
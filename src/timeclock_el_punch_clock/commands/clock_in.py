@@ -5,24 +5,35 @@ from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Self
 
-import deal
-
+import timeclock_el_punch_clock.profiles as profiles
+import timeclock_el_punch_clock.tails as tails
+import timeclock_el_punch_clock.timestamps as timestamps
+import timeclock_el_punch_clock.writers.texts as texts
+from timeclock_el_punch_clock import contracts
 from timeclock_el_punch_clock.accounts import Account
 from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.commands.errors import EntriesNotAlternatingError
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
 from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.policies import FsyncPolicy
+from timeclock_el_punch_clock.writers.protocols import ClockEntry, Writer
+from timeclock_el_punch_clock.writers.texts import TextWriter
 
 
 def _clock_in__call___ensure(self: ClockIn, result: None) -> bool:
-    lines = 0
-    line: str | None = None
-    with self.file.open(mode="r") as file:
-        for line in file:
-            lines += 1
-    accounts = ""
-    if self.accounts:
-        accounts = f" {self.delimiter.join(self.accounts)}"
-    in_line = f"i {self.datetimestamp.strftime('%Y-%m-%d %H:%M:%S')}{accounts}\n"
-    return lines > 0 and line is not None and line == in_line
+    with profiles.span("ClockIn ensure"):
+        writer = self._writer()
+        if isinstance(writer, TextWriter):
+            # Compares lines, as accounts such as ("",) do not survive parsing,
+            # at the end of this append, as others may have appended since.
+            line = texts.format_entries((self._entry(),), delimiter=self.delimiter)
+            data = line.encode()
+            return writer.end is not None and (
+                tails.read_range(writer.path, writer.end - len(data), writer.end)
+                == data
+            )
+        return writer.last() == self._entry()
 
 
 @dataclass
@@ -31,17 +42,52 @@ class ClockIn:
     datetimestamp: datetime.datetime
     accounts: Sequence[Account]
     delimiter: str
+    fsync_policy: FsyncPolicy = FsyncPolicy.ALWAYS
+    # Writes to the text log in `file` unless another writer is given.
+    writer: Writer | None = None
+    mirrors: Sequence[Writer] = ()
 
     @classmethod
-    def from_arguments(cls, arguments: Arguments) -> Self:
-        raise NotImplementedError
+    def from_arguments(
+        cls, arguments: Arguments, mirrors: Sequence[Writer] = ()
+    ) -> Self:
+        return cls(
+            file=arguments.file,
+            datetimestamp=arguments.datetimestamp,
+            accounts=arguments.accounts,
+            delimiter=arguments.delimiter,
+            fsync_policy=arguments.fsync_policy,
+            mirrors=tuple(mirrors),
+        )
+
+    def _writer(self) -> Writer:
+        if self.writer is None:
+            self.writer = TextWriter(
+                self.file, delimiter=self.delimiter, fsync_policy=self.fsync_policy
+            )
+        return self.writer
+
+    def _entry(self) -> ClockInEntry:
+        return ClockInEntry(
+            timestamps.to_epoch(self.datetimestamp), tuple(self.accounts)
+        )
 
-    @deal.has("io")
-    @deal.ensure(_clock_in__call___ensure)
+    @contracts.has("io")
+    @contracts.raises(EntriesNotAlternatingError, MalformedLineError)
+    @contracts.ensure(_clock_in__call___ensure)
     def __call__(self) -> None:
-        accounts = ""
-        if self.accounts:
-            accounts = f" {self.delimiter.join(self.accounts)}"
-        line: str = f"i {self.datetimestamp.strftime('%Y-%m-%d %H:%M:%S')}{accounts}\n"
-        with self.file.open(mode="a") as file:
-            file.write(line)
+        entry = self._entry()
+
+        def render(last: ClockEntry | None) -> Sequence[ClockEntry]:
+            if isinstance(last, ClockInEntry):
+                raise EntriesNotAlternatingError(f"{self.file} is already clocked in")
+            return (entry,)
+
+        # Checks every mirror before writing the log, so that a diverged
+        # mirror leaves them all as they were. The log is checked as it is
+        # written, as it may not exist yet.
+        for mirror in self.mirrors:
+            render(mirror.last())
+        self._writer().append(render)
+        for mirror in self.mirrors:
+            mirror.append(render)
@@ -0,0 +1,34 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Self
+
+import timeclock_el_punch_clock.segments as segments
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.segments import Compression, Segment
+
+
+@dataclass
+class Compact:
+    file: WriteableFilePath
+    delimiter: str
+    compression: Compression = Compression.NONE
+
+    @classmethod
+    def from_arguments(
+        cls, arguments: Arguments, compression: Compression = Compression.NONE
+    ) -> Self:
+        return cls(
+            file=arguments.file,
+            delimiter=arguments.delimiter,
+            compression=compression,
+        )
+
+    @contracts.has("io")
+    @contracts.raises(MalformedLineError, FileExistsError)
+    def __call__(self) -> Sequence[Segment]:
+        return segments.compact(
+            self.file, compression=self.compression, delimiter=self.delimiter
+        )
@@ -0,0 +1,10 @@
+class EntriesNotInOrderError(Exception):
+    pass
+
+
+class EntriesNotAlternatingError(Exception):
+    pass
+
+
+class DaemonError(Exception):
+    pass
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, MutableSequence, Sequence
+from dataclasses import dataclass, field
+from typing import Self
+
+import timeclock_el_punch_clock.appends as appends
+import timeclock_el_punch_clock.tails as tails
+import timeclock_el_punch_clock.timestamps as timestamps
+import timeclock_el_punch_clock.writers.texts as texts
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.commands.errors import (
+    EntriesNotAlternatingError,
+    EntriesNotInOrderError,
+)
+from timeclock_el_punch_clock.parsing.entries import (
+    ClockInEntry,
+    ClockOutEntry,
+    HeadingEntry,
+)
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.policies import FsyncPolicy
+from timeclock_el_punch_clock.writers.protocols import ClockEntry, Writer
+
+_HEADING_WIDTHS = (4, 7, 10)
+
+
+def _import_entries__call___ensure(self: ImportEntries, result: None) -> bool:
+    if not self.entries:
+        return True
+    data = texts.format_entries(self.entries[-1:], delimiter=self.delimiter).encode()
+    return self._end is not None and (
+        tails.read_range(self.file, self._end - len(data), self._end) == data
+    )
+
+
+@dataclass
+class ImportEntries:
+    file: WriteableFilePath
+    entries: Sequence[ClockInEntry | ClockOutEntry]
+    delimiter: str
+    fsync_policy: FsyncPolicy = FsyncPolicy.ALWAYS
+    mirrors: Sequence[Writer] = ()
+    _end: int | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_arguments(
+        cls,
+        arguments: Arguments,
+        entries: Iterable[ClockInEntry | ClockOutEntry],
+        mirrors: Sequence[Writer] = (),
+    ) -> Self:
+        return cls(
+            file=arguments.file,
+            entries=tuple(entries),
+            delimiter=arguments.delimiter,
+            fsync_policy=arguments.fsync_policy,
+            mirrors=tuple(mirrors),
+        )
+
+    def _tail(self) -> tuple[ClockInEntry | ClockOutEntry | None, list[str | None]]:
+        headings: list[str | None] = [None] * len(_HEADING_WIDTHS)
+        for entry in tails.iter_entries_reversed(self.file, delimiter=self.delimiter):
+            if isinstance(entry, HeadingEntry):
+                if (
+                    1 <= entry.level <= len(headings)
+                    and headings[entry.level - 1] is None
+                ):
+                    headings[entry.level - 1] = entry.title
+            elif isinstance(entry, (ClockInEntry, ClockOutEntry)):
+                date = timestamps.format_epoch(entry.timestamp)
+                for level, width in enumerate(_HEADING_WIDTHS):
+                    if headings[level] is None:
+                        headings[level] = date[:width]
+                return entry, headings
+        return None, headings
+
+    def _checked(self, last: ClockEntry | None) -> Sequence[ClockEntry]:
+        for entry in self.entries:
+            if last is not None and entry.timestamp < last.timestamp:
+                raise EntriesNotInOrderError(
+                    f"{entry} is earlier than the preceding {last}"
+                )
+            if isinstance(entry, ClockInEntry) == isinstance(last, ClockInEntry):
+                raise EntriesNotAlternatingError(
+                    f"{entry} does not alternate with the preceding {last}"
+                )
+            last = entry
+        return self.entries
+
+    def _render(self) -> bytes:
+        last, headings = self._tail()
+        chunks: MutableSequence[str] = []
+        for entry in self._checked(last):
+            datetimestamp = timestamps.format_epoch(entry.timestamp)
+            for level, width in enumerate(_HEADING_WIDTHS):
+                if headings[level] != datetimestamp[:width]:
+                    for changed, changed_width in enumerate(
+                        _HEADING_WIDTHS[level:], level
+                    ):
+                        heading = datetimestamp[:changed_width]
+                        headings[changed] = heading
+                        chunks.append(f"{'*' * (changed + 1)} {heading}\n")
+                    break
+            chunks.append(texts.format_entries((entry,), delimiter=self.delimiter))
+        return "".join(chunks).encode()
+
+    @contracts.has("io")
+    @contracts.raises(
+        EntriesNotInOrderError, EntriesNotAlternatingError, MalformedLineError
+    )
+    @contracts.ensure(_import_entries__call___ensure)
+    def __call__(self) -> None:
+        if not self.entries:
+            return
+        # Checks every mirror before writing the log, so that a diverged
+        # mirror leaves them all as they were.
+        for mirror in self.mirrors:
+            self._checked(mirror.last())
+        self._end = appends.append(
+            self.file,
+            self._render,
+            fsync_policy=self.fsync_policy,
+            delimiter=self.delimiter,
+        )
+        # Each mirror receives all entries in one batch, checked against its
+        # own last entry. Headings are only written to the log.
+        for mirror in self.mirrors:
+            mirror.append(self._checked)
@@ -0,0 +1,36 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Self
+
+import timeclock_el_punch_clock.queries as queries
+import timeclock_el_punch_clock.timestamps as timestamps
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.queries import Filter, Session
+
+
+@dataclass
+class Query:
+    file: WriteableFilePath
+    delimiter: str
+    now: int
+    query_filter: Filter = Filter()
+
+    @classmethod
+    def from_arguments(cls, arguments: Arguments, query_filter: Filter) -> Self:
+        return cls(
+            file=arguments.file,
+            delimiter=arguments.delimiter,
+            now=timestamps.to_epoch(arguments.datetimestamp),
+            query_filter=query_filter,
+        )
+
+    @contracts.has("io")
+    @contracts.pre(
+        lambda self: self.query_filter.limit is None or self.query_filter.limit >= 0
+    )
+    def __call__(self) -> Iterator[Session]:
+        return queries.run(
+            self.file, self.query_filter, delimiter=self.delimiter, now=self.now
+        )
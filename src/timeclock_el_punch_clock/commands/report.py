@@ -0,0 +1,126 @@
+import pathlib
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Self
+
+import timeclock_el_punch_clock.caches as caches
+import timeclock_el_punch_clock.parallel as parallel
+import timeclock_el_punch_clock.reports as reports
+import timeclock_el_punch_clock.segments as segments
+import timeclock_el_punch_clock.timestamps as timestamps
+import timeclock_el_punch_clock.zones as zones
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.registries import AccountRegistry
+from timeclock_el_punch_clock.reports import Period
+
+
+@dataclass
+class Report:
+    file: WriteableFilePath
+    delimiter: str
+    until: int
+    prefix: Sequence[Account] = ()
+    period: Period | None = None
+    others: Sequence[pathlib.Path] = ()
+    workers: int = 1
+    cache: bool = False
+    # Entries before any timezone tag are in this zone; None leaves untagged
+    # logs in naive wall-clock time.
+    zone: str | None = None
+
+    @classmethod
+    def from_arguments(
+        cls,
+        arguments: Arguments,
+        period: Period | None,
+        others: Sequence[pathlib.Path] = (),
+        workers: int = 1,
+        cache: bool = False,
+        zone: str | None = None,
+    ) -> Self:
+        return cls(
+            file=arguments.file,
+            delimiter=arguments.delimiter,
+            until=timestamps.to_epoch(arguments.datetimestamp),
+            prefix=arguments.accounts,
+            period=period,
+            others=tuple(others),
+            workers=workers,
+            cache=cache,
+            zone=zone,
+        )
+
+    @contracts.has("io")
+    @contracts.pre(lambda self: self.workers > 0)
+    @contracts.raises(MalformedLineError)
+    def __call__(self) -> Mapping[str, int]:
+        paths = (self.file, *self.others)
+        if self.zone is not None or any(zones.tagged(path) for path in paths):
+            return self._zoned(paths)
+        if self.cache:
+            registry = AccountRegistry()
+            intervals = reports.concatenate(
+                [
+                    reports.from_cache(
+                        caches.load(path, delimiter=self.delimiter),
+                        until=self.until,
+                        registry=registry,
+                    )
+                    for path in paths
+                ],
+                registry,
+            )
+        else:
+            intervals = parallel.intervals_from_files(
+                paths,
+                delimiter=self.delimiter,
+                until=self.until,
+                workers=self.workers,
+            )
+        # Compacted years only need their stored totals, unless the report
+        # is split by period.
+        archived = [
+            segments.totals(path, intervals.registry)
+            if self.period is None
+            else segments.intervals(path, intervals.registry, delimiter=self.delimiter)
+            for path in paths
+        ]
+        intervals = reports.concatenate([*archived, intervals], intervals.registry)
+        if self.prefix:
+            intervals = reports.select(intervals, self.prefix)
+        if self.period is None:
+            return reports.totals_by_account(intervals, delimiter=self.delimiter)
+        return reports.totals_by_period(intervals, self.period)
+
+    def _zoned(self, paths: Sequence[pathlib.Path]) -> Mapping[str, int]:
+        # Every entry is read, segments included, to convert it to UTC; the
+        # stored totals of segments are in wall-clock time.
+        registry = AccountRegistry()
+        parts = [
+            reports.from_zoned_entries(
+                segments.iter_entries(path, delimiter=self.delimiter),
+                zone=self.zone or zones.UTC,
+                until=self.until,
+                registry=registry,
+            )
+            for path in paths
+        ]
+        intervals = reports.concatenate([part for part, _ in parts], registry)
+        if self.prefix:
+            intervals = reports.select(intervals, self.prefix)
+        if self.period is None:
+            return reports.totals_by_account(intervals, delimiter=self.delimiter)
+        if not len(intervals):
+            return {}
+        # Periods are days, weeks and months of the zone of the report, or
+        # else of the last tag in the log.
+        table = zones.table(
+            self.zone or parts[0][1],
+            int(intervals.starts.min()),
+            int(intervals.ends.max()),
+        )
+        return reports.totals_by_period(intervals, self.period, table)
@@ -0,0 +1,127 @@
+import asyncio
+import contextlib
+import json
+import os
+import signal
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Self
+
+import timeclock_el_punch_clock.daemons as daemons
+import timeclock_el_punch_clock.snapshots as snapshots
+import timeclock_el_punch_clock.timestamps as timestamps
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.accounts import into_accounts
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.commands.clock_in import ClockIn
+from timeclock_el_punch_clock.paths import stats
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.policies import FsyncPolicy
+from timeclock_el_punch_clock.snapshots import Snapshot
+from timeclock_el_punch_clock.writers.texts import TextWriter
+
+
+@dataclass
+class Serve:
+    file: WriteableFilePath
+    delimiter: str
+    fsync_policy: FsyncPolicy = FsyncPolicy.ALWAYS
+    # The last clock entry, revalidated against the log by a stat per request.
+    snapshot: Snapshot | None = None
+    # Kept across requests with the index of the log, which the writer
+    # reloads only once the log has changed by other means.
+    _writer: TextWriter | None = field(default=None, init=False, repr=False)
+    # Requests are handled one at a time, off the event loop.
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+
+    @classmethod
+    def from_arguments(cls, arguments: Arguments) -> Self:
+        return cls(
+            file=arguments.file,
+            delimiter=arguments.delimiter,
+            fsync_policy=arguments.fsync_policy,
+        )
+
+    def _status(self) -> Snapshot:
+        self.snapshot = snapshots.advance(
+            self.file, self.snapshot, delimiter=self.delimiter
+        )
+        return self.snapshot
+
+    def _text_writer(self, fsync_policy: FsyncPolicy) -> TextWriter:
+        if self._writer is None:
+            self._writer = TextWriter(self.file, delimiter=self.delimiter)
+        self._writer.fsync_policy = fsync_policy
+        return self._writer
+
+    def handle(self, message: Mapping[str, Any]) -> Mapping[str, Any]:
+        stats.clear()
+        try:
+            with contracts.sampled():
+                match message.get("command"):
+                    case "in":
+                        fsync_policy = FsyncPolicy(
+                            message.get("fsync", self.fsync_policy)
+                        )
+                        ClockIn(
+                            file=self.file,
+                            datetimestamp=timestamps.parse_datetime(
+                                message["datetime"]
+                            ),
+                            accounts=into_accounts(message.get("accounts", ())),
+                            delimiter=self.delimiter,
+                            fsync_policy=fsync_policy,
+                            writer=self._text_writer(fsync_policy),
+                        )()
+                        return {}
+                    case "status":
+                        return {"last": daemons.encode_entry(self._status().last)}
+                    case command:
+                        raise ValueError(f"unknown command {command!r}")
+        except Exception as err:
+            # Whatever fails, the client gets a response and the daemon
+            # serves on.
+            return daemons.encode_error(err)
+
+    async def _connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except ValueError as err:
+                    response = daemons.encode_error(err)
+                else:
+                    async with self._lock:
+                        response = await asyncio.to_thread(self.handle, message)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, stop: asyncio.Event) -> None:
+        address = daemons.socket_path(self.file)
+        if daemons.request(self.file, {"command": "status"}) is not None:
+            raise FileExistsError(f"a daemon already serves {self.file} at {address}")
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(address)
+        server = await asyncio.start_unix_server(self._connection, path=address)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(address)
+
+    @contracts.has("io")
+    @contracts.raises(FileExistsError)
+    def __call__(self) -> None:
+        async def main() -> None:
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, stop.set)
+            await self.serve(stop)
+
+        asyncio.run(main())
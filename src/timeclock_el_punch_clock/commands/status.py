@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Self
+
+import timeclock_el_punch_clock.snapshots as snapshots
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.snapshots import Snapshot
+
+
+@dataclass
+class Status:
+    file: WriteableFilePath
+    delimiter: str
+
+    @classmethod
+    def from_arguments(cls, arguments: Arguments) -> Self:
+        return cls(file=arguments.file, delimiter=arguments.delimiter)
+
+    @contracts.has("io")
+    @contracts.raises(MalformedLineError)
+    def __call__(self) -> Snapshot:
+        return snapshots.update(self.file, delimiter=self.delimiter)
@@ -0,0 +1,45 @@
+import datetime
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Self
+
+import timeclock_el_punch_clock.timestamps as timestamps
+import timeclock_el_punch_clock.watches as watches
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.paths import stats
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.watches import Tally
+
+
+@dataclass
+class Watch:
+    file: WriteableFilePath
+    delimiter: str
+    poll_interval: float | None = None
+    clock: Callable[[], datetime.datetime] = datetime.datetime.now
+
+    @classmethod
+    def from_arguments(
+        cls, arguments: Arguments, poll_interval: float | None = None
+    ) -> Self:
+        return cls(
+            file=arguments.file,
+            delimiter=arguments.delimiter,
+            poll_interval=poll_interval,
+        )
+
+    def _summaries(self) -> Iterator[tuple[datetime.datetime, Mapping[str, int]]]:
+        tally = Tally()
+        for _ in watches.changes(self.file, poll_interval=self.poll_interval):
+            stats.clear()
+            now = self.clock()
+            epoch = timestamps.to_epoch(now)
+            if tally.advance(
+                self.file, delimiter=self.delimiter, since=epoch - epoch % 86400
+            ):
+                yield now, tally.day_totals(epoch, delimiter=self.delimiter)
+
+    @contracts.has("io")
+    def __call__(self) -> Iterator[tuple[datetime.datetime, Mapping[str, int]]]:
+        return self._summaries()
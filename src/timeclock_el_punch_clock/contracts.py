@@ -0,0 +1,119 @@
+import contextlib
+import enum
+import os
+import sys
+from collections.abc import Callable, Iterator, Mapping
+
+MODE_VARIABLE = "TTLPC_CONTRACTS"
+INTERVAL_VARIABLE = "TTLPC_CONTRACTS_INTERVAL"
+DEFAULT_SAMPLE_INTERVAL = 100
+
+
+class ContractsMode(enum.StrEnum):
+    ON = "on"
+    OFF = "off"
+    SAMPLED = "sampled"
+
+
+_mode = ContractsMode.ON
+_interval = 1
+_calls = 0
+
+
+def mode_from_environment(environ: Mapping[str, str] = os.environ) -> ContractsMode:
+    value = environ.get(MODE_VARIABLE, ContractsMode.ON)
+    try:
+        return ContractsMode(value)
+    except ValueError as err:
+        raise ValueError(
+            f"${MODE_VARIABLE} must be one of {', '.join(ContractsMode)}, got {value!r}"
+        ) from err
+
+
+def interval_from_environment(environ: Mapping[str, str] = os.environ) -> int:
+    value = environ.get(INTERVAL_VARIABLE, str(DEFAULT_SAMPLE_INTERVAL))
+    if not (value.isascii() and value.isdigit() and int(value) >= 1):
+        raise ValueError(
+            f"${INTERVAL_VARIABLE} must be a positive integer, got {value!r}"
+        )
+    return int(value)
+
+
+def configure(mode: ContractsMode, interval: int = DEFAULT_SAMPLE_INTERVAL) -> None:
+    global _mode, _interval, _calls
+    if interval < 1:
+        raise ValueError(f"sample interval must be positive, got {interval}")
+    _mode, _interval = mode, interval
+    # A random phase spreads the checked calls over short-lived processes.
+    _calls = int.from_bytes(os.urandom(4)) % interval
+    if "deal" not in sys.modules and (
+        mode is ContractsMode.OFF or (mode is ContractsMode.ON and __debug__)
+    ):
+        # deal starts out enabled, and functions decorated while contracts are
+        # off are left bare, so neither needs it imported.
+        return
+    import deal
+
+    if mode is ContractsMode.ON:
+        deal.enable(warn=False)
+    else:
+        deal.disable(warn=False)
+
+
+@contextlib.contextmanager
+def sampled() -> Iterator[bool]:
+    global _calls
+    if _mode is not ContractsMode.SAMPLED:
+        yield _mode is ContractsMode.ON
+        return
+    _calls += 1
+    if _calls % _interval:
+        yield False
+        return
+    import deal
+
+    deal.enable(warn=False)
+    try:
+        yield True
+    finally:
+        deal.disable(warn=False)
+
+
+def _contract[F: Callable[..., object]](
+    name: str, *args: object, **kwargs: object
+) -> Callable[[F], F]:
+    # Commands are imported after configure, so with contracts off a command
+    # never imports deal. Its functions stay bare for the rest of the process.
+    # deal checks a generator function once per item it yields, so streaming
+    # functions are either left undecorated or return a generator instead of
+    # being one.
+    def decorate(func: F) -> F:
+        if _mode is ContractsMode.OFF:
+            return func
+        import deal
+
+        return getattr(deal, name)(*args, **kwargs)(func)
+
+    return decorate
+
+
+def has[F: Callable[..., object]](*markers: str) -> Callable[[F], F]:
+    return _contract("has", *markers)
+
+
+def raises[F: Callable[..., object]](
+    *exceptions: type[BaseException],
+) -> Callable[[F], F]:
+    return _contract("raises", *exceptions)
+
+
+def pre[F: Callable[..., object]](
+    validator: Callable[..., object],
+) -> Callable[[F], F]:
+    return _contract("pre", validator)
+
+
+def ensure[F: Callable[..., object]](
+    validator: Callable[..., object],
+) -> Callable[[F], F]:
+    return _contract("ensure", validator)
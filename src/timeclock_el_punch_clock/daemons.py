@@ -0,0 +1,86 @@
+import pathlib
+from collections.abc import Mapping
+from typing import Any
+
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.commands.errors import (
+    DaemonError,
+    EntriesNotAlternatingError,
+)
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+# Requests and responses are single lines of JSON over a Unix domain socket
+# beside the log. Only deal-free modules are imported here, as the client runs
+# on every command, and socket and json only once a daemon listens.
+
+DEFAULT_TIMEOUT = 5.0
+
+ERRORS: Mapping[str, type[Exception]] = {
+    error.__name__: error
+    for error in (EntriesNotAlternatingError, MalformedLineError, ValueError)
+}
+
+
+def socket_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(f"{path.name}.sock")
+
+
+def encode_entry(entry: ClockInEntry | ClockOutEntry | None) -> Any:
+    match entry:
+        case ClockInEntry():
+            return ["i", entry.timestamp, list(entry.accounts)]
+        case ClockOutEntry():
+            return ["o", entry.timestamp]
+    return None
+
+
+def decode_entry(value: Any) -> ClockInEntry | ClockOutEntry | None:
+    match value:
+        case ["i", int(timestamp), list(accounts)]:
+            return ClockInEntry(timestamp, tuple(Account(a) for a in accounts))
+        case ["o", int(timestamp)]:
+            return ClockOutEntry(timestamp)
+    return None
+
+
+def encode_error(err: Exception) -> Mapping[str, str]:
+    return {"error": type(err).__name__, "message": str(err)}
+
+
+def request(
+    path: pathlib.Path,
+    message: Mapping[str, Any],
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Mapping[str, Any] | None:
+    # None means that no daemon serves the log, and the caller should access
+    # it directly.
+    address = socket_path(path)
+    if not address.exists():
+        return None
+    import json
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        try:
+            client.connect(str(address))
+            client.sendall(json.dumps(message).encode() + b"\n")
+            response = b""
+            while not response.endswith(b"\n"):
+                data = client.recv(65536)
+                if not data:
+                    return None
+                response += data
+        except OSError:
+            # Also a daemon that hangs or goes away mid-request. Should it
+            # have clocked in all the same, doing so again fails to alternate.
+            return None
+    decoded = json.loads(response)
+    if "error" in decoded:
+        error = ERRORS.get(decoded["error"])
+        if error is None:
+            # Any other failure of the daemon.
+            raise DaemonError(f"{decoded['error']}: {decoded['message']}")
+        raise error(decoded["message"])
+    return decoded
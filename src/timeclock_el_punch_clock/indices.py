@@ -0,0 +1,178 @@
+import array
+import bisect
+import pathlib
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+from timeclock_el_punch_clock import contracts, timestamps
+from timeclock_el_punch_clock.parsing import backends, mmaps
+from timeclock_el_punch_clock.parsing.entries import Entry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.paths import replacements
+
+DEFAULT_INTERVAL = 2**16
+
+_MAGIC = b"TTLPCIDX"
+_VERSION = 1
+_HEADER = struct.Struct("<8sQqqqq")
+_RECORD = struct.Struct("<qq")
+
+
+@dataclass
+class Index:
+    size: int
+    mtime_ns: int
+    end: int = 0
+    # Every entry before offsets[k] has a timestamp of at most bounds[k].
+    bounds: array.array = field(default_factory=lambda: array.array("q"))
+    offsets: array.array = field(default_factory=lambda: array.array("q"))
+    # Number of records on disk that precede the ones held in bounds/offsets.
+    base: int = 0
+
+    def seek(self, timestamp: int) -> int:
+        assert self.base == 0, "Invariant: seek requires a fully loaded index"
+        position = bisect.bisect_left(self.bounds, timestamp)
+        if position == 0:
+            return 0
+        return self.offsets[position - 1]
+
+    def records(self, start: int = 0) -> bytes:
+        flat = array.array("q", bytes(16 * (len(self.bounds) - start)))
+        flat[0::2] = self.bounds[start:]
+        flat[1::2] = self.offsets[start:]
+        return flat.tobytes()
+
+    def header(self) -> bytes:
+        count = self.base + len(self.bounds)
+        return _HEADER.pack(_MAGIC, _VERSION, self.size, self.mtime_ns, self.end, count)
+
+
+def index_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(f"{path.name}.idx")
+
+
+def _heading_bound(title: bytes) -> int | None:
+    padding = {4: b"-01-01", 7: b"-01", 10: b""}.get(len(title))
+    if padding is None:
+        return None
+    try:
+        return timestamps.parse_date((title + padding).decode()) * 86400 - 1
+    except ValueError:
+        return None
+
+
+def _entry_bound(line: bytes) -> int | None:
+    try:
+        entry = next(mmaps.parse_buffer(line))
+    except MalformedLineError:
+        return None
+    return entry.timestamp
+
+
+@contracts.has("io")
+def extend(path: pathlib.Path, index: Index | None = None) -> Index:
+    stat = path.stat()
+    if index is None:
+        index = Index(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    index.size, index.mtime_ns = stat.st_size, stat.st_mtime_ns
+    previous = index.offsets[-1] if index.offsets else -DEFAULT_INTERVAL
+    with path.open(mode="rb") as file:
+        file.seek(index.end)
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            bound: int | None = None
+            if line.startswith(b"*"):
+                bound = _heading_bound(line.lstrip(b"*").strip())
+            elif index.end - previous >= DEFAULT_INTERVAL and line[:1] in (b"i", b"o"):
+                bound = _entry_bound(line)
+            if bound is not None and (not index.bounds or bound >= index.bounds[-1]):
+                index.bounds.append(bound)
+                index.offsets.append(index.end)
+                previous = index.end
+            index.end += len(line)
+    return index
+
+
+@contracts.has("io")
+def _load(path: pathlib.Path, tail: bool) -> Index | None:
+    try:
+        with index_path(path).open(mode="rb") as file:
+            magic, version, size, mtime_ns, end, count = _HEADER.unpack(
+                file.read(_HEADER.size)
+            )
+            base = max(count - 1, 0) if tail else 0
+            file.seek(_HEADER.size + _RECORD.size * base)
+            data = file.read()
+    except (FileNotFoundError, struct.error):
+        return None
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    if len(data) != _RECORD.size * (count - base):
+        return None
+    stat = path.stat()
+    if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+        return None
+    flat = array.array("q", data)
+    return Index(
+        size=size,
+        mtime_ns=mtime_ns,
+        end=end,
+        bounds=flat[0::2],
+        offsets=flat[1::2],
+        base=base,
+    )
+
+
+@contracts.has("io")
+def load(path: pathlib.Path) -> Index | None:
+    return _load(path, tail=False)
+
+
+@contracts.has("io")
+def load_tail(path: pathlib.Path) -> Index | None:
+    return _load(path, tail=True)
+
+
+@contracts.has("io")
+def save(path: pathlib.Path, index: Index) -> None:
+    assert index.base == 0, "Invariant: save requires a fully loaded index"
+    replacements.replace(index_path(path), index.header() + index.records())
+
+
+@contracts.has("io")
+def load_or_build(path: pathlib.Path) -> Index:
+    index = load(path)
+    if index is None:
+        index = extend(path)
+        save(path, index)
+    return index
+
+
+@contracts.has("io")
+def update(path: pathlib.Path, index: Index | None) -> None:
+    if index is None:
+        if index_path(path).exists():
+            save(path, extend(path))
+        return
+    known = len(index.bounds)
+    extend(path, index)
+    with index_path(path).open(mode="r+b") as file:
+        file.seek(_HEADER.size + _RECORD.size * (index.base + known))
+        file.write(index.records(known))
+        file.truncate()
+        file.seek(0)
+        file.write(index.header())
+
+
+def iter_entries_since(
+    path: pathlib.Path,
+    timestamp: int,
+    delimiter: str = ":",
+    backend: backends.Backend = backends.Backend.LINES,
+) -> Iterator[Entry]:
+    offset = load_or_build(path).seek(timestamp)
+    yield from backends.iter_entries(
+        path, delimiter=delimiter, offset=offset, backend=backend
+    )
@@ -0,0 +1,139 @@
+import concurrent.futures
+import os
+import pathlib
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from timeclock_el_punch_clock import reports
+from timeclock_el_punch_clock.parsing import mmaps
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry, Entry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.registries import AccountRegistry
+from timeclock_el_punch_clock.reports import Intervals
+
+DEFAULT_CHUNK_SIZE = 2**24
+_ALIGN_WINDOW = 2**16
+
+
+@dataclass(frozen=True)
+class Chunk:
+    path: pathlib.Path
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Partial:
+    intervals: Intervals
+    # The first clock entry may close an interval opened in an earlier chunk,
+    # the last one may be opened here and closed in a later chunk.
+    first: ClockInEntry | ClockOutEntry | None
+    last: ClockInEntry | ClockOutEntry | None
+
+
+def _align(fd: int, position: int, size: int) -> int:
+    while position < size:
+        window = os.pread(fd, _ALIGN_WINDOW, position)
+        newline = window.find(b"\n")
+        if newline >= 0:
+            return position + newline + 1
+        position += len(window)
+    return size
+
+
+def split(path: pathlib.Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Sequence[Chunk]:
+    with path.open(mode="rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        bounds = [0]
+        while bounds[-1] + chunk_size < size:
+            # Align to the start of the line after the nominal bound.
+            bounds.append(_align(file.fileno(), bounds[-1] + chunk_size - 1, size))
+    bounds.append(size)
+    return [
+        Chunk(path, start, end) for start, end in zip(bounds, bounds[1:]) if start < end
+    ]
+
+
+def parse_chunk(chunk: Chunk, delimiter: str = ":") -> Partial:
+    with chunk.path.open(mode="rb") as file:
+        buffer = os.pread(file.fileno(), chunk.end - chunk.start, chunk.start)
+    first: ClockInEntry | ClockOutEntry | None = None
+    last: ClockInEntry | ClockOutEntry | None = None
+
+    def clock_entries(entries: Iterable[Entry]) -> Iterator[Entry]:
+        nonlocal first, last
+        for entry in entries:
+            if isinstance(entry, (ClockInEntry, ClockOutEntry)):
+                if first is None:
+                    first = entry
+                last = entry
+                yield entry
+
+    try:
+        intervals = reports.from_entries(
+            clock_entries(mmaps.parse_buffer(buffer, delimiter=delimiter))
+        )
+    except MalformedLineError as err:
+        raise MalformedLineError(
+            f"{chunk.path} bytes {chunk.start}-{chunk.end}: {err}"
+        ) from err
+    return Partial(intervals, first, last)
+
+
+def _merge(
+    partials: Iterable[Partial], registry: AccountRegistry, until: int | None
+) -> Iterator[Intervals]:
+    current: ClockInEntry | None = None
+    for partial in partials:
+        if current is not None and partial.first is not None:
+            yield reports.from_arrays(
+                [current.timestamp],
+                [partial.first.timestamp],
+                [registry.intern(current.accounts)],
+                registry,
+            )
+        local = partial.intervals.registry
+        ids = np.asarray(
+            [registry.intern(local.path(node)) for node in range(len(local))],
+            dtype=np.int32,
+        )
+        yield reports.from_arrays(
+            partial.intervals.starts,
+            partial.intervals.ends,
+            ids[partial.intervals.account_ids],
+            registry,
+        )
+        if partial.last is not None:
+            current = partial.last if isinstance(partial.last, ClockInEntry) else None
+    if current is not None and until is not None and until > current.timestamp:
+        yield reports.from_arrays(
+            [current.timestamp], [until], [registry.intern(current.accounts)], registry
+        )
+
+
+def intervals_from_files(
+    paths: Sequence[pathlib.Path],
+    delimiter: str = ":",
+    until: int | None = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Intervals:
+    chunks = [split(path, chunk_size=chunk_size) for path in paths]
+    flat = [chunk for file_chunks in chunks for chunk in file_chunks]
+    delimiters = [delimiter] * len(flat)
+    if workers == 1:
+        partials = list(map(parse_chunk, flat, delimiters))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(parse_chunk, flat, delimiters))
+
+    registry = AccountRegistry()
+    merged: list[Intervals] = []
+    position = 0
+    for file_chunks in chunks:
+        file_partials = partials[position : position + len(file_chunks)]
+        merged.extend(_merge(file_partials, registry, until))
+        position += len(file_chunks)
+    return reports.concatenate(merged, registry)
@@ -0,0 +1,24 @@
+import enum
+import pathlib
+from collections.abc import Iterator
+
+from timeclock_el_punch_clock.parsing import lines, mmaps
+from timeclock_el_punch_clock.parsing.entries import Entry
+
+
+class Backend(enum.StrEnum):
+    LINES = "lines"
+    MMAP = "mmap"
+
+
+def iter_entries(
+    path: pathlib.Path,
+    delimiter: str = ":",
+    offset: int = 0,
+    backend: Backend = Backend.LINES,
+) -> Iterator[Entry]:
+    match backend:
+        case Backend.LINES:
+            return lines.iter_entries(path, delimiter=delimiter, offset=offset)
+        case Backend.MMAP:
+            return mmaps.iter_entries(path, delimiter=delimiter, offset=offset)
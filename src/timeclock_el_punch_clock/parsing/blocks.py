@@ -0,0 +1,154 @@
+import pathlib
+from collections.abc import Iterator
+
+import numpy as np
+
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import fields, lines
+from timeclock_el_punch_clock.parsing.entries import (
+    BLANK,
+    ClockInEntry,
+    ClockOutEntry,
+    Entry,
+    HeadingEntry,
+)
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+DEFAULT_BLOCK_SIZE = 2**20
+
+_new_entry = tuple.__new__
+
+_OTHER, _CLOCK_IN, _CLOCK_OUT = 0, 1, 2
+
+# Columns of " YYYY-mm-dd HH:MM:SS", after the kind of a clock line.
+_WIDTH = 20
+_DIGITS = np.asarray((1, 2, 3, 4, 6, 7, 9, 10, 12, 13, 15, 16, 18, 19))
+_SEPARATORS = np.asarray((0, 5, 8, 11, 14, 17))
+_SEPARATOR_VALUES = np.frombuffer(b" -- ::", dtype=np.uint8)
+_DAYS_IN_MONTH = np.asarray(
+    (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31, 0, 0, 0), dtype=np.int32
+)
+# Days from 0000-03-01 to 1970-01-01 in the proleptic Gregorian calendar.
+_EPOCH_DAYS = 719468
+
+
+def _clock_lines(block: bytes) -> tuple[list[int], list[int]]:
+    # The kind of each line of a block that ends in a newline, and its epoch.
+    # Only clock lines exactly as ClockIn writes them are decoded here: all
+    # others are _OTHER and parsed one by one, which also reports them.
+    data = np.frombuffer(block, dtype=np.uint8)
+    ends = np.flatnonzero(data == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+    kinds = data[starts]
+    outs = kinds == ord("o")
+    candidates = np.flatnonzero(((kinds == ord("i")) | outs) & (lengths >= 21))
+    if not len(candidates):
+        return [_OTHER] * len(ends), [0] * len(ends)
+    columns = np.lib.stride_tricks.sliding_window_view(data, _WIDTH)[
+        starts[candidates] + 1
+    ]
+    digits = (columns[:, _DIGITS] - ord("0")).T
+    valid = (digits <= 9).all(axis=0) & (
+        columns[:, _SEPARATORS] == _SEPARATOR_VALUES
+    ).all(axis=1)
+    digits = digits.astype(np.int32)
+    year = digits[0] * 1000 + digits[1] * 100 + digits[2] * 10 + digits[3]
+    month = digits[4] * 10 + digits[5]
+    day = digits[6] * 10 + digits[7]
+    seconds = (
+        (digits[8] * 10 + digits[9]) * 3600
+        + (digits[10] * 10 + digits[11]) * 60
+        + digits[12] * 10
+        + digits[13]
+    )
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    valid &= (
+        (year >= 1)
+        & (month >= 1)
+        & (month <= 12)
+        & (day >= 1)
+        & (day <= _DAYS_IN_MONTH[month & 15] + ((month == 2) & leap))
+        & (digits[8] * 10 + digits[9] < 24)
+        & (digits[10] < 6)
+        & (digits[12] < 6)
+    )
+    # Clock outs carry nothing after the timestamp.
+    valid &= ~outs[candidates] | (lengths[candidates] == 21)
+    # Days since the epoch, counted from years that start on March 1st.
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    days = (
+        era * 146097
+        + year_of_era * 365
+        + year_of_era // 4
+        - year_of_era // 100
+        + day_of_year
+        - _EPOCH_DAYS
+    )
+    codes = np.full(len(ends), _OTHER, dtype=np.int8)
+    decoded = candidates[valid]
+    codes[decoded] = np.where(outs[decoded], _CLOCK_OUT, _CLOCK_IN)
+    epochs = np.zeros(len(ends), dtype=np.int64)
+    epochs[candidates] = days.astype(np.int64) * 86400 + seconds
+    return codes.tolist(), epochs.tolist()
+
+
+def _parse_line(
+    texts: list[str], line: str, delimiter: str, start: int
+) -> Iterator[Entry]:
+    try:
+        yield from lines.parse_lines((f"{line}\n",), delimiter=delimiter)
+    except MalformedLineError:
+        # An equal line before this one would have raised already.
+        number = start + texts.index(line)
+        yield from lines.parse_lines((f"{line}\n",), delimiter=delimiter, start=number)
+
+
+def iter_entries(
+    path: pathlib.Path,
+    delimiter: str = ":",
+    offset: int = 0,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[Entry]:
+    accounts_by_rest: dict[str, tuple[Account, ...]] = {}
+    start = 1
+    pending = b""
+    with path.open(mode="rb") as file:
+        file.seek(offset)
+        while chunk := file.read(block_size):
+            pending += chunk
+            cut = pending.rfind(b"\n") + 1
+            if not cut:
+                continue
+            block, pending = pending[:cut], pending[cut:]
+            codes, epochs = _clock_lines(block)
+            texts = block.decode().split("\n")
+            for line, code, epoch in zip(texts, codes, epochs):
+                if code == _CLOCK_IN:
+                    rest = line[21:]
+                    accounts = accounts_by_rest.get(rest)
+                    if accounts is None:
+                        try:
+                            accounts = accounts_by_rest[rest] = fields.parse_accounts(
+                                rest, delimiter
+                            )
+                        except ValueError:
+                            yield from _parse_line(texts, line, delimiter, start)
+                            continue
+                    yield _new_entry(ClockInEntry, (epoch, accounts))
+                elif code == _CLOCK_OUT:
+                    yield _new_entry(ClockOutEntry, (epoch,))
+                elif not line or line.isspace():
+                    yield BLANK
+                elif line[:1] == "*":
+                    yield _new_entry(HeadingEntry, fields.parse_heading(line))
+                else:
+                    yield from _parse_line(texts, line, delimiter, start)
+            start += len(codes)
+    if pending:
+        yield from lines.parse_lines(
+            (pending.decode(),), delimiter=delimiter, start=start
+        )
@@ -0,0 +1,26 @@
+from typing import NamedTuple
+
+from timeclock_el_punch_clock.accounts import Account
+
+
+class ClockInEntry(NamedTuple):
+    timestamp: int
+    accounts: tuple[Account, ...]
+
+
+class ClockOutEntry(NamedTuple):
+    timestamp: int
+
+
+class HeadingEntry(NamedTuple):
+    level: int
+    title: str
+
+
+class BlankEntry(NamedTuple):
+    pass
+
+
+BLANK = BlankEntry()
+
+Entry = ClockInEntry | ClockOutEntry | HeadingEntry | BlankEntry
@@ -0,0 +1,2 @@
+class MalformedLineError(Exception):
+    pass
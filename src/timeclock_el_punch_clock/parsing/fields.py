@@ -0,0 +1,30 @@
+import sys
+
+from timeclock_el_punch_clock import timestamps
+from timeclock_el_punch_clock.accounts import Account
+
+
+def parse_day(day: str) -> int:
+    if day[:1] != " ":
+        raise ValueError(f"malformed date {day!r}")
+    return timestamps.parse_date(day[1:]) * 86400
+
+
+def parse_seconds(time: str) -> int:
+    if time[:1] != " ":
+        raise ValueError(f"malformed time {time!r}")
+    return timestamps.parse_time(time[1:])
+
+
+def parse_accounts(accounts: str, delimiter: str) -> tuple[Account, ...]:
+    if accounts and not accounts[0].isspace():
+        raise ValueError(f"malformed accounts {accounts!r}")
+    accounts = accounts.strip()
+    if not accounts:
+        return ()
+    return tuple(Account(sys.intern(account)) for account in accounts.split(delimiter))
+
+
+def parse_heading(heading: str) -> tuple[int, str]:
+    title = heading.lstrip("*")
+    return len(heading) - len(title), title.strip()
@@ -0,0 +1,75 @@
+import pathlib
+import sys
+from collections.abc import Iterable, Iterator
+
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import fields
+from timeclock_el_punch_clock.parsing.entries import (
+    BLANK,
+    ClockInEntry,
+    ClockOutEntry,
+    Entry,
+    HeadingEntry,
+)
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+# NamedTuple.__new__ is a Python-level function, tuple.__new__ skips that frame.
+_new_entry = tuple.__new__
+# Below this many bytes, importing numpy for parsing.blocks costs more than it
+# saves, unless it is imported already.
+_BLOCKS_FROM = 2**22
+
+
+def parse_lines(
+    lines: Iterable[str], delimiter: str = ":", start: int = 1
+) -> Iterator[Entry]:
+    days: dict[str, int] = {}
+    seconds: dict[str, int] = {}
+    accounts_by_rest: dict[str, tuple[Account, ...]] = {}
+    number, line = 0, ""
+    try:
+        for number, line in enumerate(lines, start=start):
+            kind = line[:1]
+            if kind == "i" or kind == "o":
+                day = days.get(line[1:12])
+                if day is None:
+                    day = days[line[1:12]] = fields.parse_day(line[1:12])
+                second = seconds.get(line[12:21])
+                if second is None:
+                    second = seconds[line[12:21]] = fields.parse_seconds(line[12:21])
+                if kind == "o":
+                    if len(line) > 22 and not line[21:].isspace():
+                        raise ValueError("clock out with accounts")
+                    yield _new_entry(ClockOutEntry, (day + second,))
+                    continue
+                rest = line[21:]
+                accounts = accounts_by_rest.get(rest)
+                if accounts is None:
+                    accounts = accounts_by_rest[rest] = fields.parse_accounts(
+                        rest, delimiter
+                    )
+                yield _new_entry(ClockInEntry, (day + second, accounts))
+            elif not line or line.isspace():
+                yield BLANK
+            elif kind == "*":
+                yield _new_entry(HeadingEntry, fields.parse_heading(line))
+            else:
+                raise ValueError("unknown entry")
+    except ValueError as err:
+        raise MalformedLineError(f"line {number}: {err} in {line!r}") from err
+
+
+def iter_entries(
+    path: pathlib.Path, delimiter: str = ":", offset: int = 0
+) -> Iterator[Entry]:
+    if "numpy" in sys.modules or path.stat().st_size - offset >= _BLOCKS_FROM:
+        from timeclock_el_punch_clock.parsing import blocks
+
+        return blocks.iter_entries(path, delimiter=delimiter, offset=offset)
+    return _iter_lines(path, delimiter, offset)
+
+
+def _iter_lines(path: pathlib.Path, delimiter: str, offset: int) -> Iterator[Entry]:
+    with path.open(mode="r") as file:
+        file.seek(offset)
+        yield from parse_lines(file, delimiter=delimiter)
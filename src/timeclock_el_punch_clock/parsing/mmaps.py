@@ -0,0 +1,86 @@
+import mmap
+import os
+import pathlib
+from collections.abc import Iterator
+
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import fields
+from timeclock_el_punch_clock.parsing.entries import (
+    BLANK,
+    ClockInEntry,
+    ClockOutEntry,
+    Entry,
+    HeadingEntry,
+)
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+_new_entry = tuple.__new__
+
+_CLOCK_IN = ord("i")
+_CLOCK_OUT = ord("o")
+_HEADING = ord("*")
+
+
+# Only the fixed-width fields are sliced out of the buffer, as bytes. They are
+# decoded once per distinct value, no str is created per line.
+def parse_buffer(
+    buffer: bytes | mmap.mmap, delimiter: str = ":", offset: int = 0
+) -> Iterator[Entry]:
+    days: dict[bytes, int] = {}
+    seconds: dict[bytes, int] = {}
+    accounts_by_rest: dict[bytes, tuple[Account, ...]] = {}
+    find = buffer.find
+    size = len(buffer)
+    start = offset
+    try:
+        while start < size:
+            end = find(b"\n", start)
+            if end < 0:
+                end = size
+            kind = buffer[start]
+            if kind == _CLOCK_IN or kind == _CLOCK_OUT:
+                key = buffer[start + 1 : start + 12]
+                day = days.get(key)
+                if day is None:
+                    day = days[key] = fields.parse_day(key.decode())
+                key = buffer[start + 12 : start + 21]
+                second = seconds.get(key)
+                if second is None:
+                    second = seconds[key] = fields.parse_seconds(key.decode())
+                if kind == _CLOCK_OUT:
+                    if end - start > 21 and not buffer[start + 21 : end].isspace():
+                        raise ValueError("clock out with accounts")
+                    yield _new_entry(ClockOutEntry, (day + second,))
+                else:
+                    key = buffer[start + 21 : end]
+                    accounts = accounts_by_rest.get(key)
+                    if accounts is None:
+                        accounts = accounts_by_rest[key] = fields.parse_accounts(
+                            key.decode(), delimiter
+                        )
+                    yield _new_entry(ClockInEntry, (day + second, accounts))
+            elif end == start or buffer[start:end].isspace():
+                yield BLANK
+            elif kind == _HEADING:
+                heading = buffer[start:end].decode()
+                yield _new_entry(HeadingEntry, fields.parse_heading(heading))
+            else:
+                raise ValueError("unknown entry")
+            start = end + 1
+    except ValueError as err:
+        number = buffer[offset:start].count(b"\n") + 1
+        raise MalformedLineError(
+            f"line {number}: {err} in {buffer[start:end]!r}"
+        ) from err
+
+
+def iter_entries(
+    path: pathlib.Path, delimiter: str = ":", offset: int = 0
+) -> Iterator[Entry]:
+    with path.open(mode="rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                buffer.madvise(mmap.MADV_SEQUENTIAL)
+            yield from parse_buffer(buffer, delimiter=delimiter, offset=offset)
@@ -0,0 +1,47 @@
+import contextlib
+import os
+import pathlib
+import stat as stat_module
+
+from timeclock_el_punch_clock import contracts
+
+_DEFAULT_MODE = 0o644
+
+
+def _create(target: pathlib.Path) -> tuple[int, pathlib.Path]:
+    # As tempfile.mkstemp does, without importing tempfile on every punch.
+    while True:
+        temporary = target.with_name(f".{target.name}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(
+                temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600
+            ), temporary
+        except FileExistsError:
+            continue
+
+
+@contracts.has("io")
+def replace(
+    target: pathlib.Path, data: bytes, mode: int | None = None, fsync: bool = False
+) -> None:
+    # Writers of the same target each get their own temporary file beside
+    # it, so that neither replaces the other's half-written one. Without a
+    # mode, the target keeps its own.
+    if mode is None:
+        try:
+            mode = stat_module.S_IMODE(os.stat(target).st_mode)
+        except FileNotFoundError:
+            mode = _DEFAULT_MODE
+    fd, temporary = _create(target)
+    try:
+        with os.fdopen(fd, mode="wb") as file:
+            file.write(data)
+            os.fchmod(file.fileno(), mode)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temporary, target)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temporary)
+        raise
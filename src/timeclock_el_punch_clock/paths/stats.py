@@ -0,0 +1,22 @@
+import os
+import pathlib
+from collections.abc import MutableMapping
+
+from timeclock_el_punch_clock import contracts
+
+# Stat results are cached for one invocation. cli.invoke clears them, and
+# so do the long-lived commands, per request (Serve) or change (Watch).
+_cache: MutableMapping[pathlib.Path, os.stat_result] = {}
+
+
+@contracts.has("io")
+@contracts.raises(FileNotFoundError, NotADirectoryError, PermissionError)
+def stat(path: pathlib.Path) -> os.stat_result:
+    result = _cache.get(path)
+    if result is None:
+        result = _cache[path] = os.stat(path)
+    return result
+
+
+def clear() -> None:
+    _cache.clear()
@@ -1,8 +1,13 @@
+import os
 import pathlib
+import stat as stat_module
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
 from typing import NewType
 
-import deal
-
+import timeclock_el_punch_clock.profiles as profiles
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.paths import stats
 from timeclock_el_punch_clock.paths.errors import (
     PathDoesNotExist,
     PathNotAFileError,
@@ -12,21 +17,57 @@ from timeclock_el_punch_clock.paths.errors import (
 WriteableFilePath = NewType("WriteableFilePath", pathlib.Path)
 
 
-@deal.has("io")
-@deal.raises(
+@contracts.has("io")
+@contracts.raises(
     PathDoesNotExist,
     PathNotAFileError,
     PathNotWriteableError,
 )
 def from_path(path: pathlib.Path) -> WriteableFilePath:
-    if not path.exists(follow_symlinks=True):
-        raise PathDoesNotExist(f'"{path}" does not exist')
-    if not path.is_file():
-        raise PathNotAFileError(f'"{path}" is not a file')
-    try:
-        with path.open("w") as file:
-            if not file.writable():
-                raise PathNotWriteableError(f'"{path}" is not writable')
-    except PermissionError as err:
-        raise PathNotWriteableError(f'"{path}" is not writable') from err
-    return WriteableFilePath(path)
+    with profiles.span("writeable_file_paths.from_path"):
+        try:
+            result = stats.stat(path)
+        except (FileNotFoundError, NotADirectoryError) as err:
+            raise PathDoesNotExist(f'"{path}" does not exist') from err
+        except PermissionError as err:
+            raise PathNotWriteableError(f'"{path}" is not writable') from err
+        if not stat_module.S_ISREG(result.st_mode):
+            raise PathNotAFileError(f'"{path}" is not a file')
+        if not os.access(path, os.W_OK):
+            raise PathNotWriteableError(f'"{path}" is not writable')
+        return WriteableFilePath(path)
+
+
+@dataclass
+class PathCache:
+    # Validated paths, reused for as long as what decides validity, the
+    # file's identity, type, permissions and owner, stays the same.
+    entries: MutableMapping[pathlib.Path, tuple[tuple[int, ...], WriteableFilePath]] = (
+        field(default_factory=dict)
+    )
+
+    @contracts.has("io")
+    @contracts.raises(
+        PathDoesNotExist,
+        PathNotAFileError,
+        PathNotWriteableError,
+    )
+    def from_path(self, path: pathlib.Path) -> WriteableFilePath:
+        try:
+            result = stats.stat(path)
+        except OSError:
+            self.entries.pop(path, None)
+            return from_path(path)
+        key = (
+            result.st_dev,
+            result.st_ino,
+            result.st_mode,
+            result.st_uid,
+            result.st_gid,
+        )
+        cached = self.entries.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        validated = from_path(path)
+        self.entries[path] = (key, validated)
+        return validated
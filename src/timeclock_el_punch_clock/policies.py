@@ -0,0 +1,7 @@
+import enum
+
+
+class FsyncPolicy(enum.StrEnum):
+    ALWAYS = "always"
+    BATCHED = "batched"
+    NEVER = "never"
@@ -0,0 +1,176 @@
+import contextlib
+import enum
+import io
+import os
+import pathlib
+import sys
+import time
+from collections.abc import Iterator, Mapping, MutableSequence, Sequence
+
+MODE_VARIABLE = "TTLPC_PROFILE"
+OUTPUT_VARIABLE = "TTLPC_PROFILE_OUTPUT"
+TOP = 25
+
+
+class ProfileMode(enum.StrEnum):
+    OFF = "off"
+    SPANS = "spans"
+    CPROFILE = "cprofile"
+    TRACEMALLOC = "tracemalloc"
+
+
+# Not a dataclass: the CLI imports this module, and dataclasses would add to
+# the startup of every command.
+class Span:
+    __slots__ = ("name", "depth", "start", "duration")
+
+    def __init__(self, name: str, depth: int, start: float, duration: float) -> None:
+        self.name, self.depth = name, depth
+        self.start, self.duration = start, duration
+
+
+_enabled = False
+_depth = 0
+_spans: MutableSequence[Span] = []
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        global _depth
+        _depth += 1
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        global _depth
+        duration = time.perf_counter() - self.start
+        _depth -= 1
+        _spans.append(Span(self.name, _depth, self.start, duration))
+
+
+_DISABLED = contextlib.nullcontext()
+
+
+def span(name: str) -> contextlib.AbstractContextManager[None]:
+    # Disabled, a span costs this one branch.
+    if _enabled:
+        return _Timer(name)
+    return _DISABLED
+
+
+def record(name: str, start: float) -> None:
+    # For phases that end before profiling could be configured.
+    if _enabled:
+        _spans.append(Span(name, _depth, start, time.perf_counter() - start))
+
+
+def spans() -> Sequence[Span]:
+    return sorted(_spans, key=lambda span: span.start)
+
+
+def mode_from_environment(environ: Mapping[str, str] = os.environ) -> ProfileMode:
+    value = environ.get(MODE_VARIABLE, ProfileMode.OFF)
+    try:
+        return ProfileMode(value)
+    except ValueError as err:
+        raise ValueError(
+            f"${MODE_VARIABLE} must be one of {', '.join(ProfileMode)}, got {value!r}"
+        ) from err
+
+
+def output_from_environment(
+    environ: Mapping[str, str] = os.environ,
+) -> pathlib.Path | None:
+    output = environ.get(OUTPUT_VARIABLE)
+    return pathlib.Path(output) if output else None
+
+
+def configure(mode: ProfileMode) -> None:
+    global _enabled, _depth
+    # cProfile and tracemalloc see every call, so spans are not timed then.
+    _enabled, _depth = mode is ProfileMode.SPANS, 0
+    _spans.clear()
+
+
+def format_spans(breakdown: Sequence[Span]) -> str:
+    return "".join(
+        f"{span.duration * 1000:10.3f} ms  {'  ' * span.depth}{span.name}\n"
+        for span in breakdown
+    )
+
+
+def write_spans(
+    breakdown: Sequence[Span], argv: Sequence[str], output: pathlib.Path
+) -> None:
+    import json
+
+    origin = breakdown[0].start if breakdown else 0.0
+    with output.open(mode="a") as file:
+        file.write(
+            json.dumps(
+                {
+                    "argv": list(argv),
+                    "spans": [
+                        {
+                            "name": span.name,
+                            "depth": span.depth,
+                            "start_ms": (span.start - origin) * 1000,
+                            "duration_ms": span.duration * 1000,
+                        }
+                        for span in breakdown
+                    ],
+                }
+            )
+            + "\n"
+        )
+
+
+@contextlib.contextmanager
+def profiled(
+    mode: ProfileMode,
+    argv: Sequence[str],
+    output: pathlib.Path | None = None,
+    stream: io.TextIOBase | None = None,
+) -> Iterator[None]:
+    stream = stream or sys.stderr
+    match mode:
+        case ProfileMode.OFF:
+            yield
+            return
+        case ProfileMode.CPROFILE:
+            import cProfile
+            import pstats
+
+            profile = cProfile.Profile()
+            with profile:
+                yield
+            if output is not None:
+                profile.dump_stats(output)
+            else:
+                pstats.Stats(profile, stream=stream).sort_stats(
+                    "cumulative"
+                ).print_stats(TOP)
+        case ProfileMode.TRACEMALLOC:
+            import tracemalloc
+
+            tracemalloc.start()
+            try:
+                yield
+                snapshot = tracemalloc.take_snapshot()
+            finally:
+                tracemalloc.stop()
+            if output is not None:
+                snapshot.dump(str(output))
+            else:
+                for statistic in snapshot.statistics("lineno")[:TOP]:
+                    print(statistic, file=stream)
+        case ProfileMode.SPANS:
+            yield
+            if output is not None:
+                write_spans(spans(), argv, output)
+            else:
+                stream.write(format_spans(spans()))
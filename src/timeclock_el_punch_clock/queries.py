@@ -0,0 +1,148 @@
+import fnmatch
+import itertools
+import pathlib
+import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+
+import timeclock_el_punch_clock.caches as caches
+import timeclock_el_punch_clock.indices as indices
+import timeclock_el_punch_clock.segments as segments
+import timeclock_el_punch_clock.timestamps as timestamps
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import lines, mmaps
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry, Entry
+
+_CHUNK = 4096
+
+
+@dataclass(frozen=True)
+class Session:
+    start: int
+    end: int
+    accounts: tuple[Account, ...]
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+
+@dataclass(frozen=True)
+class Filter:
+    # Sessions starting in [since, until).
+    since: int | None = None
+    until: int | None = None
+    # A glob over the account name, or else an account and its subaccounts.
+    account: str | None = None
+    longer_than: int | None = None
+    shorter_than: int | None = None
+    limit: int | None = None
+
+
+def _account_predicate(pattern: str, delimiter: str) -> Callable[[Session], bool]:
+    if any(character in pattern for character in "*?["):
+        compiled = re.compile(fnmatch.translate(pattern))
+        return lambda session: (
+            compiled.match(delimiter.join(session.accounts)) is not None
+        )
+    prefix = tuple(pattern.split(delimiter))
+    return lambda session: session.accounts[: len(prefix)] == prefix
+
+
+def compile_filter(query: Filter, delimiter: str = ":") -> Callable[[Session], bool]:
+    predicates: list[Callable[[Session], bool]] = []
+    if query.since is not None:
+        since = query.since
+        predicates.append(lambda session: session.start >= since)
+    if query.account is not None:
+        predicates.append(_account_predicate(query.account, delimiter))
+    if query.longer_than is not None:
+        longer_than = query.longer_than
+        predicates.append(lambda session: session.duration > longer_than)
+    if query.shorter_than is not None:
+        shorter_than = query.shorter_than
+        predicates.append(lambda session: session.duration < shorter_than)
+    return lambda session: all(predicate(session) for predicate in predicates)
+
+
+def sessions(entries: Iterable[Entry], now: int | None = None) -> Iterator[Session]:
+    current: ClockInEntry | None = None
+    for entry in entries:
+        if isinstance(entry, (ClockInEntry, ClockOutEntry)):
+            if current is not None:
+                yield Session(current.timestamp, entry.timestamp, current.accounts)
+            current = entry if isinstance(entry, ClockInEntry) else None
+    if current is not None and now is not None and now > current.timestamp:
+        yield Session(current.timestamp, now, current.accounts)
+
+
+def _cached_entries(
+    path: pathlib.Path, since: int | None, delimiter: str
+) -> Iterator[ClockInEntry | ClockOutEntry]:
+    import numpy as np
+
+    cache = caches.load(path, delimiter=delimiter)
+    records = cache.records
+    start = 0 if since is None else int(np.searchsorted(records["epoch"], since))
+    for offset in range(start, len(records), _CHUNK):
+        chunk = records[offset : offset + _CHUNK]
+        for epoch, kind, account in zip(
+            chunk["epoch"].tolist(), chunk["kind"].tolist(), chunk["account"].tolist()
+        ):
+            if kind == caches.CLOCK_IN:
+                yield ClockInEntry(epoch, cache.accounts[account])
+            else:
+                yield ClockOutEntry(epoch)
+
+
+def _active_entries(
+    path: pathlib.Path, since: int | None, delimiter: str
+) -> Iterator[Entry]:
+    # Pushes `since` down into a fresh binary cache or date index, if either
+    # exists; neither is built for a query.
+    if caches.load_fresh(path) is not None:
+        return _cached_entries(path, since, delimiter)
+    offset = 0
+    if since is not None:
+        index = indices.load(path)
+        if index is not None:
+            offset = index.seek(since)
+    return mmaps.iter_entries(path, delimiter=delimiter, offset=offset)
+
+
+def _segment_entries(
+    path: pathlib.Path, query: Filter, delimiter: str
+) -> Iterator[Entry]:
+    first = None if query.since is None else timestamps.from_epoch(query.since).year
+    last = None if query.until is None else timestamps.from_epoch(query.until).year
+    directory = segments.segments_path(path)
+    for segment in segments.load(path):
+        if (first is None or segment.year >= first) and (
+            last is None or segment.year <= last
+        ):
+            with segments.open_segment(directory / segment.name) as file:
+                yield from lines.parse_lines(file, delimiter=delimiter)
+
+
+def run(
+    path: pathlib.Path,
+    query: Filter,
+    delimiter: str = ":",
+    now: int | None = None,
+) -> Iterator[Session]:
+    entries = itertools.chain(
+        _segment_entries(path, query, delimiter),
+        _active_entries(path, query.since, delimiter),
+    )
+    selected = compile_filter(query, delimiter=delimiter)
+    until = query.until
+
+    def matching() -> Iterator[Session]:
+        for session in sessions(entries, now=now):
+            # Sessions come in order of their start.
+            if until is not None and session.start >= until:
+                return
+            if selected(session):
+                yield session
+
+    return itertools.islice(matching(), query.limit)
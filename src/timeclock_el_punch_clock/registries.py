@@ -0,0 +1,83 @@
+from collections.abc import MutableMapping, MutableSequence, Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from timeclock_el_punch_clock.accounts import Account
+
+ROOT = 0
+
+
+@dataclass
+class AccountRegistry:
+    # A trie over account segments; node ids are assigned in insertion order,
+    # so every node has a larger id than its parent.
+    segments: MutableSequence[Account] = field(default_factory=lambda: [Account("")])
+    parents: MutableSequence[int] = field(default_factory=lambda: [-1])
+    depths: MutableSequence[int] = field(default_factory=lambda: [0])
+    _children: MutableMapping[tuple[int, Account], int] = field(default_factory=dict)
+    _paths: MutableMapping[tuple[Account, ...], int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def intern(self, accounts: Sequence[Account]) -> int:
+        key = tuple(accounts)
+        node = self._paths.get(key)
+        if node is not None:
+            return node
+        node = ROOT
+        for segment in key:
+            child = self._children.get((node, segment))
+            if child is None:
+                child = len(self.segments)
+                self._children[node, segment] = child
+                self.segments.append(segment)
+                self.parents.append(node)
+                self.depths.append(self.depths[node] + 1)
+            node = child
+        self._paths[key] = node
+        return node
+
+    def find(self, accounts: Sequence[Account]) -> int | None:
+        node = ROOT
+        for segment in accounts:
+            child = self._children.get((node, segment))
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def path(self, node: int) -> tuple[Account, ...]:
+        segments = []
+        while node != ROOT:
+            segments.append(self.segments[node])
+            node = self.parents[node]
+        return tuple(reversed(segments))
+
+    def name(self, node: int, delimiter: str = ":") -> str:
+        return delimiter.join(self.path(node))
+
+    def _levels(self) -> Sequence[tuple[np.ndarray, np.ndarray]]:
+        depths = np.asarray(self.depths, dtype=np.int32)
+        parents = np.asarray(self.parents, dtype=np.int32)
+        order = np.argsort(depths, kind="stable")
+        bounds = np.searchsorted(depths[order], np.arange(depths.max() + 2))
+        return [
+            (order[start:end], parents[order[start:end]])
+            for start, end in zip(bounds[1:-1], bounds[2:])
+        ]
+
+    def rollup(self, values: np.ndarray) -> np.ndarray:
+        rolled = np.zeros(len(self), dtype=values.dtype)
+        rolled[: len(values)] = values
+        for nodes, parents in reversed(self._levels()):
+            np.add.at(rolled, parents, rolled[nodes])
+        return rolled
+
+    def subtree(self, node: int) -> np.ndarray:
+        mask = np.zeros(len(self), dtype=bool)
+        mask[node] = True
+        for nodes, parents in self._levels()[self.depths[node] :]:
+            mask[nodes] |= mask[parents]
+        return mask
@@ -0,0 +1,297 @@
+import enum
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from timeclock_el_punch_clock import zones
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.caches import CLOCK_IN, Cache
+from timeclock_el_punch_clock.parsing.entries import (
+    ClockInEntry,
+    ClockOutEntry,
+    Entry,
+    HeadingEntry,
+)
+from timeclock_el_punch_clock.registries import ROOT, AccountRegistry
+
+_DAY = 86400
+_NO_ACCOUNT = "(none)"
+# 1970-01-05, the first Monday after the epoch.
+_FIRST_MONDAY = 4
+
+
+class Period(enum.StrEnum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+@dataclass(frozen=True)
+class Intervals:
+    starts: np.ndarray
+    ends: np.ndarray
+    account_ids: np.ndarray
+    registry: AccountRegistry
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+def from_arrays(
+    starts: Sequence[int],
+    ends: Sequence[int],
+    account_ids: Sequence[int],
+    registry: AccountRegistry,
+) -> Intervals:
+    return Intervals(
+        starts=np.asarray(starts, dtype=np.int64),
+        ends=np.asarray(ends, dtype=np.int64),
+        account_ids=np.asarray(account_ids, dtype=np.int32),
+        registry=registry,
+    )
+
+
+def from_entries(
+    entries: Iterable[Entry],
+    until: int | None = None,
+    registry: AccountRegistry | None = None,
+) -> Intervals:
+    if registry is None:
+        registry = AccountRegistry()
+    starts: list[int] = []
+    ends: list[int] = []
+    account_ids: list[int] = []
+    current: ClockInEntry | None = None
+    for entry in entries:
+        if isinstance(entry, ClockInEntry):
+            if current is not None:
+                starts.append(current.timestamp)
+                ends.append(entry.timestamp)
+                account_ids.append(registry.intern(current.accounts))
+            current = entry
+        elif isinstance(entry, ClockOutEntry) and current is not None:
+            starts.append(current.timestamp)
+            ends.append(entry.timestamp)
+            account_ids.append(registry.intern(current.accounts))
+            current = None
+    if current is not None and until is not None and until > current.timestamp:
+        starts.append(current.timestamp)
+        ends.append(until)
+        account_ids.append(registry.intern(current.accounts))
+    return from_arrays(starts, ends, account_ids, registry)
+
+
+def from_cache(
+    cache: Cache, until: int | None = None, registry: AccountRegistry | None = None
+) -> Intervals:
+    if registry is None:
+        registry = AccountRegistry()
+    epochs = cache.records["epoch"]
+    kinds = cache.records["kind"]
+    # A clock in is closed by the next clock entry, as in from_entries.
+    opened = np.flatnonzero(kinds[:-1] == CLOCK_IN)
+    starts, ends = epochs[opened], epochs[opened + 1]
+    account_ids = cache.records["account"][opened]
+    if (
+        len(kinds)
+        and kinds[-1] == CLOCK_IN
+        and until is not None
+        and until > epochs[-1]
+    ):
+        starts = np.append(starts, epochs[-1])
+        ends = np.append(ends, until)
+        account_ids = np.append(account_ids, cache.records["account"][-1])
+    ids = np.asarray(
+        [registry.intern(accounts) for accounts in cache.accounts], dtype=np.int32
+    )
+    return from_arrays(starts, ends, ids[account_ids], registry)
+
+
+def from_zoned_entries(
+    entries: Iterable[Entry],
+    zone: str = zones.UTC,
+    until: int | None = None,
+    registry: AccountRegistry | None = None,
+) -> tuple[Intervals, str]:
+    # Intervals in UTC epochs, for entries of naive local times; entries
+    # before any tag are in `zone`. Also returns the zone of the last tag.
+    if registry is None:
+        registry = AccountRegistry()
+    names_by_id = [zone]
+    current = 0
+    local: list[int] = []
+    names: list[int] = []
+    clock_ins: list[bool] = []
+    account_ids: list[int] = []
+    for entry in entries:
+        if isinstance(entry, ClockInEntry):
+            local.append(entry.timestamp)
+            names.append(current)
+            clock_ins.append(True)
+            account_ids.append(registry.intern(entry.accounts))
+        elif isinstance(entry, ClockOutEntry):
+            local.append(entry.timestamp)
+            names.append(current)
+            clock_ins.append(False)
+            account_ids.append(-1)
+        elif isinstance(entry, HeadingEntry):
+            name = zones.tag(entry)
+            if name is not None:
+                if name not in names_by_id:
+                    names_by_id.append(name)
+                current = names_by_id.index(name)
+    if clock_ins and clock_ins[-1] and until is not None and until > local[-1]:
+        local.append(until)
+        names.append(current)
+        clock_ins.append(False)
+        account_ids.append(-1)
+    epochs = zones.to_utc(
+        np.asarray(local, dtype=np.int64),
+        np.asarray(names, dtype=np.int64),
+        names_by_id,
+    )
+    kinds = np.asarray(clock_ins, dtype=bool)
+    # A clock in is closed by the next clock entry, as in from_entries.
+    opened = np.flatnonzero(kinds[:-1])
+    return (
+        from_arrays(
+            epochs[opened],
+            epochs[opened + 1],
+            np.asarray(account_ids, dtype=np.int32)[opened],
+            registry,
+        ),
+        names_by_id[current],
+    )
+
+
+def concatenate(parts: Sequence[Intervals], registry: AccountRegistry) -> Intervals:
+    assert all(part.registry is registry for part in parts), (
+        "Invariant: parts share the registry"
+    )
+    return from_arrays(
+        np.concatenate([part.starts for part in parts] or [[]]),
+        np.concatenate([part.ends for part in parts] or [[]]),
+        np.concatenate([part.account_ids for part in parts] or [[]]),
+        registry,
+    )
+
+
+def select(intervals: Intervals, prefix: Sequence[Account]) -> Intervals:
+    node = intervals.registry.find(prefix)
+    if node is None:
+        mask = np.zeros(len(intervals), dtype=bool)
+    else:
+        mask = intervals.registry.subtree(node)[intervals.account_ids]
+    return Intervals(
+        starts=intervals.starts[mask],
+        ends=intervals.ends[mask],
+        account_ids=intervals.account_ids[mask],
+        registry=intervals.registry,
+    )
+
+
+def totals_by_account(intervals: Intervals, delimiter: str = ":") -> Mapping[str, int]:
+    registry = intervals.registry
+    totals = np.bincount(
+        intervals.account_ids,
+        weights=intervals.ends - intervals.starts,
+        minlength=len(registry),
+    ).astype(np.int64)
+    counts = np.bincount(intervals.account_ids, minlength=len(registry))
+    # Intervals clocked in without an account stay on the root, whose rolled
+    # up total would be that of every interval.
+    unassigned = int(totals[ROOT]), int(counts[ROOT])
+    totals, counts = registry.rollup(totals), registry.rollup(counts)
+    totals[ROOT], counts[ROOT] = unassigned
+    return dict(
+        sorted(
+            (_NO_ACCOUNT if node == ROOT else registry.name(node, delimiter), total)
+            for node, total in zip(
+                np.flatnonzero(counts).tolist(), totals[counts > 0].tolist()
+            )
+        )
+    )
+
+
+def _ascending(values: np.ndarray) -> np.ndarray:
+    # Logs are written in order, so the sort is usually skipped.
+    if len(values) > 1 and (values[1:] < values[:-1]).any():
+        return np.sort(values)
+    return values
+
+
+def _covered(bounds: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # Seconds covered by all intervals before each bound:
+    # the sum of (bound - start) over started intervals minus the sum of
+    # (bound - end) over ended ones.
+    cumulative_starts = np.concatenate(([0], np.cumsum(starts)))
+    cumulative_ends = np.concatenate(([0], np.cumsum(ends)))
+    started = np.searchsorted(starts, bounds)
+    ended = np.searchsorted(ends, bounds)
+    return (
+        started * bounds
+        - cumulative_starts[started]
+        - (ended * bounds - cumulative_ends[ended])
+    )
+
+
+def _period_bounds(period: Period, first: int, last: int) -> np.ndarray:
+    match period:
+        case Period.DAY | Period.MONTH:
+            unit = "D" if period is Period.DAY else "M"
+            return (
+                np.arange(
+                    np.datetime64(first, "s").astype(f"datetime64[{unit}]"),
+                    np.datetime64(last, "s").astype(f"datetime64[{unit}]")
+                    + np.timedelta64(2, unit),
+                )
+                .astype("datetime64[s]")
+                .astype(np.int64)
+            )
+        case Period.WEEK:
+            first_day, last_day = first // _DAY, last // _DAY
+            monday = first_day - (first_day - _FIRST_MONDAY) % 7
+            return np.arange(monday, last_day + 8, 7, dtype=np.int64) * _DAY
+
+
+def _period_labels(period: Period, starts: np.ndarray) -> Sequence[str]:
+    match period:
+        case Period.DAY:
+            return np.datetime_as_string(
+                starts.astype("datetime64[s]"), unit="D"
+            ).tolist()
+        case Period.MONTH:
+            return np.datetime_as_string(
+                starts.astype("datetime64[s]"), unit="M"
+            ).tolist()
+        case Period.WEEK:
+            # An ISO week belongs to the year of its Thursday.
+            thursdays = (starts // _DAY + 3).astype("datetime64[D]")
+            years = thursdays.astype("datetime64[Y]")
+            weeks = (thursdays - years.astype("datetime64[D]")).astype(np.int64) // 7
+            return [
+                f"{year:04d}-W{week + 1:02d}"
+                for year, week in zip(
+                    (years.astype(np.int64) + 1970).tolist(), weeks.tolist()
+                )
+            ]
+
+
+def totals_by_period(
+    intervals: Intervals, period: Period, table: zones.Table | None = None
+) -> Mapping[str, int]:
+    # With a table, intervals are in UTC and periods in its local time.
+    if not len(intervals):
+        return {}
+    starts = _ascending(intervals.starts)
+    ends = _ascending(intervals.ends)
+    first, last = starts[:1], ends[-1:]
+    if table is not None:
+        first, last = table.to_local(first), table.to_local(last)
+    bounds = _period_bounds(period, int(first[0]), int(last[0]))
+    covered = _covered(bounds if table is None else table.to_utc(bounds), starts, ends)
+    totals = np.diff(covered)
+    nonzero = np.flatnonzero(totals)
+    labels = _period_labels(period, bounds[nonzero])
+    return dict(zip(labels, totals[nonzero].tolist()))
@@ -0,0 +1,46 @@
+import argparse
+import contextlib
+import io
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import IO, NoReturn
+
+from timeclock_el_punch_clock import cli
+from timeclock_el_punch_clock.paths.writeable_file_paths import PathCache
+
+
+class _Exit(Exception):
+    pass
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    # Raises instead of exiting; subparsers are created with the same class.
+    def error(self, message: str) -> NoReturn:
+        raise argparse.ArgumentError(None, message)
+
+    def exit(self, status: int = 0, message: str | None = None) -> NoReturn:
+        raise _Exit(message)
+
+
+@dataclass
+class Runner:
+    # Parses with one parser and validates each log once, for as long as its
+    # stat shows the same file, across any number of in-process commands.
+    parser: argparse.ArgumentParser = field(
+        default_factory=lambda: cli.create_argument_parser(_ArgumentParser)
+    )
+    path_cache: PathCache = field(default_factory=PathCache)
+
+    def run(self, args: Sequence[str], stdout: IO[str] | None = None) -> object:
+        # Returns what the command returns, None for --help; its output goes
+        # to stdout if given, else nowhere.
+        with contextlib.redirect_stdout(io.StringIO() if stdout is None else stdout):
+            try:
+                namespace = self.parser.parse_args(args=args)
+            except _Exit:
+                return None
+            if not hasattr(namespace, "func"):
+                return None
+            cli.from_environment(self.parser, namespace)
+            namespace.path_cache = self.path_cache
+            return cli.invoke(namespace, args)
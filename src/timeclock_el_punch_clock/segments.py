@@ -0,0 +1,294 @@
+import enum
+import gzip
+import json
+import lzma
+import os
+import pathlib
+import re
+from collections.abc import Iterator, Mapping, MutableSequence, Sequence
+from dataclasses import dataclass
+from typing import IO
+
+from timeclock_el_punch_clock import appends, contracts, reports, timestamps, zones
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import lines, mmaps
+from timeclock_el_punch_clock.parsing.entries import (
+    ClockInEntry,
+    ClockOutEntry,
+    Entry,
+    HeadingEntry,
+)
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.paths import replacements
+from timeclock_el_punch_clock.registries import AccountRegistry
+from timeclock_el_punch_clock.reports import Intervals
+
+_MANIFEST = "segments.json"
+_JOURNAL = "compact.json"
+_TAG_LINE = re.compile(rb"^\*+[ \t]*" + re.escape(zones.TAG.encode()) + rb".*\n", re.M)
+
+
+class Compression(enum.StrEnum):
+    NONE = "none"
+    GZIP = "gzip"
+    LZMA = "lzma"
+
+
+_SUFFIXES = {
+    Compression.NONE: ".timeclock",
+    Compression.GZIP: ".timeclock.gz",
+    Compression.LZMA: ".timeclock.xz",
+}
+
+
+@dataclass(frozen=True)
+class Segment:
+    year: int
+    name: str
+    # Seconds per full account path, for the clock ins of this year.
+    totals: Mapping[tuple[Account, ...], int]
+
+
+@dataclass(frozen=True)
+class Section:
+    year: int
+    start: int
+    end: int
+    clocked_out: bool
+
+
+def segments_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(f"{path.name}.segments")
+
+
+def _load(path: pathlib.Path) -> Sequence[Segment]:
+    try:
+        manifest = json.loads((segments_path(path) / _MANIFEST).read_text())
+    except FileNotFoundError:
+        return ()
+    return tuple(
+        Segment(
+            year=segment["year"],
+            name=segment["name"],
+            totals={
+                tuple(Account(account) for account in accounts): seconds
+                for accounts, seconds in segment["totals"]
+            },
+        )
+        for segment in manifest["segments"]
+    )
+
+
+def _recover(path: pathlib.Path, fd: int) -> None:
+    # With the log locked. The journal of an interrupted compaction holds
+    # the inode of the log it cut and the manifest after the cut: with that
+    # log still in place the compaction is rolled back, else forward.
+    journal = segments_path(path) / _JOURNAL
+    try:
+        pending = json.loads(journal.read_text())
+    except FileNotFoundError:
+        return
+    if os.fstat(fd).st_ino != pending["inode"]:
+        _save(path, pending["manifest"])
+    journal.unlink()
+
+
+@contracts.has("io")
+def load(path: pathlib.Path) -> Sequence[Segment]:
+    if (segments_path(path) / _JOURNAL).exists():
+        with appends.locked(path) as fd:
+            _recover(path, fd)
+    return _load(path)
+
+
+def _manifest(segments: Sequence[Segment]) -> dict[str, object]:
+    return {
+        "segments": [
+            {
+                "year": segment.year,
+                "name": segment.name,
+                "totals": [
+                    [list(accounts), seconds]
+                    for accounts, seconds in segment.totals.items()
+                ],
+            }
+            for segment in segments
+        ]
+    }
+
+
+def _save(path: pathlib.Path, manifest: dict[str, object]) -> None:
+    replacements.replace(
+        segments_path(path) / _MANIFEST, json.dumps(manifest, indent=1).encode()
+    )
+
+
+def open_segment(path: pathlib.Path) -> IO[str]:
+    match path.suffix:
+        case ".gz":
+            return gzip.open(path, mode="rt")
+        case ".xz":
+            return lzma.open(path, mode="rt")
+        case _:
+            return path.open(mode="r")
+
+
+def _line_year(line: bytes) -> int | None:
+    entry = next(mmaps.parse_buffer(line), None)
+    match entry:
+        case HeadingEntry(level=1, title=title) if len(title) == 4 and title.isdigit():
+            return int(title)
+        case ClockInEntry() | ClockOutEntry():
+            return timestamps.from_epoch(entry.timestamp).year
+    return None
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError)
+def sections(path: pathlib.Path) -> Sequence[Section]:
+    found: MutableSequence[Section] = []
+    year: int | None = None
+    start = offset = 0
+    clocked_out = True
+    with path.open(mode="rb") as file:
+        for line in file:
+            try:
+                line_year = _line_year(line)
+            except MalformedLineError as err:
+                raise MalformedLineError(f"{path} byte {offset}: {err}") from err
+            if line_year is not None and year is not None and line_year > year:
+                found.append(Section(year, start, offset, clocked_out))
+                start = offset
+            if line_year is not None and (year is None or line_year > year):
+                year = line_year
+            if line[:1] in (b"i", b"o"):
+                clocked_out = line[:1] == b"o"
+            offset += len(line)
+    if year is not None:
+        found.append(Section(year, start, offset, clocked_out))
+    return found
+
+
+def _totals(text: str, delimiter: str) -> Mapping[tuple[Account, ...], int]:
+    totals: dict[tuple[Account, ...], int] = {}
+    current: ClockInEntry | None = None
+    for entry in lines.parse_lines(text.splitlines(keepends=True), delimiter):
+        if isinstance(entry, (ClockInEntry, ClockOutEntry)):
+            if current is not None:
+                totals[current.accounts] = (
+                    totals.get(current.accounts, 0)
+                    + entry.timestamp
+                    - current.timestamp
+                )
+            current = entry if isinstance(entry, ClockInEntry) else None
+    return totals
+
+
+def _write_segment(target: pathlib.Path, data: bytes) -> None:
+    match target.suffix:
+        case ".gz":
+            data = gzip.compress(data)
+        case ".xz":
+            data = lzma.compress(data)
+    replacements.replace(target, data, mode=0o444, fsync=True)
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError, FileExistsError)
+def compact(
+    path: pathlib.Path,
+    compression: Compression = Compression.NONE,
+    delimiter: str = ":",
+) -> Sequence[Segment]:
+    with appends.locked(path) as fd:
+        _recover(path, fd)
+        found = sections(path)
+        completed: MutableSequence[Section] = []
+        # The last year stays active, as does everything from the first
+        # year that ends clocked in.
+        for section in found[:-1]:
+            if not section.clocked_out:
+                break
+            completed.append(section)
+        if not completed:
+            return ()
+        segments = list(_load(path))
+        directory = segments_path(path)
+        directory.mkdir(exist_ok=True)
+        with path.open(mode="rb") as file:
+            contents = file.read()
+        written: MutableSequence[pathlib.Path] = []
+        try:
+            for section in completed:
+                name = f"{section.year:04d}{_SUFFIXES[compression]}"
+                if any(segment.year == section.year for segment in segments):
+                    raise FileExistsError(
+                        f"{directory / name} already holds {section.year}"
+                    )
+                data = contents[section.start : section.end]
+                _write_segment(directory / name, data)
+                written.append(directory / name)
+                segments.append(
+                    Segment(section.year, name, _totals(data.decode(), delimiter))
+                )
+        except BaseException:
+            # Without a journal, nothing refers to the segments written so far.
+            for target in written:
+                target.unlink(missing_ok=True)
+            raise
+        manifest = _manifest(segments)
+        journal = directory / _JOURNAL
+        replacements.replace(
+            journal,
+            json.dumps({"inode": os.fstat(fd).st_ino, "manifest": manifest}).encode(),
+            fsync=True,
+        )
+        remainder = contents[completed[-1].end :]
+        # The timezone tag in effect carries over to the active log.
+        tags = _TAG_LINE.findall(contents, 0, completed[-1].end)
+        if tags and not remainder.startswith(tags[-1]):
+            remainder = tags[-1] + remainder
+        replacements.replace(
+            path, remainder, mode=os.fstat(fd).st_mode & 0o7777, fsync=True
+        )
+        _save(path, manifest)
+        journal.unlink()
+    return segments
+
+
+def iter_segment_entries(path: pathlib.Path, delimiter: str = ":") -> Iterator[Entry]:
+    directory = segments_path(path)
+    for segment in load(path):
+        with open_segment(directory / segment.name) as file:
+            yield from lines.parse_lines(file, delimiter=delimiter)
+
+
+def iter_entries(path: pathlib.Path, delimiter: str = ":") -> Iterator[Entry]:
+    yield from iter_segment_entries(path, delimiter=delimiter)
+    yield from lines.iter_entries(path, delimiter=delimiter)
+
+
+@contracts.has("io")
+def totals(path: pathlib.Path, registry: AccountRegistry) -> Intervals:
+    # One interval per account and year, for reports that need no dates.
+    pairs = [
+        (accounts, seconds)
+        for segment in load(path)
+        for accounts, seconds in segment.totals.items()
+    ]
+    return reports.from_arrays(
+        [0] * len(pairs),
+        [seconds for _, seconds in pairs],
+        [registry.intern(accounts) for accounts, _ in pairs],
+        registry,
+    )
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError)
+def intervals(
+    path: pathlib.Path, registry: AccountRegistry, delimiter: str = ":"
+) -> Intervals:
+    return reports.from_entries(
+        iter_segment_entries(path, delimiter=delimiter), registry=registry
+    )
@@ -0,0 +1,153 @@
+import os
+import pathlib
+import struct
+import zlib
+from dataclasses import dataclass
+
+import timeclock_el_punch_clock.tails as tails
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.paths import replacements
+
+_MAGIC = b"TTLPCSTA"
+_VERSION = 1
+_HEADER = struct.Struct("<8sQqqqqIBq")
+_NONE, _IN, _OUT = 0, 1, 2
+# Bytes before the recorded offset whose checksum detects a rewritten log.
+_TAIL = 64
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    size: int
+    mtime_ns: int
+    inode: int
+    offset: int
+    tail_crc: int
+    last: ClockInEntry | ClockOutEntry | None
+
+    @property
+    def clocked_in(self) -> bool:
+        return isinstance(self.last, ClockInEntry)
+
+
+def snapshot_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(f"{path.name}.state")
+
+
+def _pack(snapshot: Snapshot) -> bytes:
+    kind, timestamp, accounts = _NONE, 0, b""
+    match snapshot.last:
+        case ClockInEntry():
+            kind, timestamp = _IN, snapshot.last.timestamp
+            accounts = "\0".join(snapshot.last.accounts).encode()
+        case ClockOutEntry():
+            kind, timestamp = _OUT, snapshot.last.timestamp
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        snapshot.size,
+        snapshot.mtime_ns,
+        snapshot.inode,
+        snapshot.offset,
+        snapshot.tail_crc,
+        kind,
+        timestamp,
+    )
+    return header + accounts
+
+
+def _unpack(data: bytes) -> Snapshot | None:
+    try:
+        (magic, version, size, mtime_ns, inode, offset, tail_crc, kind, timestamp) = (
+            _HEADER.unpack_from(data)
+        )
+    except struct.error:
+        return None
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    last: ClockInEntry | ClockOutEntry | None = None
+    if kind == _IN:
+        rest = data[_HEADER.size :].decode()
+        accounts = (
+            tuple(Account(account) for account in rest.split("\0")) if rest else ()
+        )
+        last = ClockInEntry(timestamp, accounts)
+    elif kind == _OUT:
+        last = ClockOutEntry(timestamp)
+    return Snapshot(size, mtime_ns, inode, offset, tail_crc, last)
+
+
+@contracts.has("io")
+def load(path: pathlib.Path) -> Snapshot | None:
+    try:
+        return _unpack(snapshot_path(path).read_bytes())
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+
+
+@contracts.has("io")
+def save(path: pathlib.Path, snapshot: Snapshot) -> None:
+    replacements.replace(snapshot_path(path), _pack(snapshot))
+
+
+def _tail_crc(fd: int, offset: int) -> int:
+    start = max(offset - _TAIL, 0)
+    return zlib.crc32(os.pread(fd, offset - start, start))
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError)
+def advance(
+    path: pathlib.Path, snapshot: Snapshot | None, delimiter: str = ":"
+) -> Snapshot:
+    with path.open(mode="rb") as file:
+        stat = os.fstat(file.fileno())
+        if (
+            snapshot is not None
+            and snapshot.inode == stat.st_ino
+            and snapshot.size == stat.st_size
+            and snapshot.mtime_ns == stat.st_mtime_ns
+        ):
+            return snapshot
+        if (
+            snapshot is None
+            or snapshot.inode != stat.st_ino
+            or snapshot.offset > stat.st_size
+            or _tail_crc(file.fileno(), snapshot.offset) != snapshot.tail_crc
+        ):
+            # Without a usable snapshot the log is read backwards instead.
+            last = tails.read_last_entry(path, delimiter=delimiter)
+        else:
+            last = snapshot.last
+            for entry in lines.iter_entries(
+                path, delimiter=delimiter, offset=snapshot.offset
+            ):
+                if isinstance(entry, (ClockInEntry, ClockOutEntry)):
+                    last = entry
+        return Snapshot(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            inode=stat.st_ino,
+            offset=stat.st_size,
+            tail_crc=_tail_crc(file.fileno(), stat.st_size),
+            last=last,
+        )
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError)
+def update(path: pathlib.Path, delimiter: str = ":") -> Snapshot:
+    previous = load(path)
+    snapshot = advance(path, previous, delimiter=delimiter)
+    if snapshot != previous:
+        try:
+            save(path, snapshot)
+        except OSError:
+            # The snapshot only saves work; a read-only directory, a full
+            # disk and the like leave it stale.
+            pass
+    return snapshot
@@ -0,0 +1,72 @@
+import os
+import pathlib
+from collections.abc import Iterator
+
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry, Entry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+@contracts.has("io")
+@contracts.pre(lambda path, block_size=DEFAULT_BLOCK_SIZE, end=None: block_size > 0)
+def iter_lines_reversed(
+    path: pathlib.Path, block_size: int = DEFAULT_BLOCK_SIZE, end: int | None = None
+) -> Iterator[str]:
+    # Lines before offset `end`, or the end of the file.
+    with path.open(mode="rb") as file:
+        position = file.seek(0, os.SEEK_END) if end is None else end
+        buffer = b""
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            file.seek(position)
+            buffer = file.read(size) + buffer
+            end = len(buffer)
+            while (start := buffer.rfind(b"\n", 0, end - 1)) >= 0:
+                yield buffer[start + 1 : end].decode()
+                end = start + 1
+            buffer = buffer[:end]
+        if buffer:
+            yield buffer.decode()
+
+
+@contracts.has("io")
+def read_range(path: pathlib.Path, start: int, end: int) -> bytes:
+    with path.open(mode="rb") as file:
+        return os.pread(file.fileno(), max(end - start, 0), start)
+
+
+@contracts.has("io")
+def read_last_line(
+    path: pathlib.Path, block_size: int = DEFAULT_BLOCK_SIZE
+) -> str | None:
+    return next(iter_lines_reversed(path, block_size=block_size), None)
+
+
+def iter_entries_reversed(
+    path: pathlib.Path,
+    delimiter: str = ":",
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    end: int | None = None,
+) -> Iterator[Entry]:
+    for line in iter_lines_reversed(path, block_size=block_size, end=end):
+        yield from lines.parse_lines((line,), delimiter=delimiter)
+
+
+@contracts.has("io")
+@contracts.raises(MalformedLineError)
+def read_last_entry(
+    path: pathlib.Path,
+    delimiter: str = ":",
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    end: int | None = None,
+) -> ClockInEntry | ClockOutEntry | None:
+    for entry in iter_entries_reversed(
+        path, delimiter=delimiter, block_size=block_size, end=end
+    ):
+        if isinstance(entry, (ClockInEntry, ClockOutEntry)):
+            return entry
+    return None
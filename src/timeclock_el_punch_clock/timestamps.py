@@ -0,0 +1,129 @@
+import datetime
+
+FORMAT = "%Y-%m-%d %H:%M:%S"
+WIDTH = len("YYYY-mm-dd HH:MM:SS")
+
+_UNIX_EPOCH = datetime.datetime(1970, 1, 1, 0, 0, 0)
+_UNIX_EPOCH_ORDINAL = _UNIX_EPOCH.toordinal()
+_TWO_DIGITS = tuple(f"{number:02d}" for number in range(100))
+
+
+def _format(
+    year: int, month: int, day: int, hour: int, minute: int, second: int
+) -> str:
+    return (
+        f"{_TWO_DIGITS[year // 100]}{_TWO_DIGITS[year % 100]}-{_TWO_DIGITS[month]}"
+        f"-{_TWO_DIGITS[day]} {_TWO_DIGITS[hour]}:{_TWO_DIGITS[minute]}"
+        f":{_TWO_DIGITS[second]}"
+    )
+
+
+def parse_date(text: str) -> int:
+    if len(text) != 10 or text[4::3] != "--" or not text.isascii():
+        raise ValueError(f"malformed date {text!r}")
+    try:
+        date = datetime.date.fromisoformat(text)
+    except ValueError as err:
+        raise ValueError(f"malformed date {text!r}") from err
+    return date.toordinal() - _UNIX_EPOCH_ORDINAL
+
+
+def parse_time(text: str) -> int:
+    if len(text) != 8 or text[2::3] != "::" or not text.isascii():
+        raise ValueError(f"malformed time {text!r}")
+    try:
+        time = datetime.time.fromisoformat(text)
+    except ValueError as err:
+        raise ValueError(f"malformed time {text!r}") from err
+    return time.hour * 3600 + time.minute * 60 + time.second
+
+
+def parse_epoch(text: str) -> int:
+    return to_epoch(parse_datetime(text))
+
+
+def format_epoch(epoch: int) -> str:
+    days, seconds = divmod(epoch, 86400)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    date = datetime.date.fromordinal(days + _UNIX_EPOCH_ORDINAL)
+    return _format(date.year, date.month, date.day, hour, minute, second)
+
+
+def parse_datetime(text: str) -> datetime.datetime:
+    if len(text) != WIDTH or text[4::3] != "-- ::" or not text.isascii():
+        raise ValueError(f"malformed timestamp {text!r}")
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError as err:
+        raise ValueError(f"malformed timestamp {text!r}") from err
+
+
+def format_datetime(datetimestamp: datetime.datetime) -> str:
+    year = datetimestamp.year
+    return (
+        f"{_TWO_DIGITS[year // 100]}{_TWO_DIGITS[year % 100]}"
+        f"-{_TWO_DIGITS[datetimestamp.month]}-{_TWO_DIGITS[datetimestamp.day]}"
+        f" {_TWO_DIGITS[datetimestamp.hour]}:{_TWO_DIGITS[datetimestamp.minute]}"
+        f":{_TWO_DIGITS[datetimestamp.second]}"
+    )
+
+
+def to_epoch(datetimestamp: datetime.datetime) -> int:
+    return (
+        (datetimestamp.toordinal() - _UNIX_EPOCH_ORDINAL) * 86400
+        + datetimestamp.hour * 3600
+        + datetimestamp.minute * 60
+        + datetimestamp.second
+    )
+
+
+def from_epoch(epoch: int) -> datetime.datetime:
+    return _UNIX_EPOCH + datetime.timedelta(seconds=epoch)
+
+
+def format_duration(seconds: int) -> str:
+    minutes, second = divmod(seconds, 60)
+    hours, minute = divmod(minutes, 60)
+    return f"{hours}:{_TWO_DIGITS[minute]}:{_TWO_DIGITS[second]}"
+
+
+_DURATION_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+
+
+def parse_duration(text: str) -> int:
+    # Either H:MM:SS, as printed by format_duration, or units such as 1h30m.
+    if ":" in text:
+        hours, _, rest = text.partition(":")
+        if not hours.isdigit() or not hours.isascii():
+            raise ValueError(f"malformed duration {text!r}")
+        return int(hours) * 3600 + parse_time(f"00:{rest}")
+    seconds, number = 0, ""
+    for character in text:
+        if character.isascii() and character.isdigit():
+            number += character
+        elif character in _DURATION_UNITS and number:
+            seconds += int(number) * _DURATION_UNITS[character]
+            number = ""
+        else:
+            raise ValueError(f"malformed duration {text!r}")
+    if number or not text:
+        raise ValueError(f"malformed duration {text!r}")
+    return seconds
+
+
+def parse_moment(text: str) -> int:
+    # A date stands for its midnight.
+    if len(text) == 10:
+        return parse_date(text) * 86400
+    return parse_epoch(text)
+
+
+def parse_timezone(text: str) -> str:
+    import zoneinfo
+
+    try:
+        zoneinfo.ZoneInfo(text)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError) as err:
+        raise ValueError(f"unknown timezone {text!r}") from err
+    return text
@@ -0,0 +1,163 @@
+import ctypes
+import os
+import pathlib
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterator, Mapping, MutableMapping
+from dataclasses import dataclass, field
+
+import timeclock_el_punch_clock.indices as indices
+import timeclock_el_punch_clock.tails as tails
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import mmaps
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+_DAY = 86400
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+
+@dataclass
+class Tally:
+    # Seconds per day since the epoch and full account path, for the part of
+    # the log up to `offset`.
+    days: MutableMapping[int, MutableMapping[tuple[Account, ...], int]] = field(
+        default_factory=dict
+    )
+    current: ClockInEntry | None = None
+    inode: int | None = None
+    offset: int = 0
+
+    def _close(self, end: int) -> None:
+        assert self.current is not None, "Invariant: an interval is open"
+        start, accounts = self.current.timestamp, self.current.accounts
+        while start < end:
+            day = start // _DAY
+            next_day = (day + 1) * _DAY
+            totals = self.days.setdefault(day, {})
+            totals[accounts] = totals.get(accounts, 0) + min(end, next_day) - start
+            start = next_day
+
+    def advance(
+        self, path: pathlib.Path, delimiter: str = ":", since: int | None = None
+    ) -> bool:
+        # On starting over, days before `since` are skipped with the index,
+        # keeping an interval open since before them.
+        try:
+            file = path.open(mode="rb")
+        except FileNotFoundError:
+            return False
+        with file:
+            stat = os.fstat(file.fileno())
+            changed = False
+            if stat.st_ino != self.inode or stat.st_size < self.offset:
+                # The log was replaced or truncated; start over.
+                self.days, self.current = {}, None
+                self.inode, self.offset = stat.st_ino, 0
+                if since is not None:
+                    self.offset = indices.load_or_build(path).seek(since)
+                    last = tails.read_last_entry(
+                        path, delimiter=delimiter, end=self.offset
+                    )
+                    if isinstance(last, ClockInEntry):
+                        self.current = last
+                changed = True
+            if stat.st_size == self.offset:
+                return changed
+            data = os.pread(file.fileno(), stat.st_size - self.offset, self.offset)
+        # A partially written last line is left for the next call.
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return changed
+        for entry in mmaps.parse_buffer(data[:end], delimiter=delimiter):
+            if isinstance(entry, (ClockInEntry, ClockOutEntry)):
+                if self.current is not None:
+                    self._close(entry.timestamp)
+                self.current = entry if isinstance(entry, ClockInEntry) else None
+        self.offset += end
+        return True
+
+    def day_totals(self, now: int, delimiter: str = ":") -> Mapping[str, int]:
+        day = now // _DAY
+        totals = dict(self.days.get(day, {}))
+        if self.current is not None and self.current.timestamp < now:
+            accounts = self.current.accounts
+            start = max(self.current.timestamp, day * _DAY)
+            totals[accounts] = totals.get(accounts, 0) + now - start
+        rolled: dict[str, int] = {}
+        for accounts, seconds in totals.items():
+            for depth in range(1, len(accounts) + 1):
+                name = delimiter.join(accounts[:depth])
+                rolled[name] = rolled.get(name, 0) + seconds
+        return dict(sorted(rolled.items()))
+
+
+def _inotify_changes(path: pathlib.Path) -> Iterator[None] | None:
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    fd = init(_IN_CLOEXEC)
+    if fd < 0:
+        return None
+    # The directory is watched, so that a replaced log is still seen.
+    mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+    if add_watch(fd, os.fsencode(path.parent.absolute()), mask) < 0:
+        os.close(fd)
+        return None
+
+    def changes() -> Iterator[None]:
+        name = os.fsencode(path.name)
+        try:
+            yield
+            while True:
+                select.select([fd], [], [])
+                data = os.read(fd, 65536)
+                position, matched = 0, False
+                while position < len(data):
+                    _, _, _, length = _EVENT.unpack_from(data, position)
+                    start = position + _EVENT.size
+                    matched |= data[start : start + length].rstrip(b"\0") == name
+                    position = start + length
+                if matched:
+                    yield
+        finally:
+            os.close(fd)
+
+    return changes()
+
+
+def _polled_changes(path: pathlib.Path, interval: float) -> Iterator[None]:
+    previous = None
+    while True:
+        try:
+            stat = path.stat()
+            current = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            current = None
+        if current != previous:
+            previous = current
+            yield
+        time.sleep(interval)
+
+
+def changes(path: pathlib.Path, poll_interval: float | None = None) -> Iterator[None]:
+    # Yields once at first, then whenever the log may have changed. Between
+    # changes it blocks on inotify, or sleeps between stats if unavailable or
+    # if a poll interval is given.
+    if poll_interval is None and sys.platform.startswith("linux"):
+        inotify = _inotify_changes(path)
+        if inotify is not None:
+            return inotify
+    if poll_interval is None:
+        poll_interval = DEFAULT_POLL_INTERVAL
+    return _polled_changes(path, poll_interval)
@@ -0,0 +1,24 @@
+import bisect
+from collections.abc import Iterator, MutableSequence
+from dataclasses import dataclass, field
+
+from timeclock_el_punch_clock.writers.protocols import ClockEntry, Render
+
+
+@dataclass
+class MemoryWriter:
+    entries: MutableSequence[ClockEntry] = field(default_factory=list)
+
+    def append(self, render: Render) -> None:
+        self.entries.extend(render(self.last()))
+
+    def last(self) -> ClockEntry | None:
+        return self.entries[-1] if self.entries else None
+
+    def between(self, start: int, end: int) -> Iterator[ClockEntry]:
+        def key(entry: ClockEntry) -> int:
+            return entry.timestamp
+
+        low = bisect.bisect_left(self.entries, start, key=key)
+        high = bisect.bisect_left(self.entries, end, lo=low, key=key)
+        yield from self.entries[low:high]
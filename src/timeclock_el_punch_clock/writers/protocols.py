@@ -0,0 +1,19 @@
+from collections.abc import Callable, Iterator, Sequence
+from typing import Protocol
+
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+
+ClockEntry = ClockInEntry | ClockOutEntry
+
+# Receives the last entry already written, under the writer's lock, and
+# returns the entries to write after it.
+Render = Callable[[ClockEntry | None], Sequence[ClockEntry]]
+
+
+class Writer(Protocol):
+    def append(self, render: Render) -> None: ...
+
+    def last(self) -> ClockEntry | None: ...
+
+    # Clock entries with start <= timestamp < end, in log order.
+    def between(self, start: int, end: int) -> Iterator[ClockEntry]: ...
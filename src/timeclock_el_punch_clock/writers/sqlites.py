@@ -0,0 +1,87 @@
+import pathlib
+import sqlite3
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.writers.protocols import ClockEntry, Render
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('i', 'o')),
+    account TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_timestamp ON entries (timestamp);
+CREATE INDEX IF NOT EXISTS entries_account ON entries (account);
+"""
+# Statements are kept constant, so that sqlite3 reuses the prepared ones.
+_INSERT = "INSERT INTO entries (timestamp, kind, account) VALUES (?, ?, ?)"
+_LAST = "SELECT timestamp, kind, account FROM entries ORDER BY id DESC LIMIT 1"
+_BETWEEN = (
+    "SELECT timestamp, kind, account FROM entries"
+    " WHERE timestamp >= ? AND timestamp < ? ORDER BY id"
+)
+
+
+@dataclass
+class SqliteWriter:
+    path: pathlib.Path
+    delimiter: str = ":"
+    _connection: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            # Transactions are issued explicitly, one per append.
+            connection = sqlite3.connect(self.path, isolation_level=None)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _row(self, entry: ClockEntry) -> tuple[int, str, str | None]:
+        if isinstance(entry, ClockInEntry):
+            return entry.timestamp, "i", self.delimiter.join(entry.accounts)
+        return entry.timestamp, "o", None
+
+    def _entry(self, row: tuple[int, str, str | None]) -> ClockEntry:
+        timestamp, kind, account = row
+        if kind == "o":
+            return ClockOutEntry(timestamp)
+        accounts = account.split(self.delimiter) if account else ()
+        return ClockInEntry(timestamp, tuple(Account(a) for a in accounts))
+
+    @contracts.has("io")
+    def append(self, render: Render) -> None:
+        connection = self.connection
+        # IMMEDIATE takes the write lock before the last entry is read.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(_LAST).fetchone()
+            entries: Sequence[ClockEntry] = render(
+                None if row is None else self._entry(row)
+            )
+            connection.executemany(_INSERT, map(self._row, entries))
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    @contracts.has("io")
+    def last(self) -> ClockEntry | None:
+        row = self.connection.execute(_LAST).fetchone()
+        return None if row is None else self._entry(row)
+
+    def between(self, start: int, end: int) -> Iterator[ClockEntry]:
+        for row in self.connection.execute(_BETWEEN, (start, end)):
+            yield self._entry(row)
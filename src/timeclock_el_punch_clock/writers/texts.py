@@ -0,0 +1,67 @@
+import pathlib
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+
+import timeclock_el_punch_clock.appends as appends
+import timeclock_el_punch_clock.indices as indices
+import timeclock_el_punch_clock.tails as tails
+import timeclock_el_punch_clock.timestamps as timestamps
+from timeclock_el_punch_clock import contracts
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.policies import FsyncPolicy
+from timeclock_el_punch_clock.writers.protocols import ClockEntry, Render
+
+
+def format_entries(entries: Sequence[ClockEntry], delimiter: str = ":") -> str:
+    formatted = []
+    for entry in entries:
+        datetimestamp = timestamps.format_epoch(entry.timestamp)
+        if isinstance(entry, ClockOutEntry):
+            formatted.append(f"o {datetimestamp}\n")
+        elif entry.accounts:
+            formatted.append(f"i {datetimestamp} {delimiter.join(entry.accounts)}\n")
+        else:
+            formatted.append(f"i {datetimestamp}\n")
+    return "".join(formatted)
+
+
+@dataclass
+class TextWriter:
+    path: pathlib.Path
+    delimiter: str = ":"
+    fsync_policy: FsyncPolicy = FsyncPolicy.ALWAYS
+    # Just past the lines of the last append, see appends.append.
+    end: int | None = field(default=None, init=False, repr=False)
+    # The index of the log as of the last append, for the next one.
+    index: indices.Index | None = field(default=None, init=False, repr=False)
+
+    # Render may raise, so no exceptions are declared.
+    @contracts.has("io")
+    def append(self, render: Render) -> None:
+        def render_lines() -> bytes:
+            entries = render(tails.read_last_entry(self.path, delimiter=self.delimiter))
+            return format_entries(entries, delimiter=self.delimiter).encode()
+
+        self.end, self.index = appends.append_with_index(
+            self.path,
+            render_lines,
+            self.index,
+            fsync_policy=self.fsync_policy,
+            delimiter=self.delimiter,
+        )
+
+    @contracts.has("io")
+    @contracts.raises(MalformedLineError)
+    def last(self) -> ClockEntry | None:
+        return tails.read_last_entry(self.path, delimiter=self.delimiter)
+
+    def between(self, start: int, end: int) -> Iterator[ClockEntry]:
+        for entry in indices.iter_entries_since(
+            self.path, start, delimiter=self.delimiter
+        ):
+            if isinstance(entry, (ClockInEntry, ClockOutEntry)):
+                if entry.timestamp >= end:
+                    return
+                if entry.timestamp >= start:
+                    yield entry
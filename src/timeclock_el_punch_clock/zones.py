@@ -0,0 +1,160 @@
+import datetime
+import functools
+import mmap
+import os
+import pathlib
+import re
+import zoneinfo
+from collections.abc import MutableSequence, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from timeclock_el_punch_clock.parsing.entries import HeadingEntry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+UTC = "UTC"
+# A heading titled TZ=Europe/Vienna tags the entries after it, up to the next
+# such heading; one at the top tags the whole log.
+TAG = "TZ="
+_TAG_HEADING = re.compile(rb"\*+[ \t]*" + re.escape(TAG.encode()))
+
+_DAY = 86400
+_YEAR = 366 * _DAY
+
+
+@dataclass(frozen=True)
+class Table:
+    # Offsets[i] applies from transitions[i - 1] up to transitions[i], in UTC
+    # epochs; offsets[0] before the first transition.
+    transitions: np.ndarray
+    offsets: np.ndarray
+
+    def to_local(self, epochs: np.ndarray) -> np.ndarray:
+        return epochs + self.offsets[np.searchsorted(self.transitions, epochs, "right")]
+
+    def to_utc(self, local: np.ndarray, fold: int = 0) -> np.ndarray:
+        # As datetime does: a repeated wall time is taken at its first
+        # occurrence with fold 0, at its second with fold 1; a skipped one
+        # with the offset from before the transition with fold 0.
+        pick = np.maximum if fold == 0 else np.minimum
+        bounds = self.transitions + pick(self.offsets[:-1], self.offsets[1:])
+        return local - self.offsets[np.searchsorted(bounds, local, "right")]
+
+
+def _offset(zone: zoneinfo.ZoneInfo, epoch: int) -> int:
+    offset = datetime.datetime.fromtimestamp(epoch, zone).utcoffset()
+    assert offset is not None, "Invariant: a ZoneInfo has an offset"
+    return int(offset.total_seconds())
+
+
+@functools.lru_cache(maxsize=64)
+def _table(name: str, first_year: int, last_year: int) -> Table:
+    zone = zoneinfo.ZoneInfo(name)
+    start = int(datetime.datetime(first_year, 1, 1, tzinfo=datetime.UTC).timestamp())
+    end = int(datetime.datetime(last_year + 1, 1, 1, tzinfo=datetime.UTC).timestamp())
+    transitions: MutableSequence[int] = []
+    offsets = [_offset(zone, start)]
+    # Daily samples, each change narrowed down to the second it happens.
+    previous = start
+    for sample in range(start + _DAY, end + _DAY, _DAY):
+        if _offset(zone, sample) == offsets[-1]:
+            previous = sample
+            continue
+        low, high = previous, sample
+        while high - low > 1:
+            middle = (low + high) // 2
+            if _offset(zone, middle) == offsets[-1]:
+                low = middle
+            else:
+                high = middle
+        transitions.append(high)
+        offsets.append(_offset(zone, high))
+        previous = sample
+    return Table(
+        transitions=np.asarray(transitions, dtype=np.int64),
+        offsets=np.asarray(offsets, dtype=np.int64),
+    )
+
+
+def table(name: str, first: int, last: int) -> Table:
+    # Covers the naive epochs from first to last, a year either side.
+    return _table(
+        name,
+        (
+            datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=first - _YEAR)
+        ).year,
+        (datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=last + _YEAR)).year,
+    )
+
+
+def tag(entry: HeadingEntry) -> str | None:
+    if not entry.title.startswith(TAG):
+        return None
+    name = entry.title.removeprefix(TAG).strip()
+    try:
+        zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError) as err:
+        raise MalformedLineError(f"unknown timezone {name!r}") from err
+    return name
+
+
+def tagged(path: pathlib.Path) -> bool:
+    # Compaction keeps the last tag at the top of the log, so the log alone
+    # tells whether its segments are tagged, too. Only a heading tags it; the
+    # rare "TZ=" elsewhere, as in an account, is skipped.
+    needle = TAG.encode()
+    with path.open(mode="rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            position = buffer.find(needle)
+            while position >= 0:
+                start = buffer.rfind(b"\n", 0, position) + 1
+                if _TAG_HEADING.fullmatch(buffer, start, position + len(needle)):
+                    return True
+                position = buffer.find(needle, position + 1)
+    return False
+
+
+def to_utc(
+    local: np.ndarray,
+    names: np.ndarray,
+    zones: Sequence[str],
+    last: int | None = None,
+) -> np.ndarray:
+    # Each entry is converted with the table of its zone. Where the clocks
+    # fall back, a wall time earlier than one before it is taken to be the
+    # second occurrence, as are the later ones within the same fall back.
+    # `last` is the UTC epoch of an entry before all of them.
+    if not len(local):
+        return local.astype(np.int64)
+    low, high = int(local.min()), int(local.max())
+    earlier = np.empty_like(local)
+    later = np.empty_like(local)
+    windows = np.empty_like(local)
+    for zone_id, name in enumerate(zones):
+        mask = names == zone_id
+        if not mask.any():
+            continue
+        zone_table = table(name, low, high)
+        earlier[mask] = zone_table.to_utc(local[mask], fold=0)
+        later[mask] = zone_table.to_utc(local[mask], fold=1)
+        windows[mask] = (
+            np.searchsorted(zone_table.transitions, later[mask], "right") * len(zones)
+            + zone_id
+        )
+    result = earlier.copy()
+    repeated = np.flatnonzero(later > earlier)
+    if len(repeated):
+        first = earlier[0] if last is None else last
+        before = np.maximum.accumulate(np.concatenate(([first], earlier[:-1])))
+        went_back = (earlier < before)[repeated].astype(np.int64)
+        keys = windows[repeated]
+        run_start = np.concatenate(([True], keys[1:] != keys[:-1]))
+        runs = np.cumsum(run_start) - 1
+        seen = np.cumsum(went_back)
+        base = (seen - went_back)[run_start][runs]
+        second = repeated[seen - base > 0]
+        result[second] = later[second]
+    return result
@@ -0,0 +1,31 @@
+import multiprocessing
+import pathlib
+import time
+
+import pytest
+
+from conftest import toggle_clock
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+
+_processes = 32
+_count = 200
+
+
+@pytest.mark.parametrize("processes", (1, _processes))
+def test_append_from_concurrent_processes_punches_per_second(
+    tmp_path: pathlib.Path, processes: int
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.touch()
+
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        start = time.perf_counter()
+        pool.starmap(toggle_clock, ((path, _count),) * processes)
+        elapsed = time.perf_counter() - start
+
+    entries = list(lines.iter_entries(path))
+    print(f"{processes} writers: {len(entries) / elapsed:.0f} punches/s")
+    assert len(entries) == processes * _count
+    assert all(isinstance(entry, ClockInEntry) for entry in entries[0::2])
+    assert all(isinstance(entry, ClockOutEntry) for entry in entries[1::2])
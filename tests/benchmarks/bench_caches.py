@@ -0,0 +1,38 @@
+import pathlib
+import time
+
+import pytest
+
+from benchmarking import scaled, write_log_timeclock
+from timeclock_el_punch_clock import caches, parallel, reports
+
+_size = scaled(2**26)
+
+
+@pytest.fixture(scope="module")
+def large_log_timeclock(tmp_path_factory) -> pathlib.Path:
+    path = tmp_path_factory.mktemp("caches") / "log.timeclock"
+    return write_log_timeclock(path, _size)
+
+
+def test_cached_reload_is_faster_than_parsing(
+    large_log_timeclock: pathlib.Path,
+) -> None:
+    start = time.perf_counter()
+    parsed = parallel.intervals_from_files((large_log_timeclock,))
+    parse = time.perf_counter() - start
+
+    start = time.perf_counter()
+    caches.load(large_log_timeclock)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cached = reports.from_cache(caches.load(large_log_timeclock))
+    reload = time.perf_counter() - start
+
+    print(
+        f"{_size / 2**20:.0f} MiB: parse {parse:.2f} s, build cache {build:.2f} s,"
+        f" reload {reload * 1000:.1f} ms ({parse / reload:.0f}x)"
+    )
+    assert cached.starts.tolist() == parsed.starts.tolist()
+    assert reload * 10 < parse
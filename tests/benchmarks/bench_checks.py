@@ -0,0 +1,48 @@
+import os
+import pathlib
+import shutil
+import time
+
+import pytest
+
+from benchmarking import scaled
+from conftest import write_synthetic_log_timeclock
+from timeclock_el_punch_clock import checks
+
+_lines = scaled(2_000_000)
+_min_lines_per_second = 200_000
+
+
+@pytest.fixture(scope="module")
+def log_timeclock(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    path = tmp_path_factory.mktemp("checks") / "log.timeclock"
+    return write_synthetic_log_timeclock(path, _lines, seed=0)
+
+
+@pytest.mark.parametrize("workers", sorted({1, os.cpu_count() or 1}))
+def test_check_lines_per_second(log_timeclock: pathlib.Path, workers: int) -> None:
+    start = time.perf_counter()
+    problems = checks.check(log_timeclock, workers=workers, chunk_size=2**22)
+    elapsed = time.perf_counter() - start
+
+    print(f"check, {workers} workers: {_lines / elapsed:,.0f} lines/s")
+    assert problems == []
+    assert _lines / elapsed >= _min_lines_per_second
+
+
+def test_fix_of_a_torn_last_line_rewrites_only_the_tail(
+    tmp_path: pathlib.Path, log_timeclock: pathlib.Path
+) -> None:
+    path = tmp_path / "log.timeclock"
+    shutil.copyfile(log_timeclock, path)
+    with path.open(mode="ab") as file:
+        file.write(b"i 2999-01-0")
+    size = path.stat().st_size
+
+    start = time.perf_counter()
+    problems = checks.fix(path)
+    elapsed = time.perf_counter() - start
+
+    print(f"fix: {elapsed:.3f} s, {size - path.stat().st_size} bytes dropped")
+    assert path.stat().st_size == log_timeclock.stat().st_size
+    assert problems == []
@@ -0,0 +1,94 @@
+import argparse
+import datetime
+import pathlib
+from collections.abc import Callable
+
+import pytest
+
+import timeclock_el_punch_clock.contracts as contracts
+from benchmarking import measure
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.commands.clock_in import ClockIn
+from timeclock_el_punch_clock.commands.import_entries import ImportEntries
+from timeclock_el_punch_clock.contracts import ContractsMode
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.policies import FsyncPolicy
+
+_modes = (
+    (ContractsMode.ON, 1),
+    (ContractsMode.SAMPLED, 10),
+    (ContractsMode.SAMPLED, 100),
+    (ContractsMode.OFF, 1),
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_contracts():
+    yield
+    contracts.configure(ContractsMode.ON)
+
+
+def _arguments(path: pathlib.Path) -> Callable[[], object]:
+    namespace = argparse.Namespace(file=path, accounts=("INBOX",), fsync="never")
+    return lambda: Arguments.from_namespace(namespace)
+
+
+def _clock_in(path: pathlib.Path) -> Callable[[], object]:
+    command = ClockIn(
+        file=WriteableFilePath(path),
+        datetimestamp=datetime.datetime(1970, 1, 1, 9),
+        accounts=(Account("INBOX"),),
+        delimiter=":",
+        fsync_policy=FsyncPolicy.NEVER,
+    )
+
+    def clock_in() -> None:
+        path.write_bytes(b"")
+        command()
+
+    return clock_in
+
+
+def _import_entries(path: pathlib.Path) -> Callable[[], object]:
+    command = ImportEntries(
+        file=WriteableFilePath(path),
+        entries=(ClockInEntry(9 * 3600, (Account("INBOX"),)), ClockOutEntry(17 * 3600)),
+        delimiter=":",
+        fsync_policy=FsyncPolicy.NEVER,
+    )
+
+    def import_entries() -> None:
+        path.write_bytes(b"")
+        command()
+
+    return import_entries
+
+
+@pytest.mark.parametrize("command", (_arguments, _clock_in, _import_entries))
+def test_contracts_overhead_per_command(
+    tmp_path: pathlib.Path, command: Callable[[pathlib.Path], Callable[[], object]]
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.touch()
+    func = command(path)
+
+    timings = {}
+    for mode, interval in _modes:
+        contracts.configure(mode, interval=interval)
+
+        def sampled_func() -> None:
+            with contracts.sampled():
+                func()
+
+        timings[mode, interval] = measure(sampled_func, number=200)
+
+    # A report rather than a gate: the numbers inform the production default.
+    baseline = timings[ContractsMode.OFF, 1]
+    for (mode, interval), timing in timings.items():
+        label = f"{mode}/{interval}" if mode is ContractsMode.SAMPLED else mode
+        print(
+            f"{command.__name__.lstrip('_')} {label}: {timing * 1e6:.1f} us"
+            f" ({(timing - baseline) * 1e6:+.1f} us)"
+        )
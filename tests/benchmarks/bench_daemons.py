@@ -0,0 +1,107 @@
+import asyncio
+import datetime
+import pathlib
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarking import measure
+from timeclock_el_punch_clock import daemons
+from timeclock_el_punch_clock.commands.clock_in import ClockIn
+from timeclock_el_punch_clock.commands.serve import Serve
+from timeclock_el_punch_clock.commands.status import Status
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.policies import FsyncPolicy
+
+_number = 200
+_repeat = 11
+_main = "import sys; import timeclock_el_punch_clock.cli as cli; cli.main(sys.argv[1:])"
+
+
+def _punches(path: pathlib.Path, punch_in) -> float:
+    # Every punch in is preceded by a raw clock out, so that entries alternate.
+    minutes = iter(range(10**9))
+
+    def punch() -> None:
+        minute = next(minutes)
+        datetimestamp = datetime.datetime(2024, 1, 1) + datetime.timedelta(
+            minutes=2 * minute
+        )
+        with path.open(mode="a") as file:
+            file.write(f"o {datetimestamp - datetime.timedelta(minutes=1)}\n")
+        punch_in(datetimestamp)
+
+    return measure(punch, number=_number)
+
+
+def test_daemon_punch_latency(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("")
+    file = WriteableFilePath(path)
+
+    def direct_in(datetimestamp: datetime.datetime) -> None:
+        ClockIn(file, datetimestamp, (), ":", fsync_policy=FsyncPolicy.NEVER)()
+
+    def daemon_in(datetimestamp: datetime.datetime) -> None:
+        message = {"command": "in", "datetime": str(datetimestamp), "fsync": "never"}
+        daemons.request(path, message)
+
+    direct = _punches(path, direct_in)
+    direct_status = measure(lambda: Status(file, ":")(), number=_number)
+
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    thread = threading.Thread(
+        target=loop.run_until_complete, args=(Serve(file, ":").serve(stop),)
+    )
+    thread.start()
+    while not daemons.socket_path(path).exists():
+        thread.join(0.01)
+    try:
+        served = _punches(path, daemon_in)
+        served_status = measure(
+            lambda: daemons.request(path, {"command": "status"}), number=_number
+        )
+    finally:
+        loop.call_soon_threadsafe(stop.set)
+        thread.join()
+        loop.close()
+
+    print(
+        f"punch in: direct {direct * 1e6:.0f} us, daemon {served * 1e6:.0f} us;"
+        f" status: direct {direct_status * 1e6:.0f} us,"
+        f" daemon {served_status * 1e6:.0f} us"
+    )
+
+
+def _command(cwd: pathlib.Path, *args: str) -> float:
+    timings = []
+    for _ in range(_repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            (sys.executable, "-c", _main, *args),
+            cwd=cwd,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def test_daemon_command_latency(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "log.timeclock").write_text("i 2024-01-01 09:00:00 INBOX\n")
+    direct = _command(tmp_path, "status")
+
+    daemon = subprocess.Popen((sys.executable, "-c", _main, "serve"), cwd=tmp_path)
+    try:
+        while not daemons.socket_path(tmp_path / "log.timeclock").exists():
+            time.sleep(0.01)
+        served = _command(tmp_path, "status")
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+    print(f"ttlpc status: direct {direct * 1000:.1f} ms, daemon {served * 1000:.1f} ms")
+    assert served < direct
@@ -0,0 +1,45 @@
+import json
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+from benchmarking import scaled, write_log_timeclock
+from timeclock_el_punch_clock.parsing.backends import Backend
+
+_size = scaled(2**30)
+
+_scan = """
+import collections, json, pathlib, resource, sys, time
+from timeclock_el_punch_clock.parsing import backends
+
+path, backend = pathlib.Path(sys.argv[1]), backends.Backend(sys.argv[2])
+start = time.perf_counter()
+collections.deque(backends.iter_entries(path, backend=backend), maxlen=0)
+elapsed = time.perf_counter() - start
+maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"elapsed": elapsed, "maxrss": maxrss}))
+"""
+
+
+@pytest.fixture(scope="module")
+def large_log_timeclock(tmp_path_factory) -> pathlib.Path:
+    path = tmp_path_factory.mktemp("mmaps") / "log.timeclock"
+    return write_log_timeclock(path, _size)
+
+
+@pytest.mark.parametrize("backend", tuple(Backend))
+def test_iter_entries_throughput_and_rss(
+    large_log_timeclock: pathlib.Path, backend: Backend
+) -> None:
+    completed = subprocess.run(
+        (sys.executable, "-c", _scan, str(large_log_timeclock), backend),
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    result = json.loads(completed.stdout)
+
+    throughput = _size / result["elapsed"] / 2**20
+    print(f"{backend}: {throughput:.1f} MiB/s, max rss {result['maxrss']} KiB")
@@ -0,0 +1,51 @@
+import os
+import pathlib
+import time
+
+import pytest
+
+from benchmarking import scaled, write_log_timeclock
+from timeclock_el_punch_clock import parallel, reports
+
+_size = scaled(2**26)
+_files = 256
+_workers = (1, 2, 4, 8)
+
+
+@pytest.fixture(scope="module")
+def large_log_timeclock(tmp_path_factory) -> list[pathlib.Path]:
+    path = tmp_path_factory.mktemp("parallel") / "log.timeclock"
+    return [write_log_timeclock(path, _size)]
+
+
+@pytest.fixture(scope="module")
+def many_log_timeclocks(tmp_path_factory) -> list[pathlib.Path]:
+    directory = tmp_path_factory.mktemp("employees")
+    return [
+        write_log_timeclock(directory / f"{number}.timeclock", _size // _files)
+        for number in range(_files)
+    ]
+
+
+@pytest.mark.parametrize("logs", ("large_log_timeclock", "many_log_timeclocks"))
+def test_report_scaling_over_workers(request, logs: str) -> None:
+    paths = request.getfixturevalue(logs)
+    size = sum(path.stat().st_size for path in paths)
+
+    elapsed = {}
+    totals = {}
+    for workers in _workers:
+        start = time.perf_counter()
+        intervals = parallel.intervals_from_files(
+            paths, workers=workers, chunk_size=max(_size // 16, 1)
+        )
+        totals[workers] = reports.totals_by_account(intervals)
+        elapsed[workers] = time.perf_counter() - start
+
+    for workers in _workers:
+        print(
+            f"{logs} {workers} workers: {size / elapsed[workers] / 2**20:.1f} MiB/s,"
+            f" speedup {elapsed[1] / elapsed[workers]:.2f}x"
+            f" on {os.cpu_count()} cpus"
+        )
+    assert all(total == totals[1] for total in totals.values())
@@ -0,0 +1,37 @@
+import collections
+import pathlib
+import time
+
+import hypothesis
+
+from conftest import log_timeclock_contents
+from timeclock_el_punch_clock.parsing import lines
+
+_lines = 2**20
+_min_lines_per_second = 1_000_000
+_repeat = 5
+
+
+@hypothesis.settings(
+    max_examples=3,
+    deadline=None,
+    phases=(hypothesis.Phase.generate,),
+    suppress_health_check=list(hypothesis.HealthCheck),
+)
+@hypothesis.given(log_timeclock_contents(min_size=64, max_size=64, delimiter_value=":"))
+def test_iter_entries_parses_at_least_a_million_lines_per_second(
+    tmp_path_factory, log_timeclock_content: str
+) -> None:
+    path: pathlib.Path = tmp_path_factory.mktemp("parsing") / "log.timeclock"
+    repeats = _lines // log_timeclock_content.count("\n")
+    path.write_text(log_timeclock_content * repeats)
+
+    timings = []
+    for _ in range(_repeat):
+        start = time.perf_counter()
+        entries = collections.deque(lines.iter_entries(path), maxlen=1)
+        timings.append(time.perf_counter() - start)
+
+    lines_per_second = repeats * log_timeclock_content.count("\n") / min(timings)
+    assert entries
+    assert lines_per_second >= _min_lines_per_second, f"{lines_per_second:,.0f} lines/s"
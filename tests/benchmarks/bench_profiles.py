@@ -0,0 +1,27 @@
+import timeclock_el_punch_clock.profiles as profiles
+from benchmarking import measure
+from timeclock_el_punch_clock.profiles import ProfileMode
+
+_number = 100_000
+
+
+def test_disabled_span_overhead() -> None:
+    def bare() -> None:
+        pass
+
+    def spanned() -> None:
+        with profiles.span("phase"):
+            pass
+
+    profiles.configure(ProfileMode.OFF)
+    baseline = measure(bare, number=_number)
+    disabled = measure(spanned, number=_number)
+    profiles.configure(ProfileMode.SPANS)
+    enabled = measure(spanned, number=_number)
+    profiles.configure(ProfileMode.OFF)
+
+    print(
+        f"span: disabled {(disabled - baseline) * 1e9:.0f} ns,"
+        f" enabled {(enabled - baseline) * 1e9:.0f} ns over a bare call"
+    )
+    assert disabled - baseline < 1e-6
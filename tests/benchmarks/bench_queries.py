@@ -0,0 +1,54 @@
+import datetime
+import pathlib
+import time
+
+import pytest
+
+from benchmarking import scaled
+from timeclock_el_punch_clock import caches, indices, queries
+from timeclock_el_punch_clock.queries import Filter
+
+_days = scaled(20_000)
+_first = 10_957  # 2000-01-01
+
+
+@pytest.fixture(scope="module")
+def long_log_timeclock(tmp_path_factory) -> pathlib.Path:
+    path = tmp_path_factory.mktemp("queries") / "log.timeclock"
+    with path.open(mode="w") as file:
+        for day in range(_first, _first + _days):
+            date = datetime.date.fromordinal(day + 719163)
+            file.write(
+                f"*** {date}\n"
+                f"i {date} 09:00:00 INBOX:meeting\n"
+                f"i {date} 10:00:00 client:project:development\n"
+                f"o {date} 17:00:00\n"
+            )
+    return path
+
+
+def _timed(path: pathlib.Path, query: Filter) -> tuple[float, int]:
+    start = time.perf_counter()
+    count = sum(1 for _ in queries.run(path, query))
+    return time.perf_counter() - start, count
+
+
+def test_pushdown_and_limit(long_log_timeclock: pathlib.Path) -> None:
+    recent = Filter(since=(_first + _days - 90) * 86400, account="client:*")
+    first = Filter(longer_than=4 * 3600, limit=10)
+
+    scan, recent_count = _timed(long_log_timeclock, recent)
+    limited, first_count = _timed(long_log_timeclock, first)
+    indices.load_or_build(long_log_timeclock)
+    indexed, indexed_count = _timed(long_log_timeclock, recent)
+    caches.load(long_log_timeclock)
+    cached, cached_count = _timed(long_log_timeclock, recent)
+
+    print(
+        f"{_days} days, last 90 days: scan {scan * 1000:.1f} ms,"
+        f" index {indexed * 1000:.1f} ms, cache {cached * 1000:.1f} ms;"
+        f" --limit 10 {limited * 1000:.2f} ms"
+    )
+    assert recent_count == indexed_count == cached_count == 90
+    assert first_count == 10
+    assert indexed < scan and cached < scan and limited < scan
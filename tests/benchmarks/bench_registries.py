@@ -0,0 +1,52 @@
+import time
+
+import numpy as np
+
+from benchmarking import scaled
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.registries import AccountRegistry
+
+_count = scaled(100_000)
+
+
+def _paths() -> list[tuple[Account, ...]]:
+    return [
+        (
+            Account(f"client{i % 10}"),
+            Account(f"project{i % 1000}"),
+            Account(f"task{i}"),
+        )
+        for i in range(_count)
+    ]
+
+
+def test_rollup_over_distinct_accounts() -> None:
+    paths = _paths()
+    start = time.perf_counter()
+    registry = AccountRegistry()
+    nodes = np.asarray([registry.intern(path) for path in paths])
+    interned = time.perf_counter() - start
+
+    values = np.zeros(len(registry), dtype=np.int64)
+    values[nodes] = np.arange(1, _count + 1)
+    start = time.perf_counter()
+    rolled = registry.rollup(values)
+    rollup = time.perf_counter() - start
+
+    totals = dict(zip(paths, values[nodes].tolist()))
+    start = time.perf_counter()
+    scanned = {}
+    for prefix in {path[:depth] for path in paths for depth in (1, 2)}:
+        scanned[prefix] = sum(
+            value for path, value in totals.items() if path[: len(prefix)] == prefix
+        )
+        if time.perf_counter() - start > 5.0:
+            break
+    scan = (time.perf_counter() - start) * (1010 / len(scanned))
+
+    print(
+        f"{_count} accounts, {len(registry)} nodes: intern {interned:.3f} s,"
+        f" rollup {rollup * 1000:.1f} ms, prefix scan ~{scan:.1f} s"
+    )
+    assert rolled[0] == _count * (_count + 1) // 2
+    assert rollup < scan
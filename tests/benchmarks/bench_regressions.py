@@ -0,0 +1,78 @@
+import collections
+import pathlib
+import statistics
+import time
+import tracemalloc
+
+import pytest
+
+from benchmarking import check_baseline, measure, scaled
+from conftest import write_synthetic_log_timeclock
+from timeclock_el_punch_clock import reports, timestamps
+from timeclock_el_punch_clock.parsing import mmaps
+from timeclock_el_punch_clock.runners import Runner
+
+_lines = scaled(2_000_000)
+_punches = 200
+
+
+@pytest.fixture(scope="module")
+def log_timeclock(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    path = tmp_path_factory.mktemp("regressions") / "log.timeclock"
+    return write_synthetic_log_timeclock(path, _lines, seed=0)
+
+
+def test_punch_latency(tmp_path: pathlib.Path, log_timeclock: pathlib.Path) -> None:
+    # `ttlpc in` through argument parsing, Arguments, contracts and ClockIn,
+    # in process and without fsync, which times the disk rather than the code.
+    path = tmp_path / "log.timeclock"
+    epoch = timestamps.parse_epoch("2999-01-01 00:00:00")
+    closing = f"o {timestamps.format_epoch(epoch - 1)}\n".encode()
+    path.write_bytes(log_timeclock.read_bytes() + closing)
+    runner = Runner()
+    latencies = []
+    for punch in range(_punches):
+        moment = timestamps.format_epoch(epoch + 2 * punch)
+        args = ("--file", str(path), "--fsync", "never", "in", "--datetime", moment)
+        start = time.perf_counter()
+        runner.run((*args, "client:project"))
+        latencies.append(time.perf_counter() - start)
+        with path.open(mode="a") as file:
+            file.write(f"o {timestamps.format_epoch(epoch + 2 * punch + 1)}\n")
+
+    check_baseline("punch latency", statistics.median(latencies) * 1e6, "us")
+
+
+def test_parse_throughput(log_timeclock: pathlib.Path) -> None:
+    elapsed = measure(
+        lambda: collections.deque(mmaps.iter_entries(log_timeclock), maxlen=0),
+        number=1,
+        repeat=3,
+    )
+
+    check_baseline("parse time per line", elapsed / _lines * 1e9, "ns")
+
+
+def test_report_time(log_timeclock: pathlib.Path) -> None:
+    elapsed = measure(
+        lambda: reports.totals_by_account(
+            reports.from_entries(mmaps.iter_entries(log_timeclock))
+        ),
+        number=1,
+        repeat=3,
+    )
+
+    check_baseline("report time per line", elapsed / _lines * 1e9, "ns")
+
+
+def test_report_memory(log_timeclock: pathlib.Path) -> None:
+    tracemalloc.start()
+    try:
+        reports.totals_by_account(
+            reports.from_entries(mmaps.iter_entries(log_timeclock))
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    check_baseline("report peak memory per line", peak / _lines, "B", calibrated=False)
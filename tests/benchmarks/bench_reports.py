@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+import pytest
+
+from benchmarking import scaled
+from timeclock_el_punch_clock import reports
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.registries import AccountRegistry
+from timeclock_el_punch_clock.reports import Period
+
+_count = scaled(10_000_000)
+_accounts = 1000
+
+
+@pytest.fixture(scope="module")
+def intervals() -> reports.Intervals:
+    rng = np.random.default_rng(0)
+    # Short punches spanning about a century of days.
+    gaps = rng.integers(0, 60, _count)
+    durations = rng.integers(0, 600, _count)
+    starts = np.cumsum(gaps + np.concatenate(([0], durations[:-1])))
+    registry = AccountRegistry()
+    ids = [
+        registry.intern(
+            (
+                Account(f"client{i % 10}"),
+                Account(f"project{i % 100}"),
+                Account(f"task{i}"),
+            )
+        )
+        for i in range(_accounts)
+    ]
+    return reports.from_arrays(
+        starts,
+        starts + durations,
+        np.asarray(ids)[rng.integers(0, _accounts, _count)],
+        registry,
+    )
+
+
+@pytest.mark.parametrize("period", (None, *Period))
+def test_summarize_intervals_within_a_second(
+    intervals: reports.Intervals, period: Period | None
+) -> None:
+    start = time.perf_counter()
+    if period is None:
+        totals = reports.totals_by_account(intervals)
+    else:
+        totals = reports.totals_by_period(intervals, period)
+    elapsed = time.perf_counter() - start
+
+    print(f"{period or 'account'}: {len(intervals)} intervals in {elapsed:.3f} s")
+    assert sum(totals.values()) >= int((intervals.ends - intervals.starts).sum())
+    assert elapsed < 1.0
@@ -0,0 +1,35 @@
+import contextlib
+import io
+import pathlib
+import time
+
+from benchmarking import scaled
+from timeclock_el_punch_clock import cli
+from timeclock_el_punch_clock.runners import Runner
+
+_invocations = scaled(10_000)
+_main_invocations = scaled(1_000)
+
+
+def test_runner_invocations_per_second_against_main(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 2024-01-01 09:00:00 client:project\n")
+    args = ("--file", str(path), "status", "--datetime", "2024-01-01 10:00:00")
+    runner = Runner()
+    runner.run(args)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(_main_invocations):
+            cli.main(args)
+    main_elapsed = (time.perf_counter() - start) / _main_invocations
+    start = time.perf_counter()
+    for _ in range(_invocations):
+        runner.run(args)
+    runner_elapsed = (time.perf_counter() - start) / _invocations
+
+    print(
+        f"{_invocations} runs: {runner_elapsed * 1e6:.0f} us each,"
+        f" main: {main_elapsed * 1e6:.0f} us each"
+    )
+    assert runner_elapsed < main_elapsed
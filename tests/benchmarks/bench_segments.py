@@ -0,0 +1,49 @@
+import datetime
+import pathlib
+import time
+
+import pytest
+
+from benchmarking import scaled
+from timeclock_el_punch_clock import segments
+from timeclock_el_punch_clock.commands.report import Report
+
+_years = range(2000, 2000 + scaled(25))
+
+
+@pytest.fixture(scope="module")
+def multi_year_log_timeclock(tmp_path_factory) -> pathlib.Path:
+    path = tmp_path_factory.mktemp("segments") / "log.timeclock"
+    with path.open(mode="w") as file:
+        for year in _years:
+            file.write(f"* {year}\n")
+            day = datetime.date(year, 1, 1)
+            while day.year == year:
+                file.write(
+                    f"i {day} 09:00:00 client:project:development\no {day} 17:00:00\n"
+                )
+                day += datetime.timedelta(days=1)
+    return path
+
+
+def test_report_after_compaction_skips_old_years(
+    multi_year_log_timeclock: pathlib.Path,
+) -> None:
+    report = Report(multi_year_log_timeclock, ":", until=2**40)
+
+    start = time.perf_counter()
+    before = report()
+    uncompacted = time.perf_counter() - start
+
+    segments.compact(multi_year_log_timeclock)
+
+    start = time.perf_counter()
+    after = report()
+    compacted = time.perf_counter() - start
+
+    print(
+        f"{len(_years)} years: report {uncompacted * 1000:.1f} ms before compaction,"
+        f" {compacted * 1000:.1f} ms after ({uncompacted / compacted:.1f}x)"
+    )
+    assert after == before
+    assert compacted < uncompacted
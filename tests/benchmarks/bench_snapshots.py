@@ -0,0 +1,45 @@
+import pathlib
+
+import pytest
+
+from benchmarking import measure, scaled, write_log_timeclock
+from timeclock_el_punch_clock import snapshots
+
+_sizes = (scaled(2**20), scaled(2**27))
+_clock_lines = ("i 2000-01-01 09:00:00 INBOX\n", "o 2000-01-01 10:00:00\n")
+
+
+def _status_timings(path: pathlib.Path) -> tuple[float, float]:
+    snapshots.update(path)
+    fresh = measure(lambda: snapshots.update(path), number=200)
+    punches = iter(_clock_lines * 10_000)
+
+    def append_and_update() -> None:
+        with path.open(mode="a") as file:
+            file.write(next(punches))
+        snapshots.update(path)
+
+    appended = measure(append_and_update, number=200)
+    return fresh, appended
+
+
+@pytest.fixture(scope="module")
+def timings(tmp_path_factory) -> dict[int, tuple[float, float]]:
+    result = {}
+    for size in _sizes:
+        path = tmp_path_factory.mktemp("snapshots") / "log.timeclock"
+        result[size] = _status_timings(write_log_timeclock(path, size))
+    return result
+
+
+def test_status_is_independent_of_log_size(
+    timings: dict[int, tuple[float, float]],
+) -> None:
+    for size, (fresh, appended) in timings.items():
+        print(
+            f"{size / 2**20:.0f} MiB: fresh snapshot {fresh * 1e6:.1f} us,"
+            f" after append {appended * 1e6:.1f} us"
+        )
+    small, large = (timings[size] for size in _sizes)
+    assert large[0] < 3 * small[0]
+    assert large[1] < 3 * small[1]
@@ -0,0 +1,86 @@
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Mapping, Sequence
+
+import pytest
+
+_main = "import sys; import timeclock_el_punch_clock.cli as cli; cli.main(sys.argv[1:])"
+
+_repeat = 11
+
+
+def _environment(
+    cwd: pathlib.Path, environment: Mapping[str, str]
+) -> Mapping[str, str]:
+    # Bytecode is cached, as for an installed command, but outside the tree.
+    return {
+        **os.environ,
+        "PYTHONDONTWRITEBYTECODE": "",
+        "PYTHONPYCACHEPREFIX": str(cwd / "pycache"),
+        **environment,
+    }
+
+
+def _run(
+    cwd: pathlib.Path, command: Sequence[str], environment: Mapping[str, str]
+) -> tuple[float, str]:
+    (cwd / "log.timeclock").write_text("")
+    start = time.perf_counter()
+    completed = subprocess.run(
+        (sys.executable, *command),
+        cwd=cwd,
+        env=_environment(cwd, environment),
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return time.perf_counter() - start, completed.stderr
+
+
+def _median(
+    cwd: pathlib.Path, command: Sequence[str], environment: Mapping[str, str]
+) -> float:
+    return statistics.median(_run(cwd, command, environment)[0] for _ in range(_repeat))
+
+
+def _modules(
+    cwd: pathlib.Path, args: Sequence[str], environment: Mapping[str, str]
+) -> Sequence[str]:
+    _, stderr = _run(cwd, ("-X", "importtime", "-c", _main, *args), environment)
+    modules = [
+        line.rpartition("|")[2].strip()
+        for line in stderr.splitlines()
+        if line.startswith("import time:") and not line.endswith("imported package")
+    ]
+    return modules[1:]
+
+
+@pytest.mark.parametrize(
+    ("args", "environment", "budget", "module_budget", "forbidden"),
+    (
+        (("--help",), {}, 0.050, 90, ("deal", "typing")),
+        (("in",), {"TTLPC_CONTRACTS": "off"}, 0.050, 145, ("deal", "socket")),
+    ),
+)
+def test_startup_within_budget(
+    tmp_path: pathlib.Path,
+    args: Sequence[str],
+    environment: Mapping[str, str],
+    budget: float,
+    module_budget: int,
+    forbidden: Sequence[str],
+) -> None:
+    # Also writes the bytecode that the timed runs load.
+    modules = _modules(tmp_path, args, environment)
+    elapsed = _median(tmp_path, ("-c", _main, *args), environment)
+    interpreter = _median(tmp_path, ("-c", "pass"), environment)
+
+    assert not set(forbidden) & set(modules)
+    assert len(modules) <= module_budget, f"{len(modules)} modules"
+    assert elapsed - interpreter < budget, (
+        f"{(elapsed - interpreter) * 1000:.1f} ms over the interpreter"
+    )
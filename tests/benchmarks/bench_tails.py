@@ -0,0 +1,36 @@
+import datetime
+import pathlib
+
+import pytest
+
+from benchmarking import measure, scaled, write_log_timeclock
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.commands.clock_in import ClockIn
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+
+_sizes = (2**10, scaled(2**20), scaled(2**30))
+_max_slowdown = 3.0
+
+
+def _clock_in_latency(path: pathlib.Path) -> float:
+    command = ClockIn(
+        file=WriteableFilePath(path),
+        datetimestamp=datetime.datetime(1970, 1, 2, 9, 0, 0),
+        accounts=(Account("INBOX"), Account("meeting")),
+        delimiter=":",
+    )
+    return measure(command)
+
+
+@pytest.mark.parametrize("size", _sizes[1:])
+def test_clock_in_latency_is_flat_in_log_timeclock_size(
+    tmp_path: pathlib.Path, size: int
+) -> None:
+    smallest = write_log_timeclock(tmp_path / "smallest.timeclock", _sizes[0])
+    largest = write_log_timeclock(tmp_path / "largest.timeclock", size)
+
+    baseline = _clock_in_latency(smallest)
+    latency = _clock_in_latency(largest)
+
+    print(f"clock in: {size} bytes {latency * 1e6:.1f}us ({baseline * 1e6:.1f}us)")
+    assert latency < baseline * _max_slowdown
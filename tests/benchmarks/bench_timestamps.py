@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+
+from benchmarking import measure
+from timeclock_el_punch_clock import timestamps
+
+_min_speedup = 5.0
+_datetimestamp = datetime.datetime(2024, 3, 5, 7, 8, 9)
+_text = "2024-03-05 07:08:09"
+_unix_epoch = datetime.datetime(1970, 1, 1, 0, 0, 0)
+
+
+def _strptime_epoch(text: str) -> int:
+    parsed = datetime.datetime.strptime(text, timestamps.FORMAT)
+    return int((parsed - _unix_epoch).total_seconds())
+
+
+@pytest.mark.parametrize(
+    ("name", "codec", "stdlib"),
+    (
+        (
+            "format_datetime",
+            lambda: timestamps.format_datetime(_datetimestamp),
+            lambda: _datetimestamp.strftime(timestamps.FORMAT),
+        ),
+        (
+            "parse_datetime",
+            lambda: timestamps.parse_datetime(_text),
+            lambda: datetime.datetime.strptime(_text, timestamps.FORMAT),
+        ),
+        (
+            "parse_epoch",
+            lambda: timestamps.parse_epoch(_text),
+            lambda: _strptime_epoch(_text),
+        ),
+    ),
+)
+def test_codec_is_faster_than_stdlib(name, codec, stdlib) -> None:
+    assert codec() == stdlib()
+
+    speedup = measure(stdlib, number=10_000) / measure(codec, number=10_000)
+
+    print(f"{name}: {speedup:.1f}x")
+    assert speedup >= _min_speedup
@@ -0,0 +1,43 @@
+import pathlib
+import time
+
+import pytest
+
+from benchmarking import measure, scaled, write_log_timeclock
+from timeclock_el_punch_clock import parallel
+from timeclock_el_punch_clock.watches import Tally
+
+_size = scaled(2**24)
+
+
+@pytest.fixture(scope="module")
+def large_log_timeclock(tmp_path_factory) -> pathlib.Path:
+    path = tmp_path_factory.mktemp("watches") / "log.timeclock"
+    return write_log_timeclock(path, _size)
+
+
+def test_incremental_update_is_faster_than_reparsing(
+    large_log_timeclock: pathlib.Path,
+) -> None:
+    tally = Tally()
+    start = time.perf_counter()
+    tally.advance(large_log_timeclock)
+    initial = time.perf_counter() - start
+    full = measure(
+        lambda: parallel.intervals_from_files((large_log_timeclock,)),
+        number=1,
+        repeat=3,
+    )
+
+    def append() -> None:
+        with large_log_timeclock.open(mode="a") as file:
+            file.write("i 1970-01-01 18:00:00 INBOX\no 1970-01-01 18:30:00\n")
+        tally.advance(large_log_timeclock)
+
+    incremental = measure(append, number=100)
+
+    print(
+        f"{_size / 2**20:.0f} MiB: initial tally {initial:.2f} s,"
+        f" full parse {full:.2f} s, incremental update {incremental * 1e6:.0f} us"
+    )
+    assert incremental * 100 < full
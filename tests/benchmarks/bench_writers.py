@@ -0,0 +1,62 @@
+import pathlib
+
+import pytest
+
+from benchmarking import measure
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.policies import FsyncPolicy
+from timeclock_el_punch_clock.writers.memories import MemoryWriter
+from timeclock_el_punch_clock.writers.sqlites import SqliteWriter
+from timeclock_el_punch_clock.writers.texts import TextWriter
+
+_accounts = (Account("client"), Account("project"), Account("development"))
+_entries = 20_000
+_number = 500
+
+
+def _writers(tmp_path: pathlib.Path):
+    return {
+        "text": TextWriter(tmp_path / "log.timeclock", fsync_policy=FsyncPolicy.NEVER),
+        "memory": MemoryWriter(),
+        "sqlite": SqliteWriter(tmp_path / "log.sqlite"),
+    }
+
+
+@pytest.mark.parametrize("name", ("text", "memory", "sqlite"))
+def test_writer_throughput_and_range_queries(tmp_path: pathlib.Path, name: str) -> None:
+    (tmp_path / "log.timeclock").write_text("")
+    writer = _writers(tmp_path)[name]
+    timestamps = iter(range(0, 10**12, 1800))
+
+    def punch() -> None:
+        timestamp = next(timestamps)
+        writer.append(
+            lambda last: (
+                ClockOutEntry(timestamp)
+                if isinstance(last, ClockInEntry)
+                else ClockInEntry(timestamp, _accounts),
+            )
+        )
+
+    single = measure(punch, number=_number, repeat=3)
+
+    def batch() -> None:
+        writer.append(
+            lambda last: [
+                ClockInEntry(t, _accounts) if i % 2 else ClockOutEntry(t)
+                for i, t in zip(range(1000), timestamps)
+            ]
+        )
+
+    batched = measure(batch, number=1, repeat=_entries // 1000) / 1000
+    last = writer.last().timestamp
+    query = measure(
+        lambda: sum(1 for _ in writer.between(last // 2, last // 2 + 86400)),
+        number=20,
+    )
+
+    print(
+        f"{name}: punch {single * 1e6:.0f} us, batched {batched * 1e6:.1f} us"
+        f" per entry, one-day range query {query * 1e6:.0f} us"
+    )
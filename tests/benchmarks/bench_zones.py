@@ -0,0 +1,44 @@
+import datetime
+import time
+import zoneinfo
+
+import numpy as np
+
+from benchmarking import scaled
+from timeclock_el_punch_clock import zones
+
+_entries = scaled(1_000_000)
+_min_speedup = 20.0
+_zone = "Europe/Vienna"
+
+
+def test_to_utc_is_faster_than_zoneinfo_per_entry() -> None:
+    rng = np.random.default_rng(0)
+    local = np.sort(rng.integers(946684800, 1893456000, _entries, dtype=np.int64))
+    names = np.zeros(_entries, dtype=np.int64)
+    zones.table(_zone, int(local[0]), int(local[-1]))
+
+    start = time.perf_counter()
+    utc = zones.to_utc(local, names, (_zone,))
+    batch = time.perf_counter() - start
+
+    zone = zoneinfo.ZoneInfo(_zone)
+    unix_epoch = datetime.datetime(1970, 1, 1)
+    sample = local[:: max(1, _entries // 10_000)]
+    start = time.perf_counter()
+    expected = [
+        int(
+            (unix_epoch + datetime.timedelta(seconds=int(epoch)))
+            .replace(tzinfo=zone)
+            .timestamp()
+        )
+        for epoch in sample
+    ]
+    per_entry = (time.perf_counter() - start) / len(sample) * _entries
+
+    print(
+        f"to_utc: {_entries / batch:,.0f} entries/s,"
+        f" zoneinfo: {_entries / per_entry:,.0f} entries/s"
+    )
+    assert utc[:: max(1, _entries // 10_000)].tolist() == expected
+    assert per_entry / batch >= _min_speedup
@@ -0,0 +1,91 @@
+import functools
+import json
+import os
+import pathlib
+import statistics
+import timeit
+from collections.abc import Callable
+
+BASELINES = pathlib.Path(__file__).with_name("baselines.json")
+UPDATE_VARIABLE = "TTLPC_BENCHMARK_UPDATE"
+THRESHOLD_VARIABLE = "TTLPC_BENCHMARK_THRESHOLD"
+DEFAULT_THRESHOLD = 1.5
+
+_log_timeclock_block = """* 1970
+** 1970-01
+
+*** 1970-01-01
+
+i 1970-01-01 09:00:00 INBOX:meeting
+o 1970-01-01 10:30:00
+i 1970-01-01 10:30:00 client:project:development
+o 1970-01-01 17:00:00
+
+"""
+
+
+def write_log_timeclock(path: pathlib.Path, size: int) -> pathlib.Path:
+    block = _log_timeclock_block.encode()
+    chunk = block * max(1, 2**20 // len(block))
+    with path.open(mode="wb") as file:
+        while size >= len(chunk):
+            size -= file.write(chunk)
+        while size >= len(block):
+            size -= file.write(block)
+        file.write(b"\n" * size)
+    return path
+
+
+def measure(func: Callable[[], object], *, number: int = 100, repeat: int = 5) -> float:
+    timings = timeit.repeat(func, number=number, repeat=repeat)
+    return statistics.median(timings) / number
+
+
+def scaled(size: int) -> int:
+    return max(1, int(size * float(os.environ.get("TTLPC_BENCHMARK_SCALE", "1"))))
+
+
+_calibration_lines = [
+    f"i 2024-01-{day:02d} 09:{minute:02d}:00 client:project:{minute % 7}\n"
+    for day in range(1, 29)
+    for minute in range(60)
+]
+
+
+def _calibration_workload() -> object:
+    # Splitting, slicing and int parsing, as the parsers do.
+    return [
+        (int(line[2:6]), int(line[7:9]), tuple(line[22:-1].split(":")))
+        for line in _calibration_lines
+    ]
+
+
+@functools.cache
+def calibration() -> float:
+    # Seconds this machine takes for a fixed workload.
+    return measure(_calibration_workload, number=20, repeat=7)
+
+
+def check_baseline(
+    name: str, value: float, unit: str, *, calibrated: bool = True
+) -> None:
+    # Lower is better. Timings are stored and compared as multiples of
+    # calibration(), so that baselines recorded on one machine hold on
+    # another; other values, such as memory, as they are. Fails once `value`
+    # exceeds its baseline by the threshold factor; with the update variable
+    # set, stores it instead.
+    relative = value / calibration() / 1e6 if calibrated else value
+    stored_unit = f"{unit} per calibration us" if calibrated else unit
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    if os.environ.get(UPDATE_VARIABLE):
+        baselines[name] = {"value": relative, "unit": stored_unit}
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        return
+    baseline = baselines.get(name)
+    if baseline is None or baseline["unit"] != stored_unit:
+        raise AssertionError(f"{name}: no baseline, rerun with {UPDATE_VARIABLE}=1")
+    threshold = float(os.environ.get(THRESHOLD_VARIABLE, DEFAULT_THRESHOLD))
+    assert relative <= baseline["value"] * threshold, (
+        f"{name} regressed: {value:.4g} {unit} is {relative:.4g} {stored_unit},"
+        f" over {threshold} x the baseline of {baseline['value']:.4g}"
+    )
@@ -1,8 +1,10 @@
 import datetime
+import itertools
 import pathlib
+import random
 import string
 import tempfile
-from collections.abc import MutableSequence
+from collections.abc import Iterator, MutableSequence, Sequence
 
 import hypothesis.strategies
 import pytest
@@ -32,6 +34,20 @@ i 1970-01-01 00:01:00 party:new-year
 """
 
 
+def pytest_configure(config) -> None:
+    config.addinivalue_line(
+        "markers", "log_timeclock(contents): contents of the log_timeclock fixture"
+    )
+
+
+@pytest.fixture
+def log_timeclock(request, tmp_path: pathlib.Path) -> pathlib.Path:
+    marker = request.node.get_closest_marker("log_timeclock")
+    path = tmp_path / "log.timeclock"
+    path.write_text("" if marker is None else marker.args[0])
+    return path
+
+
 @pytest.fixture
 def empty_log_timeclock(tmp_path_factory) -> pathlib.Path:
     path = tmp_path_factory.getbasetemp() / "log.timeclock"
@@ -227,3 +243,129 @@ def clock_in_commands(
         accounts=accounts_,
         delimiter=delimiter,
     )
+
+
+def _synthetic_accounts(
+    rng: random.Random, delimiter: str
+) -> tuple[Sequence[str], Sequence[float]]:
+    def name() -> str:
+        return "".join(rng.choices(string.ascii_letters, k=rng.randint(3, 10)))
+
+    # Clients, their projects and tasks, plus a few top level accounts; a few
+    # of them get most of the time.
+    hierarchy = [
+        delimiter.join(accounts)
+        for client in (name() for _ in range(rng.randint(4, 12)))
+        for project in (name() for _ in range(rng.randint(1, 6)))
+        for accounts in (
+            (client, project),
+            *((client, project, name()) for _ in range(rng.randint(0, 5))),
+        )
+    ]
+    hierarchy.extend(["INBOX", "INBOX" + delimiter + "mail", ""])
+    rng.shuffle(hierarchy)
+    weights = [1 / rank for rank in range(1, len(hierarchy) + 1)]
+    return hierarchy, list(itertools.accumulate(weights))
+
+
+def synthetic_log_timeclock_lines(
+    size: int,
+    *,
+    seed: int = 0,
+    start: datetime.date = datetime.date(2000, 1, 1),
+    delimiter: str = ":",
+) -> Iterator[str]:
+    # A deterministic, valid log of `size` lines: headings for every year,
+    # month and working day, and two to ten clock ins on each of those days.
+    rng = random.Random(seed)
+    hierarchy, cum_weights = _synthetic_accounts(rng, delimiter)
+    day = start
+    month: tuple[int, int] | None = None
+    while size > 0:
+        if day.weekday() >= 5 and rng.random() < 0.9:
+            day += datetime.timedelta(days=1)
+            continue
+        lines: MutableSequence[str] = []
+        if month != (day.year, day.month):
+            if month is None or month[0] != day.year:
+                lines.append(f"* {day.year:04d}\n")
+            lines.extend((f"** {day.year:04d}-{day.month:02d}\n", "\n"))
+            month = (day.year, day.month)
+        date = day.isoformat()
+        lines.extend((f"*** {date}\n", "\n"))
+        second = rng.randint(7 * 3600, 10 * 3600)
+        for _ in range(rng.randint(2, 10)):
+            account = rng.choices(hierarchy, cum_weights=cum_weights)[0]
+            lines.append(
+                f"i {date} {second // 3600:02d}:{second // 60 % 60:02d}:"
+                f"{second % 60:02d} {account}\n"
+            )
+            second = min(second + rng.randint(60, 3 * 3600), 86399)
+            lines.append(
+                f"o {date} {second // 3600:02d}:{second // 60 % 60:02d}:"
+                f"{second % 60:02d}\n"
+            )
+            if second == 86399:
+                break
+            second = min(second + rng.choice((0, 0, 0, 300, 900, 3600)), 86399)
+        lines.append("\n")
+        for line in lines[:size]:
+            yield line
+        size -= len(lines)
+        day += datetime.timedelta(days=1)
+
+
+def write_synthetic_log_timeclock(
+    path: pathlib.Path,
+    size: int,
+    *,
+    seed: int = 0,
+    start: datetime.date = datetime.date(2000, 1, 1),
+    delimiter: str = ":",
+) -> pathlib.Path:
+    lines = synthetic_log_timeclock_lines(
+        size, seed=seed, start=start, delimiter=delimiter
+    )
+    with path.open(mode="w") as file:
+        while chunk := list(itertools.islice(lines, 2**16)):
+            file.write("".join(chunk))
+    return path
+
+
+@hypothesis.strategies.composite
+def synthetic_log_timeclock_contents(
+    draw, *, min_size=0, max_size=1000, delimiter_value=None
+) -> str:
+    delimiter = delimiter_value
+    if delimiter is None:
+        delimiter = draw(delimiters())
+    return "".join(
+        synthetic_log_timeclock_lines(
+            draw(
+                hypothesis.strategies.integers(min_value=min_size, max_value=max_size)
+            ),
+            seed=draw(hypothesis.strategies.integers(min_value=0)),
+            start=draw(
+                hypothesis.strategies.dates(
+                    min_value=datetime.date(1970, 1, 1),
+                    max_value=datetime.date(9000, 1, 1),
+                )
+            ),
+            delimiter=delimiter,
+        )
+    )
+
+
+def toggle_clock(path: pathlib.Path, count: int) -> None:
+    from timeclock_el_punch_clock import appends, tails, timestamps
+    from timeclock_el_punch_clock.policies import FsyncPolicy
+    from timeclock_el_punch_clock.parsing.entries import ClockInEntry
+
+    def render() -> bytes:
+        last = tails.read_last_entry(path)
+        kind = "o" if isinstance(last, ClockInEntry) else "i"
+        timestamp = 0 if last is None else last.timestamp + 1
+        return f"{kind} {timestamps.format_epoch(timestamp)}\n".encode()
+
+    for _ in range(count):
+        appends.append(path, render, fsync_policy=FsyncPolicy.NEVER)
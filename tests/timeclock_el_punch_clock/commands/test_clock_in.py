@@ -1,11 +1,17 @@
 import datetime
 
 import hypothesis
+import pytest
 
+import timeclock_el_punch_clock.appends as appends
 from conftest import clock_in_commands
 from timeclock_el_punch_clock.accounts import Account
 from timeclock_el_punch_clock.commands.clock_in import ClockIn
+from timeclock_el_punch_clock.commands.errors import EntriesNotAlternatingError
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
 from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.writers.memories import MemoryWriter
+from timeclock_el_punch_clock.writers.protocols import Render
 
 
 def test_call_with_empty_log_timeclock_ensures_at_least_one_line_and_last_line_is_expected(
@@ -81,6 +87,13 @@ def test_call_with_clocked_out_log_timeclock_and_empty_accounts_ensures_at_least
 def test_call_ensures_at_least_one_line_and_last_line_is_expected(
     command: ClockIn,
 ) -> None:
+    contents = command.file.read_text()
+    if contents.startswith("i") and contents.count("\n") % 2 == 1:
+        with pytest.raises(EntriesNotAlternatingError):
+            command()
+        assert command.file.read_text() == contents
+        return
+
     command()
 
     lines = 0
@@ -92,5 +105,82 @@ def test_call_ensures_at_least_one_line_and_last_line_is_expected(
     accounts_ = ""
     if command.accounts:
         accounts_ = f" {command.delimiter.join(command.accounts)}"
-    expected = f"i {command.datetimestamp.strftime('%Y-%m-%d %H:%M:%S')}{accounts_}\n"
+    expected = f"i {command.datetimestamp.isoformat(' ', 'seconds')}{accounts_}\n"
     assert line == expected
+
+
+def test_call_with_clocked_in_log_timeclock_raises_not_alternating(
+    clocked_in_log_timeclock,
+) -> None:
+    contents = clocked_in_log_timeclock.read_text()
+    command = ClockIn(
+        file=WriteableFilePath(clocked_in_log_timeclock),
+        datetimestamp=datetime.datetime(1970, 1, 1, 12, 0, 0),
+        accounts=(),
+        delimiter=":",
+    )
+
+    with pytest.raises(EntriesNotAlternatingError):
+        command()
+    assert clocked_in_log_timeclock.read_text() == contents
+
+
+def test_call_with_memory_writer_and_mirror_needs_no_file() -> None:
+    writer, mirror = MemoryWriter([ClockOutEntry(0)]), MemoryWriter()
+    command = ClockIn(
+        file=WriteableFilePath("unused.timeclock"),
+        datetimestamp=datetime.datetime(1970, 1, 1, 12, 0, 0),
+        accounts=(Account("INBOX"),),
+        delimiter=":",
+        writer=writer,
+        mirrors=(mirror,),
+    )
+
+    command()
+
+    assert writer.last() == mirror.last() == ClockInEntry(43200, (Account("INBOX"),))
+    with pytest.raises(EntriesNotAlternatingError):
+        command()
+
+
+def test_call_with_clocked_in_mirror_raises_before_writing_any_sink() -> None:
+    entry = ClockInEntry(0, (Account("INBOX"),))
+    writer, mirror = MemoryWriter([ClockOutEntry(0)]), MemoryWriter([entry])
+    command = ClockIn(
+        file=WriteableFilePath("unused.timeclock"),
+        datetimestamp=datetime.datetime(1970, 1, 1, 12, 0, 0),
+        accounts=(Account("INBOX"),),
+        delimiter=":",
+        writer=writer,
+        mirrors=(mirror,),
+    )
+
+    with pytest.raises(EntriesNotAlternatingError):
+        command()
+    assert writer.last() == ClockOutEntry(0)
+    assert mirror.last() == entry
+
+
+def test_call_ensures_its_own_line_when_another_punch_follows(
+    clocked_out_log_timeclock,
+) -> None:
+    file = WriteableFilePath(clocked_out_log_timeclock)
+
+    class Punch(MemoryWriter):
+        # Appends to the log after ClockIn has, before its postcondition.
+        def append(self, render: Render) -> None:
+            appends.append(file, lambda: b"o 1970-01-01 13:00:00\n")
+
+    command = ClockIn(
+        file=file,
+        datetimestamp=datetime.datetime(1970, 1, 1, 12, 0, 0),
+        accounts=(Account("INBOX"),),
+        delimiter=":",
+        mirrors=(Punch(),),
+    )
+
+    command()
+
+    assert file.read_text().endswith(
+        "i 1970-01-01 12:00:00 INBOX\no 1970-01-01 13:00:00\n"
+    )
@@ -0,0 +1,168 @@
+import pathlib
+
+import hypothesis
+import pytest
+
+import timeclock_el_punch_clock.cli as pc
+from conftest import log_timeclock_contents
+from timeclock_el_punch_clock import timestamps
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.commands.errors import (
+    EntriesNotAlternatingError,
+    EntriesNotInOrderError,
+)
+from timeclock_el_punch_clock.commands.import_entries import ImportEntries
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.writers.memories import MemoryWriter
+
+
+def _epoch(text: str) -> int:
+    return timestamps.parse_epoch(text)
+
+
+def test_call_with_empty_log_timeclock_appends_entries_with_headings(
+    empty_log_timeclock: pathlib.Path,
+) -> None:
+    command = ImportEntries(
+        file=WriteableFilePath(empty_log_timeclock),
+        entries=(
+            ClockInEntry(_epoch("1970-01-01 09:00:00"), (Account("INBOX"),)),
+            ClockOutEntry(_epoch("1970-01-01 17:00:00")),
+            ClockInEntry(_epoch("1970-01-02 09:00:00"), ()),
+            ClockOutEntry(_epoch("1970-02-01 17:00:00")),
+        ),
+        delimiter=":",
+    )
+
+    command()
+
+    expected = """* 1970
+** 1970-01
+*** 1970-01-01
+i 1970-01-01 09:00:00 INBOX
+o 1970-01-01 17:00:00
+*** 1970-01-02
+i 1970-01-02 09:00:00
+** 1970-02
+*** 1970-02-01
+o 1970-02-01 17:00:00
+"""
+    assert empty_log_timeclock.read_text() == expected
+
+
+def test_call_with_clocked_out_log_timeclock_appends_only_new_headings(
+    clocked_out_log_timeclock: pathlib.Path,
+) -> None:
+    contents = clocked_out_log_timeclock.read_text()
+    command = ImportEntries(
+        file=WriteableFilePath(clocked_out_log_timeclock),
+        entries=(
+            ClockInEntry(_epoch("1970-01-01 09:00:00"), (Account("INBOX"),)),
+            ClockOutEntry(_epoch("1970-01-02 17:00:00")),
+        ),
+        delimiter=":",
+    )
+
+    command()
+
+    expected = contents + (
+        "i 1970-01-01 09:00:00 INBOX\n*** 1970-01-02\no 1970-01-02 17:00:00\n"
+    )
+    assert clocked_out_log_timeclock.read_text() == expected
+
+
+def test_call_with_clocked_in_log_timeclock_and_clock_in_raises_not_alternating(
+    clocked_in_log_timeclock: pathlib.Path,
+) -> None:
+    contents = clocked_in_log_timeclock.read_text()
+    command = ImportEntries(
+        file=WriteableFilePath(clocked_in_log_timeclock),
+        entries=(ClockInEntry(_epoch("1970-01-01 09:00:00"), ()),),
+        delimiter=":",
+    )
+
+    with pytest.raises(EntriesNotAlternatingError):
+        command()
+    assert clocked_in_log_timeclock.read_text() == contents
+
+
+def test_call_with_entries_out_of_order_raises_not_in_order(
+    clocked_out_log_timeclock: pathlib.Path,
+) -> None:
+    contents = clocked_out_log_timeclock.read_text()
+    command = ImportEntries(
+        file=WriteableFilePath(clocked_out_log_timeclock),
+        entries=(
+            ClockInEntry(_epoch("1970-01-01 09:00:00"), ()),
+            ClockOutEntry(_epoch("1970-01-01 08:00:00")),
+        ),
+        delimiter=":",
+    )
+
+    with pytest.raises(EntriesNotInOrderError):
+        command()
+    assert clocked_out_log_timeclock.read_text() == contents
+
+
+@hypothesis.given(log_timeclock_contents(max_size=64, delimiter_value=":"))
+def test_call_with_empty_log_timeclock_imports_every_entry(
+    tmp_path_factory, log_timeclock_content: str
+) -> None:
+    path = tmp_path_factory.mktemp("import") / "log.timeclock"
+    path.touch()
+    entries = tuple(lines.parse_lines(log_timeclock_content.splitlines()))
+
+    ImportEntries(file=WriteableFilePath(path), entries=entries, delimiter=":")()
+
+    imported = tuple(
+        entry
+        for entry in lines.iter_entries(path)
+        if isinstance(entry, (ClockInEntry, ClockOutEntry))
+    )
+    assert imported == entries
+
+
+def test_call_checks_entries_against_each_mirror_before_writing_the_log(
+    empty_log_timeclock: pathlib.Path,
+) -> None:
+    entries = (
+        ClockInEntry(_epoch("1970-01-01 09:00:00"), (Account("INBOX"),)),
+        ClockOutEntry(_epoch("1970-01-01 17:00:00")),
+    )
+    mirror, later = (
+        MemoryWriter(),
+        MemoryWriter([ClockOutEntry(_epoch("1970-01-02 00:00:00"))]),
+    )
+
+    ImportEntries(
+        file=WriteableFilePath(empty_log_timeclock),
+        entries=entries,
+        delimiter=":",
+        mirrors=(mirror,),
+    )()
+    assert tuple(mirror.between(0, _epoch("1971-01-01 00:00:00"))) == entries
+
+    empty_log_timeclock.write_text("")
+    with pytest.raises(EntriesNotInOrderError):
+        ImportEntries(
+            file=WriteableFilePath(empty_log_timeclock),
+            entries=entries,
+            delimiter=":",
+            mirrors=(later,),
+        )()
+    assert empty_log_timeclock.read_text() == ""
+    assert later.last() == ClockOutEntry(_epoch("1970-01-02 00:00:00"))
+
+
+def test_main_with_import_appends_entries_from_source(
+    empty_log_timeclock: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    source = tmp_path / "punches.timeclock"
+    source.write_text("i 1970-01-01 09:00:00 INBOX\no 1970-01-01 17:00:00\n")
+
+    pc.main(("--file", str(empty_log_timeclock), "import", str(source)))
+
+    expected = "* 1970\n** 1970-01\n*** 1970-01-01\n" + source.read_text()
+    assert empty_log_timeclock.read_text() == expected
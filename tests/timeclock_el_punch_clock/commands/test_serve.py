@@ -0,0 +1,155 @@
+import asyncio
+import pathlib
+import socket
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from timeclock_el_punch_clock import cli, daemons, indices
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.commands.errors import (
+    DaemonError,
+    EntriesNotAlternatingError,
+)
+from timeclock_el_punch_clock.commands.serve import Serve
+from timeclock_el_punch_clock.paths import stats
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+from timeclock_el_punch_clock.policies import FsyncPolicy
+
+
+@pytest.fixture
+def served_log_timeclock(tmp_path: pathlib.Path) -> Iterator[pathlib.Path]:
+    path = tmp_path / "log.timeclock"
+    path.write_text("")
+    command = Serve(WriteableFilePath(path), ":", fsync_policy=FsyncPolicy.NEVER)
+    loop = asyncio.new_event_loop()
+    stop = asyncio.Event()
+    thread = threading.Thread(
+        target=loop.run_until_complete, args=(command.serve(stop),)
+    )
+    thread.start()
+    while not daemons.socket_path(path).exists():
+        thread.join(0.01)
+    try:
+        yield path
+    finally:
+        loop.call_soon_threadsafe(stop.set)
+        thread.join()
+        loop.close()
+
+
+def test_request_without_daemon_returns_none(tmp_path: pathlib.Path) -> None:
+    assert daemons.request(tmp_path / "log.timeclock", {"command": "status"}) is None
+
+
+def test_request_to_a_hanging_daemon_returns_none(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # Connections are accepted by the backlog, but never answered.
+        server.bind(str(daemons.socket_path(path)))
+        server.listen()
+
+        assert daemons.request(path, {"command": "status"}, timeout=0.01) is None
+
+
+def test_daemon_clocks_in_and_reports_status(
+    served_log_timeclock: pathlib.Path,
+) -> None:
+    message = {"command": "in", "datetime": "2024-01-01 09:00:00", "accounts": ["a"]}
+
+    assert daemons.request(served_log_timeclock, message) == {}
+    with pytest.raises(EntriesNotAlternatingError):
+        daemons.request(served_log_timeclock, message)
+
+    assert served_log_timeclock.read_text() == "i 2024-01-01 09:00:00 a\n"
+    response = daemons.request(served_log_timeclock, {"command": "status"})
+    assert response == {"last": ["i", 1704099600, ["a"]]}
+
+
+@pytest.mark.parametrize(
+    ("message", "error"),
+    (({"command": "in"}, "KeyError"), (["status"], "AttributeError")),
+)
+def test_daemon_answers_any_failure_and_serves_on(
+    served_log_timeclock: pathlib.Path, message: object, error: str
+) -> None:
+    with pytest.raises(DaemonError, match=f"^{error}: "):
+        daemons.request(served_log_timeclock, message)  # type: ignore[arg-type]
+
+    response = daemons.request(served_log_timeclock, {"command": "status"})
+    assert response == {"last": None}
+
+
+def test_daemon_sees_writes_by_other_processes(
+    served_log_timeclock: pathlib.Path,
+) -> None:
+    daemons.request(served_log_timeclock, {"command": "status"})
+    with served_log_timeclock.open(mode="a") as file:
+        file.write("i 2024-01-01 09:00:00\no 2024-01-01 10:00:00\n")
+
+    response = daemons.request(served_log_timeclock, {"command": "status"})
+
+    assert response == {"last": ["o", 1704103200]}
+
+
+def test_main_uses_running_daemon(
+    served_log_timeclock: pathlib.Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail(*args, **kwargs):
+        raise AssertionError("log was accessed directly")
+
+    monkeypatch.setattr(Arguments, "from_namespace", fail)
+    arguments = ("--file", str(served_log_timeclock))
+
+    cli.main((*arguments, "in", "--datetime", "2024-01-01 09:00:00", "INBOX"))
+    cli.main((*arguments, "status", "--datetime", "2024-01-01 10:30:00"))
+
+    assert capsys.readouterr().out == (
+        "clocked in since 2024-01-01 09:00:00 (1:30:00) on INBOX\n"
+    )
+
+
+def test_handle_does_not_reuse_stats_of_earlier_requests(
+    tmp_path: pathlib.Path,
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("")
+    command = Serve(WriteableFilePath(path), ":", fsync_policy=FsyncPolicy.NEVER)
+    assert stats.stat(path).st_size == 0
+    path.write_text("\n")
+
+    command.handle({"command": "status"})
+
+    assert stats.stat(path).st_size == 1
+
+
+def test_handle_keeps_the_writer_and_its_index_while_the_log_is_unchanged(
+    tmp_path: pathlib.Path,
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("")
+    indices.load_or_build(path)
+    command = Serve(WriteableFilePath(path), ":", fsync_policy=FsyncPolicy.NEVER)
+    message = {"command": "in", "datetime": "2024-01-01 09:00:00"}
+
+    assert command.handle(message) == {}
+    writer = command._writer
+    index = writer.index
+    assert command.handle(message)["error"] == "EntriesNotAlternatingError"
+    with path.open(mode="a") as file:
+        file.write("o 2024-01-01 10:00:00\n")
+    assert command.handle({**message, "datetime": "2024-01-01 11:00:00"}) == {}
+
+    assert command._writer is writer
+    assert writer.index is not index
+    assert indices.load(path) == indices.extend(path)
+
+
+def test_serve_refuses_a_second_daemon(served_log_timeclock: pathlib.Path) -> None:
+    command = Serve(WriteableFilePath(served_log_timeclock), ":")
+
+    with pytest.raises(FileExistsError):
+        asyncio.run(command.serve(asyncio.Event()))
@@ -0,0 +1,75 @@
+import pathlib
+
+import hypothesis
+import pytest
+
+from conftest import log_timeclocks, synthetic_log_timeclock_contents
+from timeclock_el_punch_clock.parsing import blocks, lines
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+
+def _parse_lines(path: pathlib.Path) -> list | str:
+    try:
+        with path.open(mode="r") as file:
+            return list(lines.parse_lines(file))
+    except MalformedLineError as err:
+        return str(err)
+
+
+def _parse_blocks(path: pathlib.Path, block_size: int) -> list | str:
+    try:
+        return list(blocks.iter_entries(path, block_size=block_size))
+    except MalformedLineError as err:
+        return str(err)
+
+
+@hypothesis.given(log_timeclocks(max_size=64, delimiter_value=":"))
+def test_iter_entries_equals_parse_lines(log_timeclock: pathlib.Path) -> None:
+    assert _parse_blocks(log_timeclock, 64) == _parse_lines(log_timeclock)
+
+
+@hypothesis.given(synthetic_log_timeclock_contents(max_size=256, delimiter_value=":"))
+def test_iter_entries_of_synthetic_log_timeclock_equals_parse_lines(
+    tmp_path_factory: pytest.TempPathFactory, contents: str
+) -> None:
+    path = tmp_path_factory.mktemp("blocks") / "log.timeclock"
+    path.write_text(contents)
+
+    assert _parse_blocks(path, 128) == _parse_lines(path)
+
+
+@pytest.mark.parametrize(
+    "contents",
+    (
+        "",
+        "\n\n",
+        "i 2024-01-01 09:00:00 client\no 2024-01-01 10:00:00",
+        "i 2024-01-01 09:00:00 client\r\no 2024-01-01 10:00:00\r\n",
+        "i 2024-01-01 09:00:00\no 2024-01-01 10:00:00 \t\n",
+        "i 2024-02-29 09:00:00 \n* 2024\n** notes\n\t\no 0001-01-01 00:00:00\n",
+        "* 2024\ni 2024-01-01 09:00:00 client\no 2024-01-01 10:00:00\n" * 8
+        + "o 2023-02-29 10:00:00\n",
+        "* 2024\n" * 16 + "i 2024-01-01 24:00:00 client\n",
+        "i 2024-01-01 09:00:00 client\n" * 16 + "i 2024-01-01 09:00:00client\n",
+        "i 2024-01-01 09:00:00 client\n" * 16 + "o 2024-01-01 10:00:00 client\n",
+        "i 2024-01-01 09:00:00 client\n" * 16 + "x 2024-01-01 09:00:00\n",
+        "o 2024-01-01 10:00:00\n" * 16 + "o 2024-01-01 10:60:00",
+    ),
+)
+@pytest.mark.parametrize("block_size", (1, 32, blocks.DEFAULT_BLOCK_SIZE))
+def test_iter_entries_of_odd_lines_equals_parse_lines(
+    tmp_path: pathlib.Path, contents: str, block_size: int
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_bytes(contents.encode())
+
+    assert _parse_blocks(path, block_size) == _parse_lines(path)
+
+
+def test_iter_entries_with_offset_starts_at_the_offset(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("* 2024\ni 2024-01-01 09:00:00 client\n")
+
+    assert list(blocks.iter_entries(path, offset=7)) == list(
+        lines.parse_lines(["i 2024-01-01 09:00:00 client\n"])
+    )
@@ -0,0 +1,112 @@
+import datetime
+import pathlib
+
+import hypothesis
+import pytest
+
+from conftest import log_timeclock_contents
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.parsing.entries import (
+    BLANK,
+    ClockInEntry,
+    ClockOutEntry,
+    HeadingEntry,
+)
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+_unix_epoch = datetime.datetime(1970, 1, 1, 0, 0, 0)
+
+
+def test_iter_entries_with_empty_log_timeclock_yields_nothing(
+    empty_log_timeclock: pathlib.Path,
+) -> None:
+    assert list(lines.iter_entries(empty_log_timeclock)) == []
+
+
+def test_iter_entries_with_clocked_in_log_timeclock_yields_entries(
+    clocked_in_log_timeclock: pathlib.Path,
+) -> None:
+    expected = [
+        HeadingEntry(1, "1970"),
+        BLANK,
+        HeadingEntry(1, "1970-01"),
+        BLANK,
+        HeadingEntry(3, "1970-01-01"),
+        BLANK,
+        ClockInEntry(0, (Account("unix-epoch"), Account("start"))),
+        ClockOutEntry(0),
+        ClockInEntry(60, (Account("party"), Account("new-year"))),
+    ]
+
+    actual = list(lines.iter_entries(clocked_in_log_timeclock))
+
+    assert actual == expected
+
+
+def test_parse_lines_interns_accounts() -> None:
+    entries = list(
+        lines.parse_lines(
+            (
+                "i 1970-01-01 00:00:00 INBOX:meeting\n",
+                "o 1970-01-01 00:01:00\n",
+                "i 1970-01-01 00:02:00 INBOX:meeting\n",
+            )
+        )
+    )
+
+    assert entries[0].accounts is entries[2].accounts
+
+
+@pytest.mark.parametrize(
+    "line",
+    (
+        "x 1970-01-01 00:00:00\n",
+        "i 1970-13-01 00:00:00\n",
+        "i 1970-01-01 24:00:00\n",
+        "i 1970-01-01 00-00-00\n",
+        "i 1970-01-01 +0:00:00\n",
+        "i 1970-01-01 00:00:00INBOX\n",
+        "o 1970-01-01 00:00:00 INBOX\n",
+    ),
+)
+def test_parse_lines_with_malformed_line_raises_malformed_line_error(
+    line: str,
+) -> None:
+    with pytest.raises(MalformedLineError):
+        list(lines.parse_lines((line,)))
+
+
+@hypothesis.given(log_timeclock_contents(max_size=64))
+def test_parse_lines_yields_timestamps_in_seconds_since_unix_epoch(
+    log_timeclock_content: str,
+) -> None:
+    expected = [
+        int(
+            (
+                datetime.datetime.strptime(line[2:21], "%Y-%m-%d %H:%M:%S")
+                - _unix_epoch
+            ).total_seconds()
+        )
+        for line in log_timeclock_content.splitlines()
+    ]
+
+    actual = [
+        entry.timestamp
+        for entry in lines.parse_lines(log_timeclock_content.splitlines())
+    ]
+
+    assert actual == expected
+
+
+@hypothesis.given(log_timeclock_contents(max_size=64))
+def test_parse_lines_alternates_clock_in_and_clock_out_entries(
+    log_timeclock_content: str,
+) -> None:
+    kinds = [
+        type(entry) for entry in lines.parse_lines(log_timeclock_content.splitlines())
+    ]
+
+    assert kinds == [ClockInEntry, ClockOutEntry] * (len(kinds) // 2) + [
+        ClockInEntry
+    ] * (len(kinds) % 2)
@@ -0,0 +1,74 @@
+import itertools
+import pathlib
+
+import hypothesis
+import pytest
+
+from conftest import log_timeclocks, synthetic_log_timeclock_contents
+from timeclock_el_punch_clock.parsing import backends, lines, mmaps
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+
+def test_iter_entries_with_empty_log_timeclock_yields_nothing(
+    empty_log_timeclock: pathlib.Path,
+) -> None:
+    assert list(mmaps.iter_entries(empty_log_timeclock)) == []
+
+
+def test_iter_entries_with_clocked_in_log_timeclock_equals_lines_backend(
+    clocked_in_log_timeclock: pathlib.Path,
+) -> None:
+    expected = list(lines.iter_entries(clocked_in_log_timeclock))
+
+    actual = list(mmaps.iter_entries(clocked_in_log_timeclock))
+
+    assert actual == expected
+
+
+def test_iter_entries_with_offset_equals_lines_backend(
+    clocked_in_log_timeclock: pathlib.Path,
+) -> None:
+    offset = clocked_in_log_timeclock.read_text().index("i ")
+    expected = list(lines.iter_entries(clocked_in_log_timeclock, offset=offset))
+
+    actual = list(mmaps.iter_entries(clocked_in_log_timeclock, offset=offset))
+
+    assert actual == expected
+
+
+def test_parse_buffer_with_malformed_line_raises_malformed_line_error_with_line_number() -> (
+    None
+):
+    buffer = b"i 1970-01-01 00:00:00\no 1970-01-01 00:00:00 INBOX\n"
+
+    with pytest.raises(MalformedLineError, match="line 2"):
+        list(mmaps.parse_buffer(buffer))
+
+
+@hypothesis.given(log_timeclocks(max_size=64, delimiter_value=":"))
+def test_iter_entries_equals_lines_backend(log_timeclock: pathlib.Path) -> None:
+    expected = list(
+        backends.iter_entries(log_timeclock, backend=backends.Backend.LINES)
+    )
+
+    actual = list(backends.iter_entries(log_timeclock, backend=backends.Backend.MMAP))
+
+    assert actual == expected
+
+
+@hypothesis.given(synthetic_log_timeclock_contents(max_size=256, delimiter_value=":"))
+def test_parse_buffer_with_synthetic_log_timeclock_alternates_clock_in_and_out(
+    contents: str,
+) -> None:
+    expected = list(lines.parse_lines(contents.splitlines(keepends=True)))
+
+    actual = list(mmaps.parse_buffer(contents.encode()))
+
+    clocks = [
+        entry for entry in actual if isinstance(entry, (ClockInEntry, ClockOutEntry))
+    ]
+    assert actual == expected
+    assert all(isinstance(entry, ClockInEntry) for entry in clocks[0::2])
+    assert all(isinstance(entry, ClockOutEntry) for entry in clocks[1::2])
+    assert all(a.timestamp <= b.timestamp for a, b in itertools.pairwise(clocks))
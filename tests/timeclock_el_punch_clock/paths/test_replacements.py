@@ -0,0 +1,51 @@
+import os
+import pathlib
+import threading
+
+import pytest
+
+from timeclock_el_punch_clock.paths import replacements
+
+
+def test_replace_keeps_the_mode_of_the_target(tmp_path: pathlib.Path) -> None:
+    target = tmp_path / "log.timeclock.state"
+    target.write_bytes(b"old")
+    target.chmod(0o600)
+
+    replacements.replace(target, b"new")
+
+    assert target.read_bytes() == b"new"
+    assert target.stat().st_mode & 0o777 == 0o600
+    assert os.listdir(tmp_path) == [target.name]
+
+
+def test_replace_with_failing_write_leaves_no_temporary_file(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    target = tmp_path / "log.timeclock.state"
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+
+    with pytest.raises(OSError):
+        replacements.replace(target, b"new")
+    assert os.listdir(tmp_path) == []
+
+
+def test_concurrent_replaces_each_write_a_whole_target(tmp_path: pathlib.Path) -> None:
+    target = tmp_path / "log.timeclock.state"
+    contents = [bytes([byte]) * 2**16 for byte in range(8)]
+
+    threads = [
+        threading.Thread(target=replacements.replace, args=(target, data))
+        for data in contents
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert target.read_bytes() in contents
+    assert os.listdir(tmp_path) == [target.name]
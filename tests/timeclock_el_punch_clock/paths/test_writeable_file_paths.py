@@ -0,0 +1,109 @@
+import argparse
+import os
+import pathlib
+
+import pytest
+
+from timeclock_el_punch_clock.arguments import Arguments
+from timeclock_el_punch_clock.paths import stats, writeable_file_paths
+from timeclock_el_punch_clock.paths.errors import PathDoesNotExist, PathNotAFileError
+
+_contents = "i 1970-01-01 09:00:00 INBOX\n"
+
+pytestmark = pytest.mark.log_timeclock(_contents)
+
+
+@pytest.fixture
+def log_timeclock(log_timeclock: pathlib.Path) -> pathlib.Path:
+    os.utime(log_timeclock, ns=(1_000_000_000, 1_000_000_000))
+    stats.clear()
+    return log_timeclock
+
+
+def test_from_path_leaves_contents_and_mtime_untouched(
+    log_timeclock: pathlib.Path,
+) -> None:
+    writeable_file_paths.from_path(log_timeclock)
+
+    assert log_timeclock.read_text() == _contents
+    assert log_timeclock.stat().st_mtime_ns == 1_000_000_000
+
+
+def test_from_namespace_leaves_contents_and_mtime_untouched(
+    log_timeclock: pathlib.Path,
+) -> None:
+    Arguments.from_namespace(argparse.Namespace(file=log_timeclock))
+
+    assert log_timeclock.read_text() == _contents
+    assert log_timeclock.stat().st_mtime_ns == 1_000_000_000
+
+
+def test_from_path_stats_path_once(
+    log_timeclock: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = []
+    original = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        calls.append(path)
+        return original(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", counting_stat)
+
+    writeable_file_paths.from_path(log_timeclock)
+    writeable_file_paths.from_path(log_timeclock)
+
+    assert calls == [log_timeclock]
+
+
+def test_from_path_with_missing_path_raises_path_does_not_exist(
+    tmp_path: pathlib.Path,
+) -> None:
+    with pytest.raises(PathDoesNotExist):
+        writeable_file_paths.from_path(tmp_path / "missing.timeclock")
+
+
+def test_from_path_with_directory_raises_path_not_a_file(
+    tmp_path: pathlib.Path,
+) -> None:
+    with pytest.raises(PathNotAFileError):
+        writeable_file_paths.from_path(tmp_path)
+
+
+def test_path_cache_validates_once_until_the_file_is_replaced(
+    log_timeclock: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = []
+    original = writeable_file_paths.from_path
+
+    def counting_from_path(path):
+        calls.append(path)
+        return original(path)
+
+    monkeypatch.setattr(writeable_file_paths, "from_path", counting_from_path)
+    cache = writeable_file_paths.PathCache()
+
+    cache.from_path(log_timeclock)
+    stats.clear()
+    with log_timeclock.open(mode="a") as file:
+        file.write("o 1970-01-01 10:00:00\n")
+    cache.from_path(log_timeclock)
+    stats.clear()
+    replacement = log_timeclock.with_name("replacement.timeclock")
+    replacement.write_text(_contents)
+    replacement.replace(log_timeclock)
+    cache.from_path(log_timeclock)
+
+    assert calls == [log_timeclock, log_timeclock]
+
+
+def test_path_cache_with_removed_path_raises_path_does_not_exist(
+    log_timeclock: pathlib.Path,
+) -> None:
+    cache = writeable_file_paths.PathCache()
+    cache.from_path(log_timeclock)
+    stats.clear()
+    log_timeclock.unlink()
+
+    with pytest.raises(PathDoesNotExist):
+        cache.from_path(log_timeclock)
@@ -0,0 +1,135 @@
+import fcntl
+import multiprocessing
+import os
+import pathlib
+from unittest import mock
+
+import pytest
+
+from conftest import toggle_clock
+from timeclock_el_punch_clock import appends, indices
+from timeclock_el_punch_clock.policies import FsyncPolicy
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+
+
+def test_append_writes_rendered_bytes(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 1970-01-01 00:00:00\n")
+
+    end = appends.append(path, lambda: b"o 1970-01-01 00:01:00\n")
+
+    assert path.read_text() == "i 1970-01-01 00:00:00\no 1970-01-01 00:01:00\n"
+    assert end == 44
+    assert appends.append(path, lambda: b"") is None
+
+
+def test_append_with_index_reloads_it_only_once_the_log_changed(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("* 1970\n")
+    indices.load_or_build(path)
+    loads = []
+    load_tail = indices.load_tail
+
+    def record_load_tail(path: pathlib.Path) -> indices.Index | None:
+        loads.append(path)
+        return load_tail(path)
+
+    monkeypatch.setattr(indices, "load_tail", record_load_tail)
+
+    _, index = appends.append_with_index(path, lambda: b"i 1970-01-01 00:00:00\n", None)
+    _, index = appends.append_with_index(
+        path, lambda: b"o 1970-01-01 00:01:00\n", index
+    )
+    with path.open(mode="a") as file:
+        file.write("** 1970-01\n")
+    appends.append_with_index(path, lambda: b"i 1970-01-01 00:02:00\n", index)
+
+    assert len(loads) == 2
+    assert indices.load(path) == indices.extend(path)
+
+
+def test_append_undoes_an_interrupted_repair_first(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 1970-01-01 00:00:00\n")
+    appends.journal_path(path).write_bytes(b"22\no 1970-01-01 00:01:00\n")
+
+    appends.append(path, lambda: b"i 1970-01-01 00:02:00\n")
+
+    assert path.read_text() == (
+        "i 1970-01-01 00:00:00\no 1970-01-01 00:01:00\ni 1970-01-01 00:02:00\n"
+    )
+    assert not appends.journal_path(path).exists()
+
+
+def test_append_renders_while_holding_lock(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.touch()
+
+    def render() -> bytes:
+        with path.open(mode="rb") as file:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return b""
+
+    appends.append(path, render)
+
+
+def test_append_with_failing_render_writes_nothing(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 1970-01-01 00:00:00\n")
+
+    def render() -> bytes:
+        raise ValueError("rejected")
+
+    with pytest.raises(ValueError):
+        appends.append(path, render)
+    assert path.read_text() == "i 1970-01-01 00:00:00\n"
+
+
+@pytest.mark.parametrize(
+    ("fsync_policy", "expected"),
+    ((FsyncPolicy.ALWAYS, 3), (FsyncPolicy.BATCHED, 1), (FsyncPolicy.NEVER, 0)),
+)
+def test_append_fsyncs_according_to_policy(
+    tmp_path: pathlib.Path, fsync_policy: FsyncPolicy, expected: int
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.touch()
+
+    with mock.patch.object(os, "fsync") as fsync:
+        for _ in range(3):
+            appends.append(path, lambda: b"\n", fsync_policy=fsync_policy)
+
+    assert fsync.call_count == expected
+
+
+def test_sync_unsynced_fsyncs_batched_appends(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.touch()
+    appends.sync_unsynced()
+    appends.append(path, lambda: b"\n", fsync_policy=FsyncPolicy.BATCHED)
+
+    with mock.patch.object(os, "fsync") as fsync:
+        appends.append(path, lambda: b"\n", fsync_policy=FsyncPolicy.BATCHED)
+        appends.sync_unsynced()
+
+    assert fsync.call_count == 1
+
+
+def test_append_from_concurrent_processes_neither_interleaves_nor_loses_lines(
+    tmp_path: pathlib.Path,
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.touch()
+    processes, count = 4, 25
+
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        pool.starmap(toggle_clock, ((path, count),) * processes)
+
+    entries = list(lines.iter_entries(path))
+    assert len(entries) == processes * count
+    assert entries[0::2] == [e for e in entries if isinstance(e, ClockInEntry)]
+    assert entries[1::2] == [e for e in entries if isinstance(e, ClockOutEntry)]
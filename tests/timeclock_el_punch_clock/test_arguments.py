@@ -9,6 +9,7 @@ from unittest import mock
 import pytest
 
 from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.policies import FsyncPolicy
 from timeclock_el_punch_clock.paths import writeable_file_paths
 from timeclock_el_punch_clock.arguments import Arguments
 from timeclock_el_punch_clock.paths.errors import (
@@ -153,3 +154,27 @@ def test_from_namespace_with_accounts_returns_command_with_accounts() -> None:
         actual = Arguments.from_namespace(namespace)
 
     assert actual == expected
+
+
+def test_from_namespace_with_fsync_returns_command_with_fsync_policy() -> None:
+    namespace = argparse.Namespace(fsync="never")
+    with (
+        tempfile.NamedTemporaryFile(mode="w") as file,
+        mock.patch.object(
+            Arguments, "default_file", return_value=pathlib.Path(file.name)
+        ),
+        mock.patch.object(
+            Arguments, "default_datetimestamp", return_value=_default_datetimestamp
+        ),
+    ):
+        expected = Arguments(
+            file=writeable_file_paths.from_path(Arguments.default_file()),
+            datetimestamp=Arguments.default_datetimestamp(),
+            accounts=Arguments.default_accounts(),
+            delimiter=Arguments.default_delimiter(),
+            fsync_policy=FsyncPolicy.NEVER,
+        )
+
+        actual = Arguments.from_namespace(namespace)
+
+    assert actual == expected
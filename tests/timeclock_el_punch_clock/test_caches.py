@@ -0,0 +1,139 @@
+import pathlib
+import tempfile
+import threading
+
+import hypothesis
+import pytest
+
+from conftest import log_timeclock_contents
+from timeclock_el_punch_clock import appends, caches, reports
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.policies import FsyncPolicy
+
+_log = (
+    "* 1970\n"
+    "i 1970-01-01 09:00:00 client:project\n"
+    "o 1970-01-01 10:00:00\n"
+    "i 1970-01-01 11:00:00\n"
+)
+
+pytestmark = pytest.mark.log_timeclock(_log)
+
+
+def _append(path: pathlib.Path, line: str) -> None:
+    appends.append(path, line.encode, fsync_policy=FsyncPolicy.NEVER)
+
+
+def test_load_builds_records_and_account_table(log_timeclock: pathlib.Path) -> None:
+    cache = caches.load(log_timeclock)
+
+    assert cache.records["epoch"].tolist() == [9 * 3600, 10 * 3600, 11 * 3600]
+    assert cache.records["kind"].tolist() == [
+        caches.CLOCK_IN,
+        caches.CLOCK_OUT,
+        caches.CLOCK_IN,
+    ]
+    assert [cache.accounts[i] for i in cache.records["account"][0::2]] == [
+        (Account("client"), Account("project")),
+        (),
+    ]
+    assert cache.records["account"][1] == caches.NO_ACCOUNT
+    assert cache.header.end == len(_log)
+
+
+def test_append_extends_existing_cache_in_step(
+    log_timeclock: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    caches.load(log_timeclock)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache was rebuilt")
+
+    monkeypatch.setattr(caches, "rebuild", fail)
+    _append(log_timeclock, "o 1970-01-01 12:00:00\n")
+    _append(log_timeclock, "i 1970-01-01 13:00:00 INBOX\n")
+
+    assert caches.load_fresh(log_timeclock) is not None
+    cache = caches.load(log_timeclock)
+    assert cache.records["epoch"][-2:].tolist() == [12 * 3600, 13 * 3600]
+    assert cache.accounts[cache.records["account"][-1]] == (Account("INBOX"),)
+
+
+def test_append_without_cache_does_not_create_it(log_timeclock: pathlib.Path) -> None:
+    _append(log_timeclock, "o 1970-01-01 12:00:00\n")
+
+    assert not caches.cache_path(log_timeclock).exists()
+
+
+def test_load_after_changed_prefix_rebuilds(log_timeclock: pathlib.Path) -> None:
+    caches.load(log_timeclock)
+    log_timeclock.write_text(_log.replace("09:00:00", "08:00:00") + "\n")
+
+    cache = caches.load(log_timeclock)
+
+    assert cache.records["epoch"][0] == 8 * 3600
+
+
+def test_load_after_external_append_extends(log_timeclock: pathlib.Path) -> None:
+    caches.load(log_timeclock)
+    with log_timeclock.open(mode="a") as file:
+        file.write("o 1970-01-01 12:00:00\n")
+
+    cache = caches.load(log_timeclock)
+
+    assert cache.header.count == 4
+    assert cache.header.end == log_timeclock.stat().st_size
+
+
+def test_load_writes_a_stale_cache_only_under_the_lock_of_appends(
+    log_timeclock: pathlib.Path,
+) -> None:
+    caches.load(log_timeclock)
+    with appends.locked(log_timeclock):
+        fresh = threading.Thread(target=caches.load, args=(log_timeclock,))
+        fresh.start()
+        fresh.join(timeout=5)
+        with log_timeclock.open(mode="a") as file:
+            file.write("o 1970-01-01 12:00:00\n")
+        stale = threading.Thread(target=caches.load, args=(log_timeclock,))
+        stale.start()
+        stale.join(timeout=0.2)
+
+        assert not fresh.is_alive()
+        assert stale.is_alive()
+        assert caches.load_header(log_timeclock).count == 3
+    stale.join(timeout=5)
+
+    assert not stale.is_alive()
+    assert caches.load_header(log_timeclock).count == 4
+
+
+def test_load_with_truncated_account_table_rebuilds(
+    log_timeclock: pathlib.Path,
+) -> None:
+    caches.load(log_timeclock)
+    caches.accounts_path(log_timeclock).write_bytes(b"")
+
+    cache = caches.load(log_timeclock)
+
+    assert cache.accounts[cache.records["account"][0]] == (
+        Account("client"),
+        Account("project"),
+    )
+
+
+@hypothesis.given(log_timeclock_contents(delimiter_value=":", max_size=20))
+def test_from_cache_matches_from_entries(contents: str) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "log.timeclock"
+        path.write_text(contents)
+
+        cached = reports.from_cache(caches.load(path), until=2**40)
+        parsed = reports.from_entries(lines.iter_entries(path), until=2**40)
+
+        assert cached.starts.tolist() == parsed.starts.tolist()
+        assert cached.ends.tolist() == parsed.ends.tolist()
+        assert [cached.registry.path(i) for i in cached.account_ids] == [
+            parsed.registry.path(i) for i in parsed.account_ids
+        ]
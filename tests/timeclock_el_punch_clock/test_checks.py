@@ -0,0 +1,122 @@
+import pathlib
+
+import hypothesis
+import pytest
+
+from conftest import synthetic_log_timeclock_contents
+from timeclock_el_punch_clock import appends, checks, parallel
+from timeclock_el_punch_clock.checks import Kind
+
+_broken = (
+    "* 2020\n"
+    "** 2020-01\n"
+    "*** 2020-01-02\n"
+    "i 2020-01-02 09:00:00 client:project\n"
+    "o 2020-01-02 10:00:00\n"
+    "o 2020-01-02 10:30:00\n"
+    "i 2020-01-02 11:00:00 client\n"
+    "i 2020-01-02 12:00:00 INBOX\n"
+    "i 2020-01-02 1\n"
+    "o 2020-01-02 11:30:00\n"
+    "o 2020-01-02 13:00:00\n"
+    "*** 2020-02-06\n"
+    "i 2020-01-05 09:00:00 client\n"
+    "o 2020-01-05 10:00:00"
+)
+
+pytestmark = pytest.mark.log_timeclock(_broken)
+
+
+@pytest.mark.parametrize(
+    ("chunk_size", "workers"), ((parallel.DEFAULT_CHUNK_SIZE, 1), (32, 1), (32, 2))
+)
+def test_check_reports_every_problem_with_its_line(
+    log_timeclock: pathlib.Path, chunk_size: int, workers: int
+) -> None:
+    problems = checks.check(log_timeclock, workers=workers, chunk_size=chunk_size)
+
+    assert [(problem.line, problem.kind) for problem in problems] == [
+        (6, Kind.UNOPENED),
+        (8, Kind.UNCLOSED),
+        (9, Kind.MALFORMED),
+        (10, Kind.UNORDERED),
+        (11, Kind.UNOPENED),
+        (12, Kind.HEADING),
+        (13, Kind.MISFILED),
+        (14, Kind.NEWLINE),
+    ]
+
+
+def test_check_with_heading_outside_its_parent_reports_heading(
+    tmp_path: pathlib.Path,
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("* 2021\n** 2020-12\n* 2021-01\n*** notes\n")
+
+    problems = checks.check(path)
+
+    assert [(problem.line, problem.kind) for problem in problems] == [(2, Kind.HEADING)]
+
+
+def test_fix_rewrites_only_the_tail_and_keeps_heading_problems(
+    log_timeclock: pathlib.Path,
+) -> None:
+    inode = log_timeclock.stat().st_ino
+
+    problems = checks.fix(log_timeclock)
+
+    assert log_timeclock.stat().st_ino == inode
+    assert not appends.journal_path(log_timeclock).exists()
+    assert log_timeclock.read_text() == (
+        "* 2020\n"
+        "** 2020-01\n"
+        "*** 2020-01-02\n"
+        "i 2020-01-02 09:00:00 client:project\n"
+        "o 2020-01-02 10:00:00\n"
+        "i 2020-01-02 11:00:00 client\n"
+        "o 2020-01-02 12:00:00\n"
+        "i 2020-01-02 12:00:00 INBOX\n"
+        "o 2020-01-02 13:00:00\n"
+        "*** 2020-02-06\n"
+        "i 2020-01-05 09:00:00 client\n"
+        "o 2020-01-05 10:00:00\n"
+    )
+    assert [(problem.line, problem.kind) for problem in problems] == [
+        (10, Kind.HEADING),
+        (11, Kind.MISFILED),
+    ]
+    assert checks.check(log_timeclock) == problems
+
+
+def test_fix_undoes_an_interrupted_repair_first(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 2020-01-02 09:00:00 client\nrepaired\n")
+    appends.journal_path(path).write_bytes(b"29\no 2020-01-02 10:00:00\n")
+
+    problems = checks.fix(path)
+
+    assert problems == []
+    assert path.read_text() == "i 2020-01-02 09:00:00 client\no 2020-01-02 10:00:00\n"
+
+
+def test_check_undoes_an_interrupted_repair_first(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 2020-01-02 09:00:00 client\n")
+    appends.journal_path(path).write_bytes(b"29\no 2020-01-02 10:00:00\n")
+
+    problems = checks.check(path)
+
+    assert problems == []
+    assert path.read_text() == "i 2020-01-02 09:00:00 client\no 2020-01-02 10:00:00\n"
+    assert not appends.journal_path(path).exists()
+
+
+@hypothesis.settings(suppress_health_check=[hypothesis.HealthCheck.too_slow])
+@hypothesis.given(synthetic_log_timeclock_contents(max_size=256, delimiter_value=":"))
+def test_check_with_synthetic_log_timeclock_finds_no_problems(
+    tmp_path_factory: pytest.TempPathFactory, contents: str
+) -> None:
+    path = tmp_path_factory.mktemp("checks") / "log.timeclock"
+    path.write_text(contents)
+
+    assert checks.check(path, chunk_size=256) == []
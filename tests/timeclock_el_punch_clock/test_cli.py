@@ -0,0 +1,290 @@
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+import timeclock_el_punch_clock.cli as cli
+import timeclock_el_punch_clock.contracts as contracts
+import timeclock_el_punch_clock.profiles as profiles
+import timeclock_el_punch_clock.tails as tails
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.contracts import ContractsMode
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry
+from timeclock_el_punch_clock.writers.sqlites import SqliteWriter
+
+
+def test_main_in_appends_clock_in_line(tmp_path: pathlib.Path) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text("")
+
+    cli.main(
+        (
+            "--file",
+            str(log_timeclock),
+            "--fsync",
+            "never",
+            "in",
+            "--datetime",
+            "2024-01-01 09:00:00",
+            "INBOX",
+            "meeting",
+        )
+    )
+
+    assert log_timeclock.read_text() == "i 2024-01-01 09:00:00 INBOX:meeting\n"
+
+
+def test_main_help_does_not_import_commands() -> None:
+    completed = subprocess.run(
+        (
+            sys.executable,
+            "-c",
+            "import sys; import timeclock_el_punch_clock.cli as cli\n"
+            "try:\n    cli.main(('--help',))\nexcept SystemExit:\n    pass\n"
+            "print('deal' in sys.modules, 'typing' in sys.modules)",
+        ),
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    assert completed.stdout.splitlines()[-1] == "False False"
+
+
+def test_main_with_contracts_off_skips_ensure(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text("")
+    monkeypatch.setenv(contracts.MODE_VARIABLE, "off")
+    monkeypatch.setattr(tails, "read_last_line", lambda *args, **kwargs: None)
+
+    try:
+        cli.main(("--file", str(log_timeclock), "--fsync", "never", "in"))
+    finally:
+        contracts.configure(ContractsMode.ON)
+
+    assert log_timeclock.read_text().startswith("i ")
+
+
+def test_main_report_prints_totals_by_account(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(
+        "i 2024-01-01 09:00:00 client:project\n"
+        "o 2024-01-01 10:30:00\n"
+        "i 2024-01-01 11:00:00 INBOX\n"
+        "o 2024-01-01 11:15:00\n"
+    )
+
+    cli.main(("--file", str(log_timeclock), "report"))
+
+    assert capsys.readouterr().out == (
+        "0:15:00  INBOX\n1:30:00  client\n1:30:00  client:project\n"
+    )
+
+
+def test_main_report_with_timezone_prints_totals_by_day_of_the_zone(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text("i 2024-03-31 01:30:00 client\no 2024-03-31 03:30:00\n")
+    arguments = ("--file", str(log_timeclock), "report", "--period", "day")
+
+    cli.main((*arguments, "--timezone", "Europe/Vienna"))
+    cli.main(arguments)
+
+    assert capsys.readouterr().out == "1:00:00  2024-03-31\n2:00:00  2024-03-31\n"
+
+
+def test_main_status_prints_clocked_in_state(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text("")
+    arguments = ("--file", str(log_timeclock), "--fsync", "never")
+
+    cli.main((*arguments, "status"))
+    cli.main((*arguments, "in", "--datetime", "2024-01-01 09:00:00", "INBOX"))
+    cli.main((*arguments, "status", "--datetime", "2024-01-01 10:30:00"))
+
+    assert capsys.readouterr().out == (
+        "no entries\nclocked in since 2024-01-01 09:00:00 (1:30:00) on INBOX\n"
+    )
+
+
+def test_main_compact_prints_segments_and_keeps_report(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(
+        "i 2023-01-01 09:00:00 client\n"
+        "o 2023-01-01 10:30:00\n"
+        "i 2024-01-01 11:00:00 client\n"
+        "o 2024-01-01 11:15:00\n"
+    )
+
+    cli.main(("--file", str(log_timeclock), "compact", "--compression", "lzma"))
+    cli.main(("--file", str(log_timeclock), "report"))
+
+    assert capsys.readouterr().out == (
+        f"2023  {tmp_path / 'log.timeclock.segments' / '2023.timeclock.xz'}\n"
+        "1:45:00  client\n"
+    )
+
+
+def test_main_in_with_mirror_writes_to_sqlite_and_closes_it(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    log_timeclock, database = tmp_path / "log.timeclock", tmp_path / "log.sqlite"
+    log_timeclock.write_text("")
+    closed = []
+    close = SqliteWriter.close
+
+    def record_close(writer: SqliteWriter) -> None:
+        closed.append(writer.path)
+        close(writer)
+
+    monkeypatch.setattr(SqliteWriter, "close", record_close)
+
+    cli.main(
+        (
+            "--file",
+            str(log_timeclock),
+            "--fsync",
+            "never",
+            "in",
+            "--mirror",
+            str(database),
+            "--datetime",
+            "1970-01-01 00:01:00",
+            "INBOX",
+        )
+    )
+
+    assert closed == [database]
+    writer = SqliteWriter(database)
+    assert writer.last() == ClockInEntry(60, (Account("INBOX"),))
+    writer.close()
+
+
+def test_main_query_prints_matching_sessions(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(
+        "i 2024-01-01 09:00:00 client:project\n"
+        "o 2024-01-01 14:00:00\n"
+        "i 2024-01-02 09:00:00 client:project\n"
+        "o 2024-01-02 10:00:00\n"
+        "i 2024-01-03 09:00:00 INBOX\n"
+    )
+
+    cli.main(
+        (
+            "--file",
+            str(log_timeclock),
+            "query",
+            "--account",
+            "client:*",
+            "--longer-than",
+            "4h",
+            "--since",
+            "2024-01-01",
+        )
+    )
+
+    assert capsys.readouterr().out == (
+        "2024-01-01 09:00:00  2024-01-01 14:00:00    5:00:00  client:project\n"
+    )
+
+
+def test_main_check_with_fix_prints_remaining_problems_and_exits_with_one(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(
+        "*** 2024-01-02\n"
+        "i 2024-01-01 09:00:00 client\n"
+        "o 2024-01-01 10:30:00\n"
+        "o 2024-01-01 10:45:00\n"
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(("--file", str(log_timeclock), "check", "--fix"))
+
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().out == (
+        f"{log_timeclock}:2: misfiled: clock in at 2024-01-01 09:00:00"
+        " is before heading '2024-01-02'\n"
+    )
+    assert log_timeclock.read_text().endswith("o 2024-01-01 10:30:00\n")
+
+
+def test_main_check_passes_after_clocking_in_on_a_day_without_heading(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(
+        "*** 2024-01-02\ni 2024-01-02 09:00:00 client\no 2024-01-02 17:00:00\n"
+    )
+    arguments = ("--file", str(log_timeclock), "--fsync", "never")
+
+    cli.main((*arguments, "in", "--datetime", "2024-01-03 09:00:00", "client:acme"))
+    cli.main((*arguments, "check"))
+
+    assert capsys.readouterr().out == ""
+
+
+def test_main_with_explicit_contracts_interval_overrides_the_environment(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text("")
+    monkeypatch.setenv(contracts.INTERVAL_VARIABLE, "0")
+    configured = []
+    monkeypatch.setattr(
+        contracts, "configure", lambda mode, interval: configured.append(interval)
+    )
+
+    cli.main(("--file", str(log_timeclock), "--contracts-interval", "3", "status"))
+
+    assert configured == [3]
+
+
+@pytest.mark.parametrize(
+    ("arguments", "environ", "message"),
+    (
+        (("--contracts-interval", "0", "status"), {}, "--contracts-interval"),
+        (("--contracts-interval", "-1", "status"), {}, "--contracts-interval"),
+        (("report", "--workers", "0"), {}, "--workers"),
+        (("check", "--workers", "-2"), {}, "--workers"),
+        (("query", "--limit", "-1"), {}, "--limit"),
+        (("watch", "--poll", "0"), {}, "--poll"),
+        (("watch", "--poll", "-1"), {}, "--poll"),
+        (("watch", "--poll", "nan"), {}, "--poll"),
+        (("status",), {contracts.MODE_VARIABLE: "sometimes"}, contracts.MODE_VARIABLE),
+        (("status",), {contracts.INTERVAL_VARIABLE: "x"}, contracts.INTERVAL_VARIABLE),
+        (("status",), {profiles.MODE_VARIABLE: "perf"}, profiles.MODE_VARIABLE),
+    ),
+)
+def test_main_with_bad_option_or_variable_exits_with_usage_error(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    arguments: tuple[str, ...],
+    environ: dict[str, str],
+    message: str,
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text("")
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(("--file", str(log_timeclock), *arguments))
+
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
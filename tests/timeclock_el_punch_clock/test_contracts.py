@@ -0,0 +1,92 @@
+import deal
+import pytest
+
+import timeclock_el_punch_clock.contracts as contracts
+from timeclock_el_punch_clock.contracts import ContractsMode
+
+
+@deal.pre(lambda number: number > 0)
+def _positive(number: int) -> int:
+    return number
+
+
+@pytest.fixture(autouse=True)
+def reset_contracts():
+    yield
+    contracts.configure(ContractsMode.ON)
+
+
+def test_configure_on_checks_contracts() -> None:
+    contracts.configure(ContractsMode.ON)
+
+    with pytest.raises(deal.PreContractError), contracts.sampled():
+        _positive(-1)
+
+
+def test_configure_off_skips_contracts() -> None:
+    contracts.configure(ContractsMode.OFF)
+
+    with contracts.sampled() as checked:
+        assert _positive(-1) == -1
+    assert not checked
+
+
+def test_contracts_decorated_while_off_are_left_bare() -> None:
+    def positive(number: int) -> int:
+        return number
+
+    contracts.configure(ContractsMode.OFF)
+    assert contracts.pre(lambda number: number > 0)(positive) is positive
+
+    contracts.configure(ContractsMode.ON)
+    with pytest.raises(deal.PreContractError):
+        contracts.pre(lambda number: number > 0)(positive)(-1)
+
+
+def test_configure_sampled_checks_every_nth_call() -> None:
+    contracts.configure(ContractsMode.SAMPLED, interval=4)
+
+    checks = []
+    for _ in range(12):
+        with contracts.sampled() as checked:
+            try:
+                _positive(-1)
+            except deal.PreContractError:
+                checks.append(True)
+            else:
+                checks.append(False)
+        assert checks[-1] == checked
+    assert checks.count(True) == 3
+    assert _positive(-1) == -1
+
+
+def test_configure_with_non_positive_interval_raises_value_error() -> None:
+    with pytest.raises(ValueError):
+        contracts.configure(ContractsMode.SAMPLED, interval=0)
+
+
+def test_from_environment_defaults() -> None:
+    assert contracts.mode_from_environment({}) == ContractsMode.ON
+    assert contracts.interval_from_environment({}) == (
+        contracts.DEFAULT_SAMPLE_INTERVAL
+    )
+
+
+def test_from_environment_reads_variables() -> None:
+    environ = {contracts.MODE_VARIABLE: "sampled", contracts.INTERVAL_VARIABLE: "7"}
+
+    assert contracts.mode_from_environment(environ) == ContractsMode.SAMPLED
+    assert contracts.interval_from_environment(environ) == 7
+
+
+@pytest.mark.parametrize(
+    ("environ", "read"),
+    (
+        ({contracts.MODE_VARIABLE: "sometimes"}, contracts.mode_from_environment),
+        ({contracts.INTERVAL_VARIABLE: "0"}, contracts.interval_from_environment),
+        ({contracts.INTERVAL_VARIABLE: "-3"}, contracts.interval_from_environment),
+    ),
+)
+def test_from_environment_with_bad_value_names_the_variable(environ, read) -> None:
+    with pytest.raises(ValueError, match=next(iter(environ))):
+        read(environ)
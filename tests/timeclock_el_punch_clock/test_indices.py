@@ -0,0 +1,157 @@
+import datetime
+import os
+import pathlib
+from unittest import mock
+
+import hypothesis
+import hypothesis.strategies
+
+from conftest import log_timeclocks
+from timeclock_el_punch_clock import indices
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.commands.clock_in import ClockIn
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.paths.writeable_file_paths import WriteableFilePath
+
+_log_timeclock_contents = """* 1970
+** 1970-01
+*** 1970-01-01
+i 1970-01-01 09:00:00 INBOX
+o 1970-01-01 17:00:00
+*** 1970-01-02
+i 1970-01-02 09:00:00 INBOX
+o 1970-01-02 17:00:00
+** 1970-02
+*** 1970-02-01
+i 1970-02-01 09:00:00 INBOX
+o 1970-02-01 17:00:00
+"""
+
+
+def _timestamp(*args: int) -> int:
+    return int(
+        (datetime.datetime(*args) - datetime.datetime(1970, 1, 1)).total_seconds()
+    )
+
+
+def test_load_or_build_writes_index_beside_log_timeclock(
+    tmp_path: pathlib.Path,
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(_log_timeclock_contents)
+
+    index = indices.load_or_build(log_timeclock)
+
+    assert indices.index_path(log_timeclock).is_file()
+    assert indices.load(log_timeclock) == index
+
+
+def test_seek_returns_offset_of_day_heading(tmp_path: pathlib.Path) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(_log_timeclock_contents)
+    index = indices.load_or_build(log_timeclock)
+
+    offset = index.seek(_timestamp(1970, 1, 2))
+
+    assert offset == _log_timeclock_contents.index("*** 1970-01-02")
+
+
+def test_seek_within_day_returns_offset_of_day_heading(tmp_path: pathlib.Path) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(_log_timeclock_contents)
+    index = indices.load_or_build(log_timeclock)
+
+    offset = index.seek(_timestamp(1970, 2, 1, 12, 0, 0))
+
+    assert offset == _log_timeclock_contents.index("*** 1970-02-01")
+
+
+def test_load_with_modified_log_timeclock_returns_none(
+    tmp_path: pathlib.Path,
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(_log_timeclock_contents)
+    indices.load_or_build(log_timeclock)
+
+    with log_timeclock.open(mode="a") as file:
+        file.write("i 1970-02-02 09:00:00\n")
+
+    assert indices.load(log_timeclock) is None
+
+
+def test_load_or_build_with_modified_log_timeclock_rebuilds_index(
+    tmp_path: pathlib.Path,
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(_log_timeclock_contents)
+    indices.load_or_build(log_timeclock)
+    contents = "*** 1970-01-02\n" + _log_timeclock_contents
+    log_timeclock.write_text(contents)
+    os.utime(log_timeclock, ns=(0, 0))
+
+    index = indices.load_or_build(log_timeclock)
+
+    assert index == indices.extend(log_timeclock)
+
+
+def test_clock_in_updates_index_incrementally(
+    tmp_path: pathlib.Path,
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text(_log_timeclock_contents)
+    command = ClockIn(
+        file=WriteableFilePath(log_timeclock),
+        datetimestamp=datetime.datetime(1970, 2, 2, 9, 0, 0),
+        accounts=(Account("INBOX"),),
+        delimiter=":",
+    )
+
+    with mock.patch.object(indices, "DEFAULT_INTERVAL", 1):
+        indices.load_or_build(log_timeclock)
+        command()
+        expected = indices.extend(log_timeclock)
+
+    assert indices.load(log_timeclock) == expected
+
+
+def test_clock_in_without_index_does_not_write_index(
+    tmp_path: pathlib.Path,
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    command = ClockIn(
+        file=WriteableFilePath(log_timeclock),
+        datetimestamp=datetime.datetime(1970, 2, 2, 9, 0, 0),
+        accounts=(),
+        delimiter=":",
+    )
+
+    command()
+
+    assert not indices.index_path(log_timeclock).exists()
+
+
+@hypothesis.given(
+    log_timeclocks(max_size=64, delimiter_value=":"),
+    hypothesis.strategies.datetimes(
+        min_value=datetime.datetime(1970, 1, 1, 0, 0, 0),
+        max_value=datetime.datetime(9998, 12, 31, 23, 59, 59),
+    ),
+)
+def test_iter_entries_since_yields_every_entry_since_timestamp(
+    log_timeclock: pathlib.Path, since: datetime.datetime
+) -> None:
+    timestamp = _timestamp(
+        since.year, since.month, since.day, since.hour, since.minute, since.second
+    )
+
+    def later(entry: ClockInEntry | ClockOutEntry) -> bool:
+        return entry.timestamp >= timestamp
+
+    with mock.patch.object(indices, "DEFAULT_INTERVAL", 64):
+        expected = list(filter(later, lines.iter_entries(log_timeclock)))
+        actual = list(
+            filter(later, indices.iter_entries_since(log_timeclock, timestamp))
+        )
+
+    assert actual == expected
@@ -0,0 +1,139 @@
+import pathlib
+import tempfile
+
+import hypothesis
+import hypothesis.strategies as st
+import pytest
+
+from conftest import clock_in_lines, clock_out_lines, log_timeclock_contents
+from timeclock_el_punch_clock import parallel, reports
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+
+_until = 300 * 365 * 86400
+
+
+def _as_rows(intervals: reports.Intervals) -> list[tuple[int, int, tuple[str, ...]]]:
+    return [
+        (start, end, intervals.registry.path(node))
+        for start, end, node in zip(
+            intervals.starts.tolist(),
+            intervals.ends.tolist(),
+            intervals.account_ids.tolist(),
+        )
+    ]
+
+
+def _sequential(path: pathlib.Path) -> reports.Intervals:
+    return reports.from_entries(lines.iter_entries(path), until=_until)
+
+
+def _write(contents: str) -> pathlib.Path:
+    _, name = tempfile.mkstemp()
+    path = pathlib.Path(name)
+    path.write_text(contents)
+    return path
+
+
+@hypothesis.given(
+    log_timeclock_contents(delimiter_value=":", max_size=30),
+    st.integers(min_value=1, max_value=200),
+)
+def test_intervals_from_files_matches_sequential_parse(
+    contents: str, chunk_size: int
+) -> None:
+    path = _write(contents)
+
+    intervals = parallel.intervals_from_files(
+        (path,), until=_until, chunk_size=chunk_size
+    )
+
+    assert _as_rows(intervals) == _as_rows(_sequential(path))
+
+
+@hypothesis.given(
+    st.lists(
+        st.one_of(
+            clock_in_lines(delimiter_value=":", max_accounts_size=2),
+            clock_out_lines(),
+            st.just("\n"),
+            st.just("*** 1970-01-01\n"),
+        ),
+        max_size=20,
+    ),
+    st.integers(min_value=1, max_value=100),
+)
+def test_intervals_from_files_handles_unpaired_entries_across_chunks(
+    statements: list[str], chunk_size: int
+) -> None:
+    path = _write("".join(statements))
+
+    intervals = parallel.intervals_from_files(
+        (path,), until=_until, chunk_size=chunk_size
+    )
+
+    assert _as_rows(intervals) == _as_rows(_sequential(path))
+
+
+def test_intervals_from_files_does_not_pair_across_files(
+    tmp_path: pathlib.Path,
+) -> None:
+    first, second = tmp_path / "first.timeclock", tmp_path / "second.timeclock"
+    first.write_text("i 1970-01-01 09:00:00 a\n")
+    second.write_text("o 1970-01-01 10:00:00\ni 1970-01-01 11:00:00 b\n")
+
+    intervals = parallel.intervals_from_files(
+        (first, second), until=12 * 3600, chunk_size=8
+    )
+
+    assert sorted(_as_rows(intervals)) == [
+        (9 * 3600, 12 * 3600, ("a",)),
+        (11 * 3600, 12 * 3600, ("b",)),
+    ]
+
+
+def test_intervals_from_files_with_workers_matches_single_process(
+    tmp_path: pathlib.Path,
+) -> None:
+    paths = []
+    for number in range(4):
+        path = tmp_path / f"{number}.timeclock"
+        path.write_text(
+            "".join(
+                f"i 1970-01-{day:02d} 09:00:00 employee{number}:project\n"
+                f"o 1970-01-{day:02d} 17:00:00\n"
+                for day in range(1, 29)
+            )
+        )
+        paths.append(path)
+
+    single = parallel.intervals_from_files(paths, chunk_size=100)
+    multiple = parallel.intervals_from_files(paths, chunk_size=100, workers=2)
+
+    assert _as_rows(multiple) == _as_rows(single)
+    assert reports.totals_by_account(multiple)["employee3"] == 28 * 8 * 3600
+
+
+def test_split_aligns_chunks_to_lines(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 1970-01-01 09:00:00 a\no 1970-01-01 10:00:00\n" * 10)
+
+    chunks = parallel.split(path, chunk_size=30)
+
+    assert chunks[0].start == 0
+    assert chunks[-1].end == path.stat().st_size
+    contents = path.read_bytes()
+    for chunk in chunks:
+        assert contents[chunk.end - 1 : chunk.end] == b"\n"
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous.end == chunk.start
+
+
+def test_parse_chunk_with_malformed_line_names_byte_range(
+    tmp_path: pathlib.Path,
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 1970-01-01 09:00:00 a\nnot an entry\n")
+
+    with pytest.raises(MalformedLineError, match="bytes 0-37"):
+        parallel.intervals_from_files((path,))
@@ -0,0 +1,95 @@
+import io
+import json
+import pathlib
+import pstats
+
+import pytest
+
+import timeclock_el_punch_clock.cli as cli
+import timeclock_el_punch_clock.profiles as profiles
+from timeclock_el_punch_clock.profiles import ProfileMode
+
+
+@pytest.fixture(autouse=True)
+def reset_profiles():
+    yield
+    profiles.configure(ProfileMode.OFF)
+
+
+def test_span_when_off_records_nothing() -> None:
+    profiles.configure(ProfileMode.OFF)
+
+    with profiles.span("outer"):
+        pass
+
+    assert profiles.span("other") is profiles.span("outer")
+    assert profiles.spans() == []
+
+
+def test_spans_nest_in_start_order() -> None:
+    profiles.configure(ProfileMode.SPANS)
+
+    with profiles.span("outer"):
+        with profiles.span("inner"):
+            pass
+        with profiles.span("second"):
+            pass
+
+    assert [(span.name, span.depth) for span in profiles.spans()] == [
+        ("outer", 0),
+        ("inner", 1),
+        ("second", 1),
+    ]
+
+
+def test_profiled_spans_print_breakdown() -> None:
+    profiles.configure(ProfileMode.SPANS)
+    stream = io.StringIO()
+
+    with profiles.profiled(ProfileMode.SPANS, (), stream=stream):
+        with profiles.span("command"):
+            pass
+
+    assert stream.getvalue().endswith(" ms  command\n")
+
+
+def test_profiled_spans_append_json_lines(tmp_path: pathlib.Path) -> None:
+    output = tmp_path / "profile.jsonl"
+
+    for argv in (("in",), ("status",)):
+        profiles.configure(ProfileMode.SPANS)
+        with profiles.profiled(ProfileMode.SPANS, argv, output=output):
+            with profiles.span("command"):
+                pass
+
+    runs = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [run["argv"] for run in runs] == [["in"], ["status"]]
+    assert [span["name"] for span in runs[0]["spans"]] == ["command"]
+
+
+def test_profiled_cprofile_dumps_stats(tmp_path: pathlib.Path) -> None:
+    output = tmp_path / "ttlpc.prof"
+
+    with profiles.profiled(ProfileMode.CPROFILE, (), output=output):
+        sorted(range(100))
+
+    assert pstats.Stats(str(output)).total_calls > 0
+
+
+def test_main_with_profile_prints_phases_to_stderr(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    log_timeclock = tmp_path / "log.timeclock"
+    log_timeclock.write_text("")
+
+    cli.main(("--file", str(log_timeclock), "--fsync", "never", "--profile", "in"))
+
+    phases = [
+        line.split("  ")[-1].strip() for line in capsys.readouterr().err.splitlines()
+    ]
+    assert phases[:3] == ["argparse", "contracts.configure", "execute_in"]
+    assert {
+        "Arguments.from_namespace",
+        "writeable_file_paths.from_path",
+        "write",
+    } <= set(phases)
@@ -0,0 +1,102 @@
+import pathlib
+
+import pytest
+
+from timeclock_el_punch_clock import caches, indices, queries, segments
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import mmaps
+from timeclock_el_punch_clock.queries import Filter, Session
+
+_log = (
+    "* 2023\n"
+    "i 2023-12-30 09:00:00 client:project\n"
+    "o 2023-12-30 15:00:00\n"
+    "* 2024\n"
+    "i 2024-01-02 09:00:00 client:other\n"
+    "o 2024-01-02 10:00:00\n"
+    "i 2024-01-02 10:00:00 INBOX\n"
+    "i 2024-01-03 08:00:00 client:project\n"
+)
+_day = 86400
+_2024 = 19723 * _day
+_now = _2024 + 2 * _day + 13 * 3600
+
+pytestmark = pytest.mark.log_timeclock(_log)
+
+
+def _run(path: pathlib.Path, **filters) -> list[tuple[str, int]]:
+    return [
+        (":".join(session.accounts), session.duration)
+        for session in queries.run(path, Filter(**filters), now=_now)
+    ]
+
+
+def test_run_without_filters_lists_all_sessions(log_timeclock: pathlib.Path) -> None:
+    assert _run(log_timeclock) == [
+        ("client:project", 6 * 3600),
+        ("client:other", 3600),
+        ("INBOX", 22 * 3600),
+        ("client:project", 5 * 3600),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("filters", "expected"),
+    (
+        ({"account": "client"}, ["client:project", "client:other", "client:project"]),
+        ({"account": "client:*"}, ["client:project", "client:other", "client:project"]),
+        ({"account": "*project"}, ["client:project", "client:project"]),
+        ({"account": "cli"}, []),
+        ({"since": _2024, "until": _2024 + 2 * _day}, ["client:other", "INBOX"]),
+        ({"longer_than": 4 * 3600, "account": "client:*"}, ["client:project"] * 2),
+        ({"shorter_than": 2 * 3600}, ["client:other"]),
+        ({"limit": 1, "since": _2024}, ["client:other"]),
+    ),
+)
+def test_run_applies_every_filter(
+    log_timeclock: pathlib.Path, filters: dict, expected: list[str]
+) -> None:
+    assert [name for name, _ in _run(log_timeclock, **filters)] == expected
+
+
+@pytest.mark.parametrize("sidecar", ("index", "cache", "segments"))
+def test_run_gives_same_sessions_through_pushdown(
+    log_timeclock: pathlib.Path, sidecar: str
+) -> None:
+    expected = _run(log_timeclock, since=_2024 + _day)
+    match sidecar:
+        case "index":
+            indices.load_or_build(log_timeclock)
+        case "cache":
+            caches.load(log_timeclock)
+        case "segments":
+            segments.compact(log_timeclock)
+
+    assert _run(log_timeclock, since=_2024 + _day) == expected
+    assert _run(log_timeclock, since=_2024 - 3 * _day)[0] == (
+        "client:project",
+        6 * 3600,
+    )
+
+
+def test_run_with_limit_stops_reading_early(
+    log_timeclock: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    parsed = []
+    iter_entries = mmaps.iter_entries
+
+    def counting(*args, **kwargs):
+        for entry in iter_entries(*args, **kwargs):
+            parsed.append(entry)
+            yield entry
+
+    monkeypatch.setattr(mmaps, "iter_entries", counting)
+
+    assert list(queries.run(log_timeclock, Filter(limit=1))) == [
+        Session(
+            _2024 - 2 * _day + 9 * 3600,
+            _2024 - 2 * _day + 15 * 3600,
+            (Account("client"), Account("project")),
+        )
+    ]
+    assert len(parsed) < len(_log.splitlines())
@@ -0,0 +1,74 @@
+import hypothesis
+import hypothesis.strategies as st
+import numpy as np
+
+from timeclock_el_punch_clock.accounts import Account, into_accounts
+from timeclock_el_punch_clock.registries import ROOT, AccountRegistry
+
+_account_paths = st.lists(
+    st.lists(st.sampled_from("abc"), max_size=4).map(into_accounts).map(tuple),
+    max_size=30,
+)
+
+
+def test_intern_returns_same_id_for_same_path() -> None:
+    registry = AccountRegistry()
+
+    meeting = registry.intern(into_accounts(("INBOX", "meeting")))
+
+    assert registry.intern(into_accounts(("INBOX", "meeting"))) == meeting
+    assert registry.intern(into_accounts(("INBOX",))) == registry.parents[meeting]
+    assert registry.intern(()) == ROOT
+    assert len(registry) == 3
+
+
+def test_find_returns_none_for_unknown_path() -> None:
+    registry = AccountRegistry()
+    registry.intern(into_accounts(("INBOX", "meeting")))
+
+    assert registry.find(into_accounts(("INBOX",))) is not None
+    assert registry.find(into_accounts(("INBOX", "mail"))) is None
+
+
+def test_name_joins_path_with_delimiter() -> None:
+    registry = AccountRegistry()
+
+    node = registry.intern(into_accounts(("client", "project", "development")))
+
+    assert registry.name(node, delimiter="/") == "client/project/development"
+
+
+@hypothesis.given(_account_paths)
+def test_rollup_matches_prefix_scan(paths: list[tuple[Account, ...]]) -> None:
+    registry = AccountRegistry()
+    nodes = [registry.intern(path) for path in paths]
+    values = np.zeros(len(registry), dtype=np.int64)
+    for value, node in enumerate(nodes, 1):
+        values[node] += value
+
+    rolled = registry.rollup(values)
+
+    for node in range(len(registry)):
+        prefix = registry.path(node)
+        expected = sum(
+            value
+            for value, path in enumerate(paths, 1)
+            if path[: len(prefix)] == prefix
+        )
+        assert rolled[node] == expected
+
+
+@hypothesis.given(_account_paths, st.lists(st.sampled_from("abc"), max_size=3))
+def test_subtree_marks_descendants(
+    paths: list[tuple[Account, ...]], prefix: list[str]
+) -> None:
+    registry = AccountRegistry()
+    for path in paths:
+        registry.intern(path)
+    node = registry.find(into_accounts(prefix))
+    hypothesis.assume(node is not None)
+
+    mask = registry.subtree(node)
+
+    for other in range(len(registry)):
+        assert mask[other] == (registry.path(other)[: len(prefix)] == tuple(prefix))
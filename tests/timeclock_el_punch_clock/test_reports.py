@@ -0,0 +1,164 @@
+import hypothesis
+import hypothesis.strategies as st
+import numpy as np
+
+from timeclock_el_punch_clock import reports, timestamps
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing.entries import (
+    BLANK,
+    ClockInEntry,
+    ClockOutEntry,
+    HeadingEntry,
+)
+from timeclock_el_punch_clock.registries import AccountRegistry
+from timeclock_el_punch_clock.reports import Period
+
+
+def _epoch(text: str) -> int:
+    return timestamps.parse_epoch(text)
+
+
+_client_project = (Account("client"), Account("project"))
+_client_meeting = (Account("client"), Account("meeting"))
+
+_entries = (
+    HeadingEntry(1, "1970"),
+    ClockInEntry(_epoch("1970-01-01 09:00:00"), _client_project),
+    ClockOutEntry(_epoch("1970-01-01 10:30:00")),
+    BLANK,
+    ClockInEntry(_epoch("1970-01-01 22:00:00"), _client_meeting),
+    ClockOutEntry(_epoch("1970-01-02 02:00:00")),
+    ClockInEntry(_epoch("1970-02-02 09:00:00"), (Account("INBOX"),)),
+)
+
+
+def test_from_entries_pairs_clock_in_with_clock_out_and_closes_at_until() -> None:
+    intervals = reports.from_entries(_entries, until=_epoch("1970-02-02 10:00:00"))
+
+    assert intervals.starts.tolist() == [
+        _epoch("1970-01-01 09:00:00"),
+        _epoch("1970-01-01 22:00:00"),
+        _epoch("1970-02-02 09:00:00"),
+    ]
+    assert intervals.ends.tolist() == [
+        _epoch("1970-01-01 10:30:00"),
+        _epoch("1970-01-02 02:00:00"),
+        _epoch("1970-02-02 10:00:00"),
+    ]
+    assert [intervals.registry.path(i) for i in intervals.account_ids] == [
+        _client_project,
+        _client_meeting,
+        (Account("INBOX"),),
+    ]
+
+
+def test_from_entries_without_until_drops_open_interval() -> None:
+    assert len(reports.from_entries(_entries)) == 2
+
+
+def test_totals_by_account_rolls_up_prefixes() -> None:
+    intervals = reports.from_entries(_entries, until=_epoch("1970-02-02 10:00:00"))
+
+    assert reports.totals_by_account(intervals, delimiter=":") == {
+        "INBOX": 3600,
+        "client": 5 * 3600 + 1800,
+        "client:meeting": 4 * 3600,
+        "client:project": 3600 + 1800,
+    }
+
+
+def test_totals_by_account_reports_intervals_without_account() -> None:
+    intervals = reports.from_entries(
+        (
+            *_entries,
+            ClockInEntry(_epoch("1970-02-02 10:00:00"), ()),
+            ClockOutEntry(_epoch("1970-02-02 10:15:00")),
+        )
+    )
+
+    assert reports.totals_by_account(intervals) == {
+        "(none)": 900,
+        "INBOX": 3600,
+        "client": 5 * 3600 + 1800,
+        "client:meeting": 4 * 3600,
+        "client:project": 3600 + 1800,
+    }
+
+
+def test_select_keeps_intervals_below_prefix() -> None:
+    intervals = reports.from_entries(_entries, until=_epoch("1970-02-02 10:00:00"))
+
+    selected = reports.select(intervals, (Account("client"), Account("meeting")))
+
+    assert reports.totals_by_account(selected) == {
+        "client": 4 * 3600,
+        "client:meeting": 4 * 3600,
+    }
+
+
+def test_totals_by_period_splits_intervals_at_midnight() -> None:
+    intervals = reports.from_entries(_entries, until=_epoch("1970-02-02 10:00:00"))
+
+    assert reports.totals_by_period(intervals, Period.DAY) == {
+        "1970-01-01": 3 * 3600 + 1800,
+        "1970-01-02": 2 * 3600,
+        "1970-02-02": 3600,
+    }
+    assert reports.totals_by_period(intervals, Period.WEEK) == {
+        "1970-W01": 5 * 3600 + 1800,
+        "1970-W06": 3600,
+    }
+    assert reports.totals_by_period(intervals, Period.MONTH) == {
+        "1970-01": 5 * 3600 + 1800,
+        "1970-02": 3600,
+    }
+
+
+def test_totals_of_no_intervals_are_empty() -> None:
+    intervals = reports.from_entries(())
+
+    assert reports.totals_by_account(intervals) == {}
+    assert reports.totals_by_period(intervals, Period.DAY) == {}
+
+
+@hypothesis.given(
+    st.lists(
+        st.tuples(
+            st.integers(min_value=-(10**9), max_value=10**9),
+            st.integers(min_value=0, max_value=10**6),
+        ),
+        max_size=50,
+    ),
+    st.sampled_from(tuple(Period)),
+)
+def test_totals_by_period_sum_to_total_duration(
+    spans: list[tuple[int, int]], period: Period
+) -> None:
+    intervals = reports.from_arrays(
+        [start for start, _ in spans],
+        [start + duration for start, duration in spans],
+        [0] * len(spans),
+        AccountRegistry(),
+    )
+
+    totals = reports.totals_by_period(intervals, period)
+
+    assert sum(totals.values()) == sum(duration for _, duration in spans)
+    assert all(total > 0 for total in totals.values())
+
+
+def test_totals_by_period_matches_per_day_overlap() -> None:
+    rng = np.random.default_rng(0)
+    starts = np.sort(rng.integers(0, 30 * 86400, 200))
+    ends = starts + rng.integers(0, 3 * 86400, 200)
+    intervals = reports.from_arrays(starts, ends, [0] * 200, AccountRegistry())
+
+    expected: dict[str, int] = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        for day in range(start // 86400, end // 86400 + 1):
+            overlap = min(end, (day + 1) * 86400) - max(start, day * 86400)
+            if overlap > 0:
+                label = timestamps.format_epoch(day * 86400)[:10]
+                expected[label] = expected.get(label, 0) + overlap
+
+    assert reports.totals_by_period(intervals, Period.DAY) == expected
@@ -0,0 +1,54 @@
+import argparse
+import io
+import pathlib
+
+import pytest
+
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry
+from timeclock_el_punch_clock.runners import Runner
+
+
+def test_run_returns_results_and_reuses_the_parser(log_timeclock: pathlib.Path) -> None:
+    runner = Runner()
+    arguments = ("--file", str(log_timeclock), "--fsync", "never")
+
+    clocked_in = runner.run(
+        (*arguments, "in", "--datetime", "2024-01-01 09:00:00", "a")
+    )
+    last = runner.run((*arguments, "status", "--datetime", "2024-01-01 10:00:00"))
+    totals = runner.run((*arguments, "report", "--datetime", "2024-01-01 10:30:00"))
+
+    assert clocked_in is None
+    assert last == ClockInEntry(1704099600, ("a",))
+    assert totals == {"a": 5400}
+    assert list(runner.path_cache.entries) == [log_timeclock]
+
+
+def test_run_writes_output_to_stdout_if_given(log_timeclock: pathlib.Path) -> None:
+    stdout = io.StringIO()
+
+    Runner().run(("--file", str(log_timeclock), "status"), stdout=stdout)
+
+    assert stdout.getvalue() == "no entries\n"
+
+
+def test_run_with_check_problems_returns_them_instead_of_exiting(
+    log_timeclock: pathlib.Path,
+) -> None:
+    log_timeclock.write_text("o 2024-01-01 09:00:00\n")
+
+    problems = Runner().run(("--file", str(log_timeclock), "check"))
+
+    assert [problem.line for problem in problems] == [1]
+
+
+def test_run_with_help_returns_none_and_prints_usage() -> None:
+    stdout = io.StringIO()
+
+    assert Runner().run(("--help",), stdout=stdout) is None
+    assert stdout.getvalue().startswith("usage:")
+
+
+def test_run_with_unknown_command_raises_argument_error() -> None:
+    with pytest.raises(argparse.ArgumentError, match="invalid choice"):
+        Runner().run(("bogus",))
@@ -0,0 +1,155 @@
+import pathlib
+
+import pytest
+
+from timeclock_el_punch_clock import segments
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.commands.report import Report
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.reports import Period
+from timeclock_el_punch_clock.segments import Compression
+
+_2023 = (
+    "* 2023\n"
+    "i 2023-12-30 09:00:00 client:project\n"
+    "o 2023-12-30 11:00:00\n"
+    "i 2023-12-31 09:00:00 INBOX\n"
+    "o 2023-12-31 09:30:00\n"
+)
+_2024 = "* 2024\ni 2024-01-02 09:00:00 client:project\no 2024-01-02 10:00:00\n"
+_2025 = "* 2025\ni 2025-01-02 09:00:00 client\n"
+
+pytestmark = pytest.mark.log_timeclock(_2023 + _2024 + _2025)
+
+
+def _report(path: pathlib.Path, period: Period | None = None) -> dict[str, int]:
+    until = 1735808400 + 3600  # 2025-01-02 10:00:00
+    return dict(Report(path, ":", until=until, period=period)())
+
+
+@pytest.mark.parametrize("compression", tuple(Compression))
+def test_compact_moves_completed_years_into_segments(
+    log_timeclock: pathlib.Path, compression: Compression
+) -> None:
+    before = list(lines.iter_entries(log_timeclock))
+
+    compacted = segments.compact(log_timeclock, compression=compression)
+
+    assert [segment.year for segment in compacted] == [2023, 2024]
+    assert log_timeclock.read_text() == _2025
+    assert list(segments.iter_entries(log_timeclock)) == before
+    assert compacted[0].totals == {
+        (Account("client"), Account("project")): 7200,
+        (Account("INBOX"),): 1800,
+    }
+    for segment in compacted:
+        segment_path = segments.segments_path(log_timeclock) / segment.name
+        assert segment_path.stat().st_mode & 0o777 == 0o444
+
+
+def test_reports_are_unchanged_by_compaction(log_timeclock: pathlib.Path) -> None:
+    totals, by_day = _report(log_timeclock), _report(log_timeclock, Period.DAY)
+
+    segments.compact(log_timeclock)
+
+    assert _report(log_timeclock) == totals
+    assert _report(log_timeclock, Period.DAY) == by_day
+
+
+def test_compact_keeps_a_year_that_ends_clocked_in(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    crossing = "* 2023\ni 2023-12-31 22:00:00\n* 2024\no 2024-01-01 01:00:00\n"
+    path.write_text(crossing + _2025)
+
+    assert segments.compact(path) == ()
+    assert path.read_text() == crossing + _2025
+
+
+def test_compact_twice_appends_to_the_manifest(log_timeclock: pathlib.Path) -> None:
+    segments.compact(log_timeclock)
+    log_timeclock.write_text(
+        _2025 + "o 2025-01-02 10:00:00\n* 2026\ni 2026-01-02 09:00:00\n"
+    )
+
+    compacted = segments.compact(log_timeclock, compression=Compression.GZIP)
+
+    assert [segment.year for segment in compacted] == [2023, 2024, 2025]
+    assert [segment.year for segment in segments.load(log_timeclock)] == [
+        2023,
+        2024,
+        2025,
+    ]
+
+
+def test_compact_refuses_to_overwrite_a_year(log_timeclock: pathlib.Path) -> None:
+    segments.compact(log_timeclock)
+    log_timeclock.write_text(_2024 + _2025)
+
+    with pytest.raises(FileExistsError):
+        segments.compact(log_timeclock)
+    assert log_timeclock.read_text() == _2024 + _2025
+
+
+def test_compact_refusing_a_later_year_leaves_no_earlier_segment(
+    log_timeclock: pathlib.Path,
+) -> None:
+    log_timeclock.write_text(_2024 + _2025)
+    segments.compact(log_timeclock)
+    names = sorted(
+        path.name for path in segments.segments_path(log_timeclock).iterdir()
+    )
+    log_timeclock.write_text(_2023 + _2024 + _2025)
+
+    with pytest.raises(FileExistsError):
+        segments.compact(log_timeclock)
+
+    assert log_timeclock.read_text() == _2023 + _2024 + _2025
+    assert [segment.year for segment in segments.load(log_timeclock)] == [2024]
+    assert (
+        sorted(path.name for path in segments.segments_path(log_timeclock).iterdir())
+        == names
+    )
+
+
+def test_compact_interrupted_before_replacing_the_log_is_rolled_back(
+    log_timeclock: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    totals = _report(log_timeclock)
+    replace = segments.replacements.replace
+
+    def crash(target: pathlib.Path, *args, **kwargs) -> None:
+        if target == log_timeclock:
+            raise KeyboardInterrupt
+        replace(target, *args, **kwargs)
+
+    monkeypatch.setattr(segments.replacements, "replace", crash)
+    with pytest.raises(KeyboardInterrupt):
+        segments.compact(log_timeclock)
+    monkeypatch.undo()
+
+    assert _report(log_timeclock) == totals
+    assert segments.load(log_timeclock) == ()
+    assert [segment.year for segment in segments.compact(log_timeclock)] == [
+        2023,
+        2024,
+    ]
+    assert _report(log_timeclock) == totals
+
+
+def test_compact_interrupted_after_replacing_the_log_is_rolled_forward(
+    log_timeclock: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    totals = _report(log_timeclock)
+
+    def crash(*args, **kwargs) -> None:
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(segments, "_save", crash)
+    with pytest.raises(KeyboardInterrupt):
+        segments.compact(log_timeclock)
+    monkeypatch.undo()
+
+    assert log_timeclock.read_text() == _2025
+    assert _report(log_timeclock) == totals
+    assert [segment.year for segment in segments.load(log_timeclock)] == [2023, 2024]
+    assert segments.compact(log_timeclock) == ()
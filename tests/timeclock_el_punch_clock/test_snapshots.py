@@ -0,0 +1,119 @@
+import errno
+import os
+import pathlib
+
+import pytest
+
+from timeclock_el_punch_clock import snapshots, timestamps
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing import lines
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+
+_log = "* 2024\ni 2024-01-01 09:00:00 INBOX:meeting\no 2024-01-01 10:00:00\n"
+
+pytestmark = pytest.mark.log_timeclock(_log)
+
+
+def test_update_persists_last_entry(log_timeclock: pathlib.Path) -> None:
+    snapshot = snapshots.update(log_timeclock)
+
+    assert snapshot.last == ClockOutEntry(timestamps.parse_epoch("2024-01-01 10:00:00"))
+    assert snapshot.offset == len(_log)
+    assert snapshots.load(log_timeclock) == snapshot
+
+
+def test_update_round_trips_clock_in_accounts(log_timeclock: pathlib.Path) -> None:
+    with log_timeclock.open(mode="a") as file:
+        file.write("i 2024-01-01 11:00:00 client:project\n")
+
+    snapshot = snapshots.update(log_timeclock)
+
+    assert snapshot.clocked_in
+    assert snapshot.last == ClockInEntry(
+        timestamps.parse_epoch("2024-01-01 11:00:00"),
+        (Account("client"), Account("project")),
+    )
+    assert snapshots.load(log_timeclock) == snapshot
+
+
+def test_update_with_fresh_snapshot_does_not_parse(
+    log_timeclock: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    snapshot = snapshots.update(log_timeclock)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("log was parsed")
+
+    monkeypatch.setattr(lines, "iter_entries", fail)
+    monkeypatch.setattr(snapshots.tails, "read_last_entry", fail)
+
+    assert snapshots.update(log_timeclock) == snapshot
+
+
+def test_update_replays_only_appended_bytes(
+    log_timeclock: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    snapshots.update(log_timeclock)
+    with log_timeclock.open(mode="a") as file:
+        file.write("i 2024-01-02 09:00:00 INBOX\n")
+    offsets = []
+    iter_entries = lines.iter_entries
+
+    def recording_iter_entries(path, delimiter=":", offset=0):
+        offsets.append(offset)
+        return iter_entries(path, delimiter=delimiter, offset=offset)
+
+    monkeypatch.setattr(lines, "iter_entries", recording_iter_entries)
+
+    snapshot = snapshots.update(log_timeclock)
+
+    assert offsets == [len(_log)]
+    assert snapshot.last == ClockInEntry(
+        timestamps.parse_epoch("2024-01-02 09:00:00"), (Account("INBOX"),)
+    )
+
+
+def test_update_after_rewrite_ignores_stale_snapshot(
+    log_timeclock: pathlib.Path,
+) -> None:
+    snapshots.update(log_timeclock)
+    rewritten = "i 2024-02-01 09:00:00 other\n" + "\n" * len(_log)
+    with log_timeclock.open(mode="r+") as file:
+        file.write(rewritten)
+
+    snapshot = snapshots.update(log_timeclock)
+
+    assert snapshot.last == ClockInEntry(
+        timestamps.parse_epoch("2024-02-01 09:00:00"), (Account("other"),)
+    )
+
+
+def test_load_with_corrupt_snapshot_returns_none(log_timeclock: pathlib.Path) -> None:
+    snapshots.snapshot_path(log_timeclock).write_bytes(b"garbage")
+
+    assert snapshots.load(log_timeclock) is None
+
+
+def test_update_of_empty_log_has_no_last_entry(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.touch()
+
+    snapshot = snapshots.update(path)
+
+    assert snapshot.last is None
+    assert not snapshot.clocked_in
+    assert os.path.exists(snapshots.snapshot_path(path))
+
+
+def test_update_on_a_read_only_file_system_still_returns_the_snapshot(
+    log_timeclock: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def read_only(*args, **kwargs):
+        raise OSError(errno.EROFS, "Read-only file system")
+
+    monkeypatch.setattr(snapshots.replacements, "replace", read_only)
+
+    snapshot = snapshots.update(log_timeclock)
+
+    assert snapshot.last == ClockOutEntry(timestamps.parse_epoch("2024-01-01 10:00:00"))
+    assert snapshots.load(log_timeclock) is None
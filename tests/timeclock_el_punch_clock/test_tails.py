@@ -0,0 +1,53 @@
+import pathlib
+
+import hypothesis
+import hypothesis.strategies
+
+from conftest import log_timeclocks
+from timeclock_el_punch_clock import tails
+
+
+def test_read_last_line_with_empty_log_timeclock_returns_none(
+    empty_log_timeclock: pathlib.Path,
+) -> None:
+    assert tails.read_last_line(empty_log_timeclock) is None
+
+
+def test_read_last_line_with_clocked_in_log_timeclock_returns_clock_in_line(
+    clocked_in_log_timeclock: pathlib.Path,
+) -> None:
+    expected = "i 1970-01-01 00:01:00 party:new-year\n"
+    assert tails.read_last_line(clocked_in_log_timeclock) == expected
+
+
+def test_read_last_line_without_trailing_newline_returns_unterminated_line(
+    empty_log_timeclock: pathlib.Path,
+) -> None:
+    empty_log_timeclock.write_text("i 1970-01-01 00:00:00\no 1970-01-01 00:01:00")
+    expected = "o 1970-01-01 00:01:00"
+    assert tails.read_last_line(empty_log_timeclock) == expected
+
+
+@hypothesis.given(
+    log_timeclocks(max_size=64),
+    hypothesis.strategies.integers(min_value=1, max_value=128),
+)
+def test_iter_lines_reversed_equals_reversed_lines(
+    log_timeclock: pathlib.Path, block_size: int
+) -> None:
+    with log_timeclock.open(mode="r") as file:
+        expected = list(reversed(file.readlines()))
+
+    actual = list(tails.iter_lines_reversed(log_timeclock, block_size=block_size))
+
+    assert actual == expected
+
+
+def test_read_last_entry_with_end_reads_before_the_offset(
+    tmp_path: pathlib.Path,
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 1970-01-01 00:00:00\n\no 1970-01-01 00:01:00\n")
+
+    assert tails.read_last_entry(path, end=23).timestamp == 0
+    assert tails.read_last_entry(path, end=0) is None
@@ -0,0 +1,109 @@
+import datetime
+
+import hypothesis
+import hypothesis.strategies
+import pytest
+
+from timeclock_el_punch_clock import timestamps
+
+_unix_epoch = datetime.datetime(1970, 1, 1, 0, 0, 0)
+
+_datetimes = hypothesis.strategies.datetimes(
+    min_value=datetime.datetime(1970, 1, 1, 0, 0, 0),
+    max_value=datetime.datetime(9998, 12, 31, 23, 59, 59),
+).map(lambda datetimestamp: datetimestamp.replace(microsecond=0))
+
+
+@hypothesis.given(_datetimes)
+def test_format_datetime_equals_strftime(datetimestamp: datetime.datetime) -> None:
+    expected = datetimestamp.strftime(timestamps.FORMAT)
+
+    assert timestamps.format_datetime(datetimestamp) == expected
+
+
+@hypothesis.given(_datetimes)
+def test_parse_datetime_equals_strptime(datetimestamp: datetime.datetime) -> None:
+    text = datetimestamp.strftime(timestamps.FORMAT)
+
+    expected = datetime.datetime.strptime(text, timestamps.FORMAT)
+
+    assert timestamps.parse_datetime(text) == expected
+
+
+@hypothesis.given(_datetimes)
+def test_parse_epoch_equals_seconds_since_unix_epoch(
+    datetimestamp: datetime.datetime,
+) -> None:
+    text = datetimestamp.strftime(timestamps.FORMAT)
+
+    expected = int((datetimestamp - _unix_epoch).total_seconds())
+
+    assert timestamps.parse_epoch(text) == expected
+
+
+@hypothesis.given(_datetimes)
+def test_format_epoch_round_trips_parse_epoch(datetimestamp: datetime.datetime) -> None:
+    text = datetimestamp.strftime(timestamps.FORMAT)
+
+    assert timestamps.format_epoch(timestamps.parse_epoch(text)) == text
+
+
+@hypothesis.given(_datetimes)
+def test_from_epoch_round_trips_to_epoch(datetimestamp: datetime.datetime) -> None:
+    assert timestamps.from_epoch(timestamps.to_epoch(datetimestamp)) == datetimestamp
+
+
+def test_format_datetime_pads_year_to_four_digits() -> None:
+    datetimestamp = datetime.datetime(5, 1, 1, 0, 0, 0)
+
+    assert timestamps.format_datetime(datetimestamp) == "0005-01-01 00:00:00"
+
+
+@pytest.mark.parametrize(
+    "text",
+    (
+        "",
+        "1970-01-01T00:00:00",
+        "1970-01-01 00:00",
+        "1970-1-01 00:00:000",
+        "1970-13-01 00:00:00",
+        "1970-02-29 00:00:00",
+        "1970-01-01 24:00:00",
+        "1970-01-01 00:00:+0",
+        "1970-01-01 00:00:0\N{ARABIC-INDIC DIGIT ZERO}",
+    ),
+)
+def test_parse_epoch_with_malformed_timestamp_raises_value_error(text: str) -> None:
+    with pytest.raises(ValueError):
+        timestamps.parse_epoch(text)
+
+
+def test_format_duration() -> None:
+    assert timestamps.format_duration(0) == "0:00:00"
+    assert timestamps.format_duration(100 * 3600 + 61) == "100:01:01"
+
+
+@pytest.mark.parametrize(
+    ("text", "seconds"),
+    (
+        ("4h", 4 * 3600),
+        ("1h30m", 5400),
+        ("90s", 90),
+        ("1d", 86400),
+        ("100:01:01", 360061),
+    ),
+)
+def test_parse_duration(text: str, seconds: int) -> None:
+    assert timestamps.parse_duration(text) == seconds
+
+
+@pytest.mark.parametrize("text", ("", "4", "h", "4x", "1:2", "-1h", "1:60:00"))
+def test_parse_duration_with_malformed_duration_raises_value_error(text: str) -> None:
+    with pytest.raises(ValueError):
+        timestamps.parse_duration(text)
+
+
+def test_parse_timezone_with_unknown_zone_raises_value_error() -> None:
+    assert timestamps.parse_timezone("Europe/Vienna") == "Europe/Vienna"
+    with pytest.raises(ValueError):
+        timestamps.parse_timezone("Europe/Atlantis")
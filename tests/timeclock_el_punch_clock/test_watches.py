@@ -0,0 +1,131 @@
+import datetime
+import pathlib
+
+import pytest
+
+from timeclock_el_punch_clock import watches
+from timeclock_el_punch_clock.commands.watch import Watch
+from timeclock_el_punch_clock.paths import stats
+from timeclock_el_punch_clock.watches import Tally
+
+_noon = 19723 * 86400 + 12 * 3600  # 2024-01-01 12:00:00
+
+
+_log = (
+    "i 2023-12-31 23:00:00 client:project\n"
+    "o 2024-01-01 01:00:00\n"
+    "i 2024-01-01 09:00:00 INBOX\n"
+)
+pytestmark = pytest.mark.log_timeclock(_log)
+
+
+def test_tally_splits_intervals_at_midnight(log_timeclock: pathlib.Path) -> None:
+    tally = Tally()
+
+    assert tally.advance(log_timeclock)
+
+    assert tally.day_totals(_noon) == {
+        "INBOX": 3 * 3600,
+        "client": 3600,
+        "client:project": 3600,
+    }
+
+
+def test_tally_since_skips_earlier_days_and_keeps_an_open_interval(
+    tmp_path: pathlib.Path,
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text(
+        "* 2023\n** 2023-12\n*** 2023-12-30\n"
+        "i 2023-12-30 09:00:00 old\no 2023-12-30 10:00:00\n"
+        "*** 2023-12-31\ni 2023-12-31 23:00:00 client:project\n"
+        "* 2024\n** 2024-01\n*** 2024-01-01\n"
+        "o 2024-01-01 01:00:00\ni 2024-01-01 09:00:00 INBOX\n"
+    )
+    tally = Tally()
+
+    assert tally.advance(path, since=_noon - 12 * 3600)
+
+    assert 19721 not in tally.days
+    assert tally.day_totals(_noon) == {
+        "INBOX": 3 * 3600,
+        "client": 3600,
+        "client:project": 3600,
+    }
+
+
+def test_tally_parses_only_appended_complete_lines(
+    log_timeclock: pathlib.Path,
+) -> None:
+    tally = Tally()
+    tally.advance(log_timeclock)
+    offset = tally.offset
+
+    with log_timeclock.open(mode="a") as file:
+        file.write("o 2024-01-01 10:00:00\ni 2024-01-01 11:00")
+    assert tally.advance(log_timeclock)
+    assert not tally.advance(log_timeclock)
+    with log_timeclock.open(mode="a") as file:
+        file.write(":00\n")
+    assert tally.advance(log_timeclock)
+
+    assert tally.offset == log_timeclock.stat().st_size > offset
+    assert tally.day_totals(_noon) == {
+        "INBOX": 3600,
+        "client": 3600,
+        "client:project": 3600,
+    }
+
+
+def test_tally_starts_over_on_replaced_log(log_timeclock: pathlib.Path) -> None:
+    tally = Tally()
+    tally.advance(log_timeclock)
+    replacement = log_timeclock.with_name("replacement")
+    replacement.write_text("i 2024-01-01 11:00:00 other\n")
+    replacement.replace(log_timeclock)
+
+    assert tally.advance(log_timeclock)
+
+    assert tally.day_totals(_noon) == {"other": 3600}
+
+
+@pytest.mark.parametrize("poll_interval", (None, 0.01, 0))
+def test_changes_yield_on_append(
+    log_timeclock: pathlib.Path, poll_interval: float | None
+) -> None:
+    changes = watches.changes(log_timeclock, poll_interval=poll_interval)
+    next(changes)
+
+    with log_timeclock.open(mode="a") as file:
+        file.write("o 2024-01-01 10:00:00\n")
+
+    assert next(changes) is None
+    changes.close()
+
+
+def test_watch_emits_summary_per_change(log_timeclock: pathlib.Path) -> None:
+    command = Watch(
+        log_timeclock,
+        ":",
+        poll_interval=0.01,
+        clock=lambda: datetime.datetime(2024, 1, 1, 12, 0, 0),
+    )
+    summaries = command()
+
+    assert next(summaries)[1]["INBOX"] == 3 * 3600
+    with log_timeclock.open(mode="a") as file:
+        file.write("o 2024-01-01 10:00:00\n")
+    assert next(summaries)[1]["INBOX"] == 3600
+    summaries.close()
+
+
+def test_watch_does_not_reuse_stats_across_changes(log_timeclock: pathlib.Path) -> None:
+    summaries = Watch(log_timeclock, ":", poll_interval=0.01)()
+    size = stats.stat(log_timeclock).st_size
+    with log_timeclock.open(mode="a") as file:
+        file.write("\n")
+
+    next(summaries)
+
+    assert stats.stat(log_timeclock).st_size == size + 1
+    summaries.close()
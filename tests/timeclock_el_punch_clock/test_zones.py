@@ -0,0 +1,216 @@
+import datetime
+import pathlib
+import zoneinfo
+
+import hypothesis
+import hypothesis.strategies as st
+import numpy as np
+import pytest
+
+from timeclock_el_punch_clock import checks, segments, timestamps, zones
+from timeclock_el_punch_clock.checks import Kind
+from timeclock_el_punch_clock.commands.report import Report
+from timeclock_el_punch_clock.parsing.entries import HeadingEntry
+from timeclock_el_punch_clock.parsing.errors import MalformedLineError
+from timeclock_el_punch_clock.reports import Period
+
+_zones = (
+    "UTC",
+    "Europe/Vienna",
+    "America/New_York",
+    "Australia/Lord_Howe",
+    "Asia/Kolkata",
+)
+_naive = st.datetimes(
+    min_value=datetime.datetime(1990, 1, 1), max_value=datetime.datetime(2037, 1, 1)
+)
+
+
+def _local(moment: datetime.datetime) -> int:
+    return int((moment - datetime.datetime(1970, 1, 1)).total_seconds())
+
+
+@hypothesis.given(
+    st.sampled_from(_zones), st.lists(_naive, min_size=1), st.integers(0, 1)
+)
+def test_to_utc_agrees_with_zoneinfo(
+    name: str, moments: list[datetime.datetime], fold: int
+) -> None:
+    moments = [moment.replace(microsecond=0) for moment in moments]
+    local = np.asarray([_local(moment) for moment in moments], dtype=np.int64)
+    table = zones.table(name, int(local.min()), int(local.max()))
+
+    assert table.to_utc(local, fold=fold).tolist() == [
+        int(moment.replace(tzinfo=zoneinfo.ZoneInfo(name), fold=fold).timestamp())
+        for moment in moments
+    ]
+
+
+@hypothesis.given(st.sampled_from(_zones), st.lists(_naive, min_size=1))
+def test_to_local_inverts_to_utc(name: str, moments: list[datetime.datetime]) -> None:
+    epochs = np.asarray(
+        [int(moment.replace(tzinfo=datetime.UTC).timestamp()) for moment in moments],
+        dtype=np.int64,
+    )
+    table = zones.table(name, int(epochs.min()), int(epochs.max()))
+
+    local = table.to_local(epochs)
+
+    assert local.tolist() == [
+        _local(
+            datetime.datetime.fromtimestamp(
+                int(epoch), zoneinfo.ZoneInfo(name)
+            ).replace(tzinfo=None)
+        )
+        for epoch in epochs
+    ]
+    both = np.where(
+        table.to_utc(local, fold=0) == epochs, epochs, table.to_utc(local, fold=1)
+    )
+    assert both.tolist() == epochs.tolist()
+
+
+def test_to_utc_takes_a_repeated_wall_time_after_one_later_as_the_second() -> None:
+    local = np.asarray(
+        [
+            timestamps.parse_epoch("2024-10-27 01:30:00"),
+            timestamps.parse_epoch("2024-10-27 02:45:00"),
+            timestamps.parse_epoch("2024-10-27 02:15:00"),
+            timestamps.parse_epoch("2024-10-27 02:30:00"),
+            timestamps.parse_epoch("2024-10-27 03:00:00"),
+        ],
+        dtype=np.int64,
+    )
+
+    utc = zones.to_utc(local, np.zeros(len(local), dtype=np.int64), ("Europe/Vienna",))
+
+    assert np.diff(utc).tolist() == [1800 + 2700, 1800, 900, 1800]
+
+
+def test_tag_returns_the_zone_of_a_tag_heading() -> None:
+    assert zones.tag(HeadingEntry(1, "TZ=Europe/Vienna")) == "Europe/Vienna"
+    assert zones.tag(HeadingEntry(1, "2024")) is None
+    with pytest.raises(MalformedLineError):
+        zones.tag(HeadingEntry(1, "TZ=Europe/Atlantis"))
+
+
+_until = timestamps.parse_epoch("2025-12-31 00:00:00")
+_dst = (
+    "* TZ=Europe/Vienna\n"
+    "i 2024-03-31 01:30:00 client\n"
+    "o 2024-03-31 03:30:00\n"
+    "i 2024-10-27 02:30:00 INBOX\n"
+    "o 2024-10-27 02:15:00\n"
+    "* TZ=America/New_York\n"
+    "i 2024-11-03 23:00:00 client\n"
+    "o 2024-11-04 01:00:00\n"
+)
+
+pytestmark = pytest.mark.log_timeclock(_dst)
+
+
+def test_report_of_a_tagged_log_counts_utc_durations(
+    log_timeclock: pathlib.Path,
+) -> None:
+    assert Report(log_timeclock, ":", _until)() == {
+        "INBOX": 2700,
+        "client": 3600 + 7200,
+    }
+
+
+def test_report_by_day_uses_days_of_the_last_tag_or_the_zone(
+    log_timeclock: pathlib.Path,
+) -> None:
+    assert Report(log_timeclock, ":", _until, period=Period.DAY)() == {
+        "2024-03-30": 3600,
+        "2024-10-26": 2700,
+        "2024-11-03": 3600,
+        "2024-11-04": 3600,
+    }
+    assert Report(
+        log_timeclock, ":", _until, period=Period.DAY, zone="Asia/Kolkata"
+    )() == {
+        "2024-03-31": 3600,
+        "2024-10-27": 2700,
+        "2024-11-04": 7200,
+    }
+
+
+def test_report_with_zone_converts_an_untagged_log(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("i 2024-03-31 01:30:00 client\no 2024-03-31 03:30:00\n")
+
+    assert Report(path, ":", _until)() == {"client": 7200}
+    assert Report(path, ":", _until, zone="Europe/Vienna")() == {"client": 3600}
+
+
+def test_compact_carries_the_tag_into_the_log(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text(
+        "* 2024\n* TZ=Europe/Vienna\n"
+        "i 2024-03-31 01:30:00 client\no 2024-03-31 03:30:00\n"
+        "* 2025\ni 2025-01-02 09:00:00 client\no 2025-01-02 10:00:00\n"
+    )
+
+    segments.compact(path)
+
+    assert path.read_text().startswith("* TZ=Europe/Vienna\n* 2025\n")
+    assert Report(path, ":", _until)() == {"client": 7200}
+
+
+def test_check_reports_a_tag_of_an_unknown_zone(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("* 2024\n* TZ=Europe/Vienna\n** 2024-01\n* TZ=Mars/Olympus\n")
+
+    problems = checks.check(path)
+
+    assert [(problem.line, problem.kind) for problem in problems] == [(4, Kind.HEADING)]
+
+
+_fall_back = (
+    "* TZ=Europe/Vienna\n"
+    "i 2024-10-27 02:30:00 fall\n"
+    "o 2024-10-27 02:15:00\n"
+    "i 2024-10-27 02:20:00 fall2\n"
+    "o 2024-10-27 02:40:00\n"
+)
+
+
+def test_fix_keeps_a_tagged_log_across_the_fall_back(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text(_fall_back)
+
+    problems = checks.fix(path, chunk_size=64)
+
+    assert problems == []
+    assert path.read_text() == _fall_back
+    assert Report(path, ":", _until)() == {"fall": 2700, "fall2": 1200}
+
+
+def test_fix_drops_a_tagged_entry_out_of_order_in_utc(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text(_fall_back + "i 2024-10-27 02:10:00 INBOX\n")
+
+    problems = checks.fix(path)
+
+    assert [(problem.line, problem.kind) for problem in problems] == []
+    assert path.read_text() == _fall_back
+
+
+@pytest.mark.parametrize(
+    ("contents", "expected"),
+    (
+        ("", False),
+        ("i 2024-01-01 09:00:00 ACCTZ=x\no 2024-01-01 10:00:00\n", False),
+        ("* notes on TZ=Europe/Vienna\n", False),
+        ("* 2024\ni 2024-01-01 09:00:00 TZ=x\n** TZ=Europe/Vienna\n", True),
+        ("*\tTZ=Europe/Vienna", True),
+    ),
+)
+def test_tagged_finds_only_tag_headings(
+    tmp_path: pathlib.Path, contents: str, expected: bool
+) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text(contents)
+
+    assert zones.tagged(path) is expected
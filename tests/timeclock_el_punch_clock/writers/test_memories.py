@@ -0,0 +1,26 @@
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.writers.memories import MemoryWriter
+
+
+def test_append_renders_after_last_entry() -> None:
+    writer = MemoryWriter()
+    seen = []
+
+    def render(last):
+        seen.append(last)
+        return (ClockInEntry(60 * len(seen), (Account("a"),)),)
+
+    writer.append(render)
+    writer.append(render)
+
+    assert seen == [None, ClockInEntry(60, (Account("a"),))]
+    assert writer.last() == ClockInEntry(120, (Account("a"),))
+
+
+def test_between_is_half_open() -> None:
+    entries = [ClockInEntry(0, ()), ClockOutEntry(60), ClockInEntry(120, ())]
+    writer = MemoryWriter(list(entries))
+
+    assert list(writer.between(60, 120)) == [ClockOutEntry(60)]
+    assert list(writer.between(0, 121)) == entries
@@ -0,0 +1,58 @@
+import pathlib
+import sqlite3
+
+import pytest
+
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.writers.sqlites import SqliteWriter
+
+_entries = (
+    ClockInEntry(0, (Account("client"), Account("project"))),
+    ClockOutEntry(3600),
+    ClockInEntry(7200, ()),
+)
+
+
+@pytest.fixture
+def writer(tmp_path: pathlib.Path):
+    writer = SqliteWriter(tmp_path / "log.sqlite")
+    yield writer
+    writer.close()
+
+
+def test_append_round_trips_entries(writer: SqliteWriter) -> None:
+    writer.append(lambda last: _entries[:2])
+    writer.append(lambda last: (_entries[2],) if last == _entries[1] else ())
+
+    assert writer.last() == _entries[2]
+    assert list(writer.between(0, 7200)) == list(_entries[:2])
+
+
+def test_append_rolls_back_when_render_raises(writer: SqliteWriter) -> None:
+    def render(last):
+        raise ValueError("rejected")
+
+    with pytest.raises(ValueError):
+        writer.append(render)
+
+    assert writer.last() is None
+    assert not writer.connection.in_transaction
+
+
+def test_database_uses_wal_and_indexes(writer: SqliteWriter) -> None:
+    writer.append(lambda last: _entries)
+
+    connection = sqlite3.connect(writer.path)
+    try:
+        (mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+        indexes = {
+            name
+            for (name,) in connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+    finally:
+        connection.close()
+    assert mode == "wal"
+    assert {"entries_timestamp", "entries_account"} <= indexes
@@ -0,0 +1,21 @@
+import pathlib
+
+from timeclock_el_punch_clock.accounts import Account
+from timeclock_el_punch_clock.parsing.entries import ClockInEntry, ClockOutEntry
+from timeclock_el_punch_clock.policies import FsyncPolicy
+from timeclock_el_punch_clock.writers.texts import TextWriter
+
+
+def test_append_writes_lines_and_reads_them_back(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "log.timeclock"
+    path.write_text("* 1970\n")
+    writer = TextWriter(path, fsync_policy=FsyncPolicy.NEVER)
+    entries = (ClockInEntry(0, (Account("a"), Account("b"))), ClockOutEntry(60))
+
+    writer.append(lambda last: entries if last is None else ())
+
+    assert path.read_text() == (
+        "* 1970\ni 1970-01-01 00:00:00 a:b\no 1970-01-01 00:01:00\n"
+    )
+    assert writer.last() == ClockOutEntry(60)
+    assert list(writer.between(60, 61)) == [ClockOutEntry(60)]